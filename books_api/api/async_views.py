@@ -0,0 +1,186 @@
+"""
+Async versions of the authors list and retrieve endpoints.
+
+They return the same payloads as `AuthorViewSet.list` and `retrieve`, but query
+the database with the async queryset API, so under an ASGI server a worker can
+keep serving other requests while these wait on the database. DRF views are
+synchronous only, so authentication, permissions and rendering are applied
+here explicitly, using the same DRF classes as the viewset.
+"""
+
+from asgiref.sync import sync_to_async
+from django.db.models import prefetch_related_objects
+from django.http import HttpResponse
+from rest_framework import exceptions, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from api import cache, coalesce, conditional, fieldsets, filters, performance
+from api.fast_serializers import read_serializer
+from api.pagination import get_author_ordering, get_author_paginator, order_authors
+from api.renderers import FastJSONRenderer
+from api.serializers import AuthorSerializer
+from books.models import Author, books_prefetch
+
+
+async def author_list(request):
+    request, response = await authenticate(request)
+    if response is not None:
+        return response
+
+    cache_key = await sync_to_async(cache.author_list_cache_key)(request)
+    cached = await sync_to_async(cache.get_cached_list)(cache_key)
+    if cached is not None:
+        return conditional_response(request, cached["data"], cached["etag"])
+
+    try:
+        fields = fieldsets.get_author_fields(request)
+        ordering = get_author_ordering(request)
+        author_filters = filters.get_author_filters(request)
+    except exceptions.APIException as exc:
+        return render(exc.detail, exc.status_code)
+    authors = filters.filter_authors(Author.objects.all(), author_filters)
+    authors = order_authors(authors, *ordering)
+    if fields is not None:
+        authors = authors.only(*fieldsets.author_columns(fields), ordering[0])
+
+    # paginate response, either by page number or by cursor
+    paginator = get_author_paginator(request, ordering)
+    try:
+        page = await paginator.apaginate_queryset(authors, request)
+    except exceptions.APIException as exc:
+        return error_response(exc.detail, exc.status_code)
+
+    # answer conditional requests before fetching books and serializing
+    etag = await conditional.aget_page_etag(request, page, paginator.get_metadata())
+    response = conditional.not_modified(request, etag)
+    if response is not None:
+        return conditional.set_validators(response, etag)
+
+    # concurrent requests for the same page share a single serialization
+    data = await coalesce.ado(
+        (cache_key, etag),
+        lambda: serialize_page(page, paginator, fields, cache_key, etag),
+    )
+    return conditional.set_validators(render(data), etag)
+
+
+async def author_retrieve(request, pk):
+    request, response = await authenticate(request)
+    if response is not None:
+        return response
+
+    cache_key = await sync_to_async(cache.author_cache_key)(pk)
+    cached = await sync_to_async(cache.get_cached_author)(cache_key, request)
+    if cached is not None:
+        return conditional_response(request, **cached)
+
+    try:
+        fields = fieldsets.get_author_fields(request)
+    except exceptions.APIException as exc:
+        return render(exc.detail, exc.status_code)
+
+    # answer conditional requests before fetching books and serializing
+    # (validators are None when there's no author with given id)
+    validators = await conditional.aget_author_validators(pk, request)
+    if validators is None:
+        return error_response(
+            f"Author with id '{pk}' was not found.", status.HTTP_404_NOT_FOUND
+        )
+
+    response = conditional.not_modified(request, *validators)
+    if response is not None:
+        return conditional.set_validators(response, *validators)
+
+    # concurrent requests for the same author share a single fetch and
+    # serialization (None when the author was deleted since)
+    data = await coalesce.ado(
+        (cache_key, request.GET.urlencode(), *validators),
+        lambda: serialize_author(request, pk, fields, cache_key, validators),
+    )
+    if data is None:
+        return error_response(
+            f"Author with id '{pk}' was not found.", status.HTTP_404_NOT_FOUND
+        )
+    return conditional.set_validators(render(data), *validators)
+
+
+async def serialize_page(page, paginator, fields, cache_key, etag):
+    """Return the payload of a page of authors, and cache it"""
+    if fieldsets.includes_books(fields):
+        await sync_to_async(prefetch_related_objects)(page, books_prefetch())
+    serializer = read_serializer(AuthorSerializer)(page, many=True, fields=fields)
+    with performance.timer("serialize"):
+        data = serializer.data
+    data = paginator.get_paginated_response(data).data
+    await sync_to_async(cache.set_cached_list)(cache_key, {"data": data, "etag": etag})
+    return data
+
+
+async def serialize_author(request, pk, fields, cache_key, validators):
+    """Return the payload of an author, and cache it, or None if not found"""
+    try:
+        author = await fieldsets.author_queryset(fields).aget(id=pk)
+    except Author.DoesNotExist:
+        return None
+
+    serializer = read_serializer(AuthorSerializer)(author, fields=fields)
+    with performance.timer("serialize"):
+        data = serializer.data
+    etag, last_modified = validators
+    await sync_to_async(cache.set_cached_author)(
+        cache_key,
+        request,
+        {"data": data, "etag": etag, "last_modified": last_modified},
+    )
+    return data
+
+
+async def authenticate(request):
+    """
+    Wrap the request in a DRF `Request` authenticated with the configured DRF
+    authentication classes, and check the `IsAuthenticated` permission as the
+    viewset's list and retrieve actions do.
+
+    Return the DRF request and, when it isn't allowed, the error response.
+    """
+    request = Request(
+        request,
+        authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES],
+    )
+    try:
+        allowed = await sync_to_async(IsAuthenticated().has_permission)(request, None)
+    except exceptions.APIException as exc:
+        return request, error_response(exc.detail, exc.status_code)
+    if allowed:
+        return request, None
+
+    # as DRF does, answer 401 only when a WWW-Authenticate header can be sent
+    exc = exceptions.NotAuthenticated()
+    authenticate_header = request.authenticators[0].authenticate_header(request)
+    if not authenticate_header:
+        return request, error_response(exc.detail, status.HTTP_403_FORBIDDEN)
+
+    response = error_response(exc.detail, status.HTTP_401_UNAUTHORIZED)
+    response["WWW-Authenticate"] = authenticate_header
+    return request, response
+
+
+def conditional_response(request, data, etag, last_modified=None):
+    """Return a response for a cached payload, or 304 if the client has it"""
+    response = conditional.not_modified(request, etag, last_modified)
+    if response is None:
+        response = render(data)
+    return conditional.set_validators(response, etag, last_modified)
+
+
+def error_response(detail, status_code):
+    return render({"detail": detail}, status_code)
+
+
+def render(data, status_code=status.HTTP_200_OK):
+    renderer = FastJSONRenderer()
+    with performance.timer("render"):
+        content = renderer.render(data)
+    return HttpResponse(content, content_type=renderer.media_type, status=status_code)
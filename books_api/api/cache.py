@@ -0,0 +1,143 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+LIST_VERSION_KEY = "authors:list:version"
+
+
+def get_cache():
+    return caches[settings.AUTHORS_CACHE_ALIAS]
+
+
+def get_version(cache, version_key, timeout=None):
+    """Return the version stored under `version_key`, creating it if missing"""
+    version = cache.get(version_key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(version_key, version, timeout):
+            version = cache.get(version_key, version)
+    return version
+
+
+def author_version_key(pk):
+    return f"authors:detail:{uuid.UUID(str(pk))}:version"
+
+
+def author_cache_key(pk):
+    """
+    Return the cache key of the author with given id, or None when the id is
+    not a valid UUID (such requests are never cached).
+
+    Like list pages, the key embeds a version of the author renewed on each
+    write, so a payload read before a write can't be cached as the current one.
+    """
+    try:
+        pk = uuid.UUID(str(pk))
+    except ValueError:
+        return None
+    if not settings.AUTHORS_CACHE_TIMEOUT:
+        return f"authors:detail:{pk}"
+    # a version that expired along with the payloads is just renewed
+    version = get_version(
+        get_cache(), author_version_key(pk), settings.AUTHORS_CACHE_TIMEOUT
+    )
+    return f"authors:detail:{pk}:{version}"
+
+
+def author_list_cache_key(request):
+    """
+    Return the cache key of the authors list page requested.
+
+    Pages may hold any author, so instead of tracking which page holds which
+    author every page key embeds a version that is renewed on each write.
+    """
+    version = get_version(get_cache(), LIST_VERSION_KEY)
+
+    # pagination links are absolute URLs, so the host is part of the payload
+    uri = request.build_absolute_uri()
+    return f"authors:list:{version}:{hashlib.md5(uri.encode('utf-8')).hexdigest()}"
+
+
+def get_cached_author(key, request):
+    """
+    Return the cached payload of an author for the query params of given
+    request, or None.
+
+    All variants of an author are kept under a single key so they can be
+    evicted at once.
+    """
+    if key is None or not settings.AUTHORS_CACHE_TIMEOUT:
+        return None
+    variants = get_cache().get(key) or {}
+    return variants.get(request.GET.urlencode())
+
+
+def set_cached_author(key, request, data):
+    if key is None or not settings.AUTHORS_CACHE_TIMEOUT:
+        return
+    cache = get_cache()
+    variants = cache.get(key) or {}
+    variants[request.GET.urlencode()] = data
+    cache.set(key, variants, settings.AUTHORS_CACHE_TIMEOUT)
+
+
+def get_cached_list(key):
+    if not settings.AUTHORS_CACHE_TIMEOUT:
+        return None
+    return get_cache().get(key)
+
+
+def set_cached_list(key, data):
+    if not settings.AUTHORS_CACHE_TIMEOUT:
+        return
+    get_cache().set(key, data, settings.AUTHORS_CACHE_TIMEOUT)
+
+
+def compressed_cache_key(etag, accept, encoding):
+    """
+    Return the cache key of a response body of given ETag, for given `Accept`
+    header, compressed with `encoding`.
+
+    ETags change whenever the payload does, so these entries are never evicted
+    and just expire.
+    """
+    digest = hashlib.md5(f"{etag}:{accept}".encode("utf-8")).hexdigest()
+    return f"compressed:{encoding}:{digest}"
+
+
+def get_compressed(key):
+    if key is None or not settings.AUTHORS_CACHE_TIMEOUT:
+        return None
+    return get_cache().get(key)
+
+
+def set_compressed(key, content):
+    if key is None or not settings.AUTHORS_CACHE_TIMEOUT:
+        return
+    get_cache().set(key, content, settings.AUTHORS_CACHE_TIMEOUT)
+
+
+def invalidate_authors(author_ids):
+    """
+    Evict the cached entries of given authors and every cached list page, by
+    renewing their versions.
+
+    Versions are renewed right away and once more after the current
+    transaction commits: a read that started before the commit, and so may
+    have fetched data the transaction replaced, caches it under a version
+    that's no longer looked up.
+    """
+    keys = [author_version_key(author_id) for author_id in author_ids if author_id]
+
+    def invalidate():
+        cache = get_cache()
+        cache.set(LIST_VERSION_KEY, uuid.uuid4().hex, None)
+        cache.set_many(
+            {key: uuid.uuid4().hex for key in keys}, settings.AUTHORS_CACHE_TIMEOUT
+        )
+
+    invalidate()
+    transaction.on_commit(invalidate)
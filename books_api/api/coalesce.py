@@ -0,0 +1,106 @@
+"""
+Single-flight coalescing of identical concurrent reads.
+
+When a popular author drops out of the response cache, the requests for it
+arriving at the same time would all query and serialize it. `do(key, function)`
+runs `function` once for the callers passing the same `key` at the same time:
+the first one runs it while the others wait for its result, or its exception.
+Calls made once it returned run it again, so results are only shared between
+overlapping requests and are as fresh as if each had computed its own.
+
+`ado` does the same for coroutine functions, for the async views. Flights are
+local to the process (its threads under WSGI, its event loop under ASGI), and
+`AUTHORS_COALESCING` turns them off. Time spent waiting on another request's
+flight is reported as the `coalesce` timing (see api.performance).
+"""
+
+import asyncio
+import threading
+
+from django.conf import settings
+
+from api import performance
+
+# key -> Flight of the thread computing it
+flights = {}
+lock = threading.Lock()
+
+# (event loop, key) -> future of the task computing it
+async_flights = {}
+
+
+class Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.waiters = 0
+        self.result = None
+        self.error = None
+
+
+def do(key, function):
+    """Return `function()`, computed once for the concurrent calls with `key`"""
+    if not settings.AUTHORS_COALESCING:
+        return function()
+
+    with lock:
+        flight = flights.get(key)
+        if flight is None:
+            flight = flights[key] = Flight()
+            leading = True
+        else:
+            flight.waiters += 1
+            leading = False
+
+    if not leading:
+        with performance.timer("coalesce"):
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    try:
+        flight.result = function()
+    except BaseException as exc:
+        flight.error = exc
+        raise
+    finally:
+        with lock:
+            del flights[key]
+        flight.done.set()
+    return flight.result
+
+
+async def ado(key, function):
+    """Return `await function()`, computed once for the concurrent calls with `key`"""
+    if not settings.AUTHORS_COALESCING:
+        return await function()
+
+    key = (asyncio.get_running_loop(), key)
+    while key in async_flights:
+        future = async_flights[key]
+        try:
+            with performance.timer("coalesce"):
+                # a waiter being cancelled mustn't cancel the flight
+                return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise
+            # the leading request was cancelled (e.g. its client went away),
+            # so another one takes over
+
+    future = async_flights[key] = asyncio.get_running_loop().create_future()
+    try:
+        result = await function()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as exc:
+        future.set_exception(exc)
+        # retrieved by the waiters, if any
+        future.exception()
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        del async_flights[key]
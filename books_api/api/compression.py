@@ -0,0 +1,144 @@
+"""
+Compression of the responses.
+
+`CompressionMiddleware` compresses the responses of at least
+`COMPRESSION_MIN_SIZE` bytes with the encoding the client prefers among
+`COMPRESSION_ENCODINGS`: gzip, and brotli (`br`) and zstd when the brotli and
+zstandard packages are installed. Streamed and already encoded responses, and
+the types that don't compress (images...), are sent as they are.
+
+The ETag of an API payload identifies its content, so the compressed bodies of
+responses with one are kept in the response cache (see api.cache) by ETag and
+`Accept` header, and hot pages are rendered but not compressed again on every
+hit. Only the API's own media types are compressed: browsable API pages (and
+any other HTML) carry the CSRF token next to data echoed from the request, so
+their compressed length could leak the token (BREACH).
+"""
+
+import gzip
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from api import cache, performance
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# encoding -> function compressing content, at levels trading some ratio for
+# speed since most bodies are compressed while the client waits
+ENCODERS = {"gzip": lambda content: gzip.compress(content, compresslevel=6, mtime=0)}
+if brotli is not None:
+    ENCODERS["br"] = lambda content: brotli.compress(content, quality=5)
+if zstandard is not None:
+    ENCODERS["zstd"] = lambda content: zstandard.compress(content, 3)
+
+# media types compressed, those of the API payloads, which hold no secret
+COMPRESSIBLE_TYPES = ("application/json", "application/msgpack", "application/x-ndjson")
+
+# media types whose compressed bodies are cached by ETag
+CACHED_TYPES = ("application/json", "application/msgpack")
+
+
+def get_encoding(request):
+    """
+    Return the encoding to compress the response to `request` with, the one
+    accepted with the highest quality and then the first in
+    `COMPRESSION_ENCODINGS`, or None.
+    """
+    accepted = {}
+    for item in request.headers.get("Accept-Encoding", "").split(","):
+        name, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    encoding, best = None, 0.0
+    for name in settings.COMPRESSION_ENCODINGS:
+        quality = accepted.get(name, accepted.get("*", 0.0))
+        if name in ENCODERS and quality > best:
+            encoding, best = name, quality
+    return encoding
+
+
+def is_compressible(content_type):
+    media_type = content_type.partition(";")[0].strip().lower()
+    return media_type in COMPRESSIBLE_TYPES
+
+
+def compress(request, response, encoding):
+    """Return the content of `response` compressed with `encoding`"""
+    key = None
+    if response.has_header("ETag") and response["Content-Type"].startswith(
+        CACHED_TYPES
+    ):
+        # the payload is rendered as negotiated from `Accept` (e.g. indented)
+        key = cache.compressed_cache_key(
+            response["ETag"], request.headers.get("Accept", ""), encoding
+        )
+
+    content = cache.get_compressed(key)
+    if content is None:
+        content = ENCODERS[encoding](response.content)
+        cache.set_compressed(key, content)
+    return content
+
+
+class CompressionMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        encoding = self.get_response_encoding(request, response)
+        if encoding is not None:
+            self.compress_response(request, response, encoding)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        encoding = self.get_response_encoding(request, response)
+        if encoding is not None:
+            # off the event loop, as the cache and compressing are blocking
+            await sync_to_async(self.compress_response)(request, response, encoding)
+        return response
+
+    def get_response_encoding(self, request, response):
+        """Return the encoding to compress `response` with, or None"""
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or len(response.content) < settings.COMPRESSION_MIN_SIZE
+            or not is_compressible(response.get("Content-Type", ""))
+        ):
+            return None
+        patch_vary_headers(response, ["Accept-Encoding"])
+        return get_encoding(request)
+
+    def compress_response(self, request, response, encoding):
+        with performance.timer("compress"):
+            content = compress(request, response, encoding)
+        response.content = content
+        response["Content-Length"] = str(len(content))
+        response["Content-Encoding"] = encoding
@@ -0,0 +1,116 @@
+"""
+Conditional GET support for the authors endpoints.
+
+Validators are derived from the `modified` timestamps of the author and its
+books, so they can be computed with a single aggregate query before anything
+is serialized. ETags are weak because the same payload may be rendered and
+encoded in several ways (JSON, browsable API, compressed).
+"""
+
+import calendar
+import hashlib
+import uuid
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from books.models import Author, Book
+
+
+def make_etag(*parts):
+    digest = hashlib.md5(repr(parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest}"'
+
+
+def get_author_validators(pk, request):
+    """
+    Return the `(etag, last_modified)` validators of the author with given id,
+    or None when there's no such author.
+    """
+    queryset = _author_validators_queryset(pk)
+    if queryset is None:
+        return None
+    return _author_validators(pk, queryset.first(), request)
+
+
+async def aget_author_validators(pk, request):
+    """Async version of `get_author_validators`"""
+    queryset = _author_validators_queryset(pk)
+    if queryset is None:
+        return None
+    return _author_validators(pk, await queryset.afirst(), request)
+
+
+def _author_validators_queryset(pk):
+    try:
+        pk = uuid.UUID(str(pk))
+    except ValueError:
+        return None
+
+    return (
+        Author.objects.filter(id=pk)
+        .annotate(books_modified=Max("books__modified"), books_count=Count("books"))
+        .values_list("modified", "books_modified", "books_count")
+    )
+
+
+def _author_validators(pk, row, request):
+    if row is None:
+        return None
+
+    modified, books_modified, books_count = row
+    last_modified = max(filter(None, (modified, books_modified)))
+    etag = make_etag(str(pk), last_modified, books_count, request.GET.urlencode())
+    return etag, calendar.timegm(last_modified.utctimetuple())
+
+
+def get_page_etag(request, page, metadata):
+    """
+    Return the ETag of a page of authors given the pagination metadata (count
+    and links) it will be rendered with.
+
+    No Last-Modified is derived for pages since authors deleted from other
+    pages would shift this one without changing any of its timestamps.
+    """
+    books = _page_books_queryset(page).aggregate(
+        modified=Max("modified"), count=Count("id")
+    )
+    return _page_etag(request, page, metadata, books)
+
+
+async def aget_page_etag(request, page, metadata):
+    """Async version of `get_page_etag`"""
+    books = await _page_books_queryset(page).aaggregate(
+        modified=Max("modified"), count=Count("id")
+    )
+    return _page_etag(request, page, metadata, books)
+
+
+def _page_books_queryset(page):
+    return Book.objects.filter(author__in=page)
+
+
+def _page_etag(request, page, metadata, books):
+    authors = [(str(author.id), author.modified) for author in page]
+    return make_etag(
+        request.build_absolute_uri(),
+        sorted(metadata.items()),
+        authors,
+        books["modified"],
+        books["count"],
+    )
+
+
+def not_modified(request, etag, last_modified=None):
+    """Return a 304 response when the request's preconditions match, or None"""
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def set_validators(response, etag, last_modified=None):
+    response["ETag"] = etag
+    # the payload is rendered in the format negotiated from `Accept`
+    patch_vary_headers(response, ["Accept"])
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    return response
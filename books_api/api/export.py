@@ -0,0 +1,66 @@
+from asgiref.sync import sync_to_async
+from django.db.models import Exists, OuterRef, Q
+
+from api.fast_serializers import read_serializer
+from api.renderers import FastJSONRenderer
+from api.serializers import AuthorSerializer
+from books.models import Author, Book
+
+EXPORT_CHUNK_SIZE = 500
+
+
+def export_authors(modified_since=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield the payload of every author, with its books, as served by the
+    authors endpoints.
+
+    Authors are read `chunk_size` at a time through a server-side cursor, with
+    the books of each chunk prefetched in one query, so memory stays flat
+    regardless of the catalog's size. When `modified_since` is given only the
+    authors modified since then, or with books modified since then, are
+    exported (deleted authors can't be reported).
+    """
+    authors = Author.objects.with_books().order_by("id")
+    if modified_since is not None:
+        authors = authors.filter(
+            Q(modified__gte=modified_since)
+            | Exists(
+                Book.objects.filter(author=OuterRef("pk"), modified__gte=modified_since)
+            )
+        )
+
+    serializer_class = read_serializer(AuthorSerializer)
+    for author in authors.iterator(chunk_size=chunk_size):
+        yield serializer_class(author).data
+
+
+def export_lines(modified_since=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the exported authors as newline-delimited JSON, one per line"""
+    renderer = FastJSONRenderer()
+    for data in export_authors(modified_since, chunk_size):
+        yield renderer.render(data) + b"\n"
+
+
+def buffered(lines, size=64 * 1024):
+    """Group lines into blocks of about `size` bytes, to write fewer chunks"""
+    block, block_size = [], 0
+    for line in lines:
+        block.append(line)
+        block_size += len(line)
+        if block_size >= size:
+            yield b"".join(block)
+            block, block_size = [], 0
+    if block:
+        yield b"".join(block)
+
+
+async def aiterate(iterable):
+    """
+    Iterate `iterable` one item at a time in the thread the ORM runs in, for
+    the responses streamed by the ASGI application: a sync iterator would be
+    read whole into memory before the first chunk is sent.
+    """
+    iterator = iter(iterable)
+    done = object()
+    while (item := await sync_to_async(next)(iterator, done)) is not done:
+        yield item
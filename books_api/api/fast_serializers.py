@@ -0,0 +1,192 @@
+"""
+Read-only serialization engine mirroring the DRF serializers of `api.serializers`.
+
+DRF resolves, converts and validates every field of every object through
+several method calls. For the plain UUID, char and date fields of the read
+endpoints that's mostly overhead, so these serializers compile each DRF
+serializer's fields once into a table of `(name, getter, converter)` and build
+the payload dicts from it. Fields without a fast converter fall back to the DRF
+field's own `to_representation`, so the output is always the same as the DRF
+serializer's.
+
+The engine is enabled with `API_SERIALIZATION_ENGINE = "fast"`.
+"""
+
+import operator
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import fields as drf_fields
+from rest_framework.settings import api_settings
+
+from api.serializers import (
+    AuthorSerializer,
+    BaseBookSerializer,
+    BookSerializer,
+    CollaboratorSerializer,
+)
+
+
+def _uses_iso_format(field, default):
+    output_format = getattr(field, "format", default)
+    return output_format is not None and output_format.lower() == drf_fields.ISO_8601
+
+
+def _datetime_converter(field):
+    if not _uses_iso_format(field, api_settings.DATETIME_FORMAT) or hasattr(
+        field, "timezone"
+    ):
+        return field.to_representation
+
+    def convert(value):
+        if isinstance(value, str):
+            return value
+        if settings.USE_TZ:
+            current_timezone = timezone.get_current_timezone()
+            if timezone.is_aware(value):
+                value = value.astimezone(current_timezone)
+            else:
+                return field.to_representation(value)
+        elif timezone.is_aware(value):
+            return field.to_representation(value)
+
+        value = value.isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return convert
+
+
+def _date_converter(field):
+    if not _uses_iso_format(field, api_settings.DATE_FORMAT):
+        return field.to_representation
+
+    def convert(value):
+        return value if isinstance(value, str) else value.isoformat()
+
+    return convert
+
+
+def get_converter(field):
+    """Return a function converting attribute values of given DRF field"""
+    if isinstance(field, drf_fields.UUIDField) and field.uuid_format == "hex_verbose":
+        return str
+    if type(field) is drf_fields.CharField:
+        return str
+    if isinstance(field, drf_fields.DateTimeField):
+        return _datetime_converter(field)
+    if isinstance(field, drf_fields.DateField):
+        return _date_converter(field)
+    return field.to_representation
+
+
+class FastSerializer:
+    """
+    Read-only stand-in for the DRF `serializer_class`, supporting the
+    `Serializer(instance, many=...).data` interface used by the views.
+
+    Method fields are delegated to `get_<field name>` methods on this class.
+    `fields` optionally restricts the payload to the named fields.
+    """
+
+    serializer_class = None
+
+    def __init__(self, instance=None, many=False, fields=None):
+        self.instance = instance
+        self.many = many
+        self.fields_table = self.get_fields_table()
+        if fields is not None:
+            self.fields_table = tuple(
+                row for row in self.fields_table if row[0] in fields
+            )
+
+    @property
+    def data(self):
+        if self.many:
+            return [self.to_representation(obj) for obj in self.instance]
+        return self.to_representation(self.instance)
+
+    def to_representation(self, obj):
+        ret = {}
+        for name, getter, convert in self.fields_table:
+            value = getter(obj)
+            ret[name] = None if value is None else convert(value)
+        return ret
+
+    @classmethod
+    def get_fields_table(cls):
+        # compiled once per class, on first use
+        table = cls.__dict__.get("_fields_table")
+        if table is None:
+            table = cls._fields_table = tuple(cls.compile_fields())
+        return table
+
+    @classmethod
+    def compile_fields(cls):
+        for name, field in cls.serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, drf_fields.SerializerMethodField):
+                yield name, _identity, getattr(cls, f"get_{name}")
+            else:
+                yield name, operator.attrgetter(field.source), get_converter(field)
+
+
+def _identity(obj):
+    return obj
+
+
+class FastBaseBookSerializer(FastSerializer):
+    serializer_class = BaseBookSerializer
+
+
+class FastCollaboratorSerializer(FastSerializer):
+    serializer_class = CollaboratorSerializer
+
+
+class FastAuthorSerializer(FastSerializer):
+    serializer_class = AuthorSerializer
+
+    @staticmethod
+    def get_books(obj):
+        books = getattr(obj, "ordered_books", None)
+        if books is None:
+            books = obj.books.order_by("name")
+        return FastBaseBookSerializer(books, many=True).data
+
+
+class FastBookSerializer(FastSerializer):
+    serializer_class = BookSerializer
+
+    @staticmethod
+    def get_author(obj):
+        return {
+            "id": str(obj.author.id),
+            "name": obj.author.name,
+        }
+
+    @staticmethod
+    def get_collaborators(obj):
+        return FastCollaboratorSerializer(obj.collaborators.all(), many=True).data
+
+
+FAST_SERIALIZERS = {
+    fast_serializer.serializer_class: fast_serializer
+    for fast_serializer in (
+        FastAuthorSerializer,
+        FastBaseBookSerializer,
+        FastBookSerializer,
+        FastCollaboratorSerializer,
+    )
+}
+
+
+def read_serializer(serializer_class):
+    """
+    Return the serializer to use for read-only payloads of `serializer_class`,
+    according to the `API_SERIALIZATION_ENGINE` setting.
+    """
+    if settings.API_SERIALIZATION_ENGINE == "fast":
+        return FAST_SERIALIZERS.get(serializer_class, serializer_class)
+    return serializer_class
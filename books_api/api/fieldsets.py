@@ -0,0 +1,69 @@
+"""
+Sparse fieldsets for the authors endpoints.
+
+`?fields=id,name` restricts author payloads to the named fields, so only their
+columns are selected and, unless `books` is among them, the books aren't
+fetched at all. `?expand=books` adds the books to a restricted payload. Without
+`fields` payloads hold every field, as before.
+"""
+
+from rest_framework import serializers
+
+from api.serializers import AuthorSerializer
+from books.models import Author
+
+AUTHOR_FIELDS = AuthorSerializer.Meta.fields
+EXPANDABLE_FIELDS = ("books",)
+
+# columns always selected: the list ordering and cursors use `name` and `id`,
+# page ETags use `modified`
+REQUIRED_COLUMNS = ("id", "name", "modified")
+
+
+def get_author_fields(request):
+    """
+    Return the names of the author fields requested, or None for all of them.
+    Raise a `ValidationError` when unknown fields are requested.
+    """
+    fields = _parse_list(request.query_params.get("fields"))
+    expand = _parse_list(request.query_params.get("expand")) or []
+
+    errors = {}
+    unknown = [name for name in fields or () if name not in AUTHOR_FIELDS]
+    if unknown:
+        errors["fields"] = [f"Unknown fields: {', '.join(unknown)}."]
+    unknown = [name for name in expand if name not in EXPANDABLE_FIELDS]
+    if unknown:
+        errors["expand"] = [f"Unknown fields: {', '.join(unknown)}."]
+    if errors:
+        raise serializers.ValidationError(errors)
+
+    if fields is None:
+        return None
+    return tuple(name for name in AUTHOR_FIELDS if name in fields or name in expand)
+
+
+def author_columns(fields):
+    """Return the author columns to select for given fields"""
+    columns = [name for name in fields if name != "books"]
+    return tuple(dict.fromkeys(REQUIRED_COLUMNS + tuple(columns)))
+
+
+def author_queryset(fields):
+    """Return the authors queryset selecting and prefetching given fields"""
+    queryset = Author.objects.all()
+    if fields is not None:
+        queryset = queryset.only(*author_columns(fields))
+    if includes_books(fields):
+        queryset = queryset.with_books()
+    return queryset
+
+
+def includes_books(fields):
+    return fields is None or "books" in fields
+
+
+def _parse_list(value):
+    if value is None:
+        return None
+    return [name.strip() for name in value.split(",") if name.strip()]
@@ -0,0 +1,78 @@
+"""
+Filters of the authors list.
+
+Every filter is a condition on a single indexed column, so filtered pages are
+range searches on an index rather than scans of the authors table:
+
+- `birthday_after`, `birthday_before` (dates, inclusive): `author_birthday_idx`
+- `created_after`, `created_before`, `modified_after`, `modified_before`
+  (ISO 8601 datetimes, inclusive): `author_created_idx`, `author_modified_idx`
+- `has_books` (true/false), on the denormalized `book_count`:
+  `author_book_count_idx`
+- `name_prefix` (case sensitive): `author_name_idx`
+"""
+
+import sys
+
+from rest_framework import serializers
+
+RANGE_FILTERS = {
+    "birthday_after": "birthday__gte",
+    "birthday_before": "birthday__lte",
+    "created_after": "created__gte",
+    "created_before": "created__lte",
+    "modified_after": "modified__gte",
+    "modified_before": "modified__lte",
+}
+
+
+class AuthorFilterSerializer(serializers.Serializer):
+    birthday_after = serializers.DateField(required=False)
+    birthday_before = serializers.DateField(required=False)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+    modified_after = serializers.DateTimeField(required=False)
+    modified_before = serializers.DateTimeField(required=False)
+    has_books = serializers.BooleanField(required=False)
+    name_prefix = serializers.CharField(required=False, max_length=1500)
+
+
+def get_author_filters(request):
+    """
+    Return the author filters given in the request params, by name. Raise a
+    `ValidationError` when any of them is not valid.
+    """
+    # a plain dict, so missing booleans aren't read as unchecked checkboxes
+    serializer = AuthorFilterSerializer(data=request.query_params.dict())
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+def filter_authors(queryset, filters):
+    """Return the authors of `queryset` matching given filters"""
+    conditions = {
+        lookup: filters[name]
+        for name, lookup in RANGE_FILTERS.items()
+        if name in filters
+    }
+
+    if "has_books" in filters:
+        if filters["has_books"]:
+            conditions["book_count__gt"] = 0
+        else:
+            conditions["book_count"] = 0
+
+    prefix = filters.get("name_prefix")
+    if prefix:
+        # `startswith` is a LIKE, which can't use the index by itself: bound it
+        # within the range of names sharing the prefix
+        conditions["name__gte"] = prefix
+        upper = ord(prefix[-1]) + 1
+        if 0xD800 <= upper <= 0xDFFF:
+            # surrogates can't be encoded, and no text holds any
+            upper = 0xE000
+        if upper <= sys.maxunicode:
+            conditions["name__lt"] = prefix[:-1] + chr(upper)
+        conditions["name__startswith"] = prefix
+
+    return queryset.filter(**conditions)
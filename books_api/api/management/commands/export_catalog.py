@@ -0,0 +1,41 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+from django.utils import timezone
+
+from api.export import EXPORT_CHUNK_SIZE, export_lines
+
+
+class Command(BaseCommand):
+    help = "Export all authors with their books as newline-delimited JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output", "-o", help="File to write to, defaults to standard output"
+        )
+        parser.add_argument(
+            "--modified-since",
+            help="Only export authors modified since given ISO 8601 datetime",
+        )
+        parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        modified_since = options["modified_since"]
+        if modified_since is not None:
+            value = parse_datetime(modified_since)
+            if value is None:
+                raise CommandError(f"Invalid --modified-since '{modified_since}'")
+            if timezone.is_naive(value):
+                value = timezone.make_aware(value)
+            modified_since = value
+
+        output = (
+            open(options["output"], "wb") if options["output"] else sys.stdout.buffer
+        )
+        try:
+            for line in export_lines(modified_since, options["chunk_size"]):
+                output.write(line)
+        finally:
+            if options["output"]:
+                output.close()
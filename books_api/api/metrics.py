@@ -0,0 +1,307 @@
+"""
+Prometheus metrics of the API, served by `GET /metrics`.
+
+`MetricsMiddleware` counts the requests and observes their latency in a
+fixed-bucket histogram, both labelled by route (the URL name), action (the DRF
+viewset action, or the view function's name) and, for the counter, method and
+status code:
+
+    api_requests_total{route, action, method, status}
+    api_request_duration_seconds{route, action}
+
+Recording a request is a few additions to floats kept in memory. When
+`METRICS_DIR` is set, each process keeps them in its own memory-mapped file in
+that directory instead, and a scrape served by any process sums the files of
+all of them, so the numbers cover every worker of a multiprocess server (e.g.
+gunicorn). The directory should be emptied when the server (re)starts.
+"""
+
+import functools
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import defaultdict
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+
+REQUESTS = "api_requests_total"
+DURATION = "api_request_duration_seconds"
+
+HELP = {
+    REQUESTS: ("counter", "Requests served, by route, action, method and status."),
+    DURATION: ("histogram", "Time spent serving requests, by route and action."),
+}
+
+# upper bounds (seconds) of the latency buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MemoryStore:
+    """Values of the current process, kept in a dict"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = defaultdict(float)
+
+    def add(self, key, amount):
+        with self.lock:
+            self.values[key] += amount
+
+    def collect(self):
+        with self.lock:
+            return dict(self.values)
+
+
+class FileStore:
+    """
+    Values of the current process, kept in a memory-mapped file so the other
+    processes can read them.
+
+    The file starts with the number of bytes in use, followed by one entry per
+    key: the key's length, the key (UTF-8, padded to 8 bytes) and its value as
+    a double. Entries are only ever appended, and their values updated in place.
+    """
+
+    HEADER = struct.Struct("<Q")
+    KEY_LENGTH = struct.Struct("<I")
+    VALUE = struct.Struct("<d")
+    INITIAL_SIZE = 64 * 1024
+
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.path = path
+        # reopened by a process reusing the pid of a dead one: its counters
+        # go on from where they were
+        self.file = open(path, "a+b")
+        size = max(os.fstat(self.file.fileno()).st_size, self.INITIAL_SIZE)
+        self.file.truncate(size)
+        self.map = mmap.mmap(self.file.fileno(), size)
+        self.used = self.HEADER.unpack_from(self.map, 0)[0] or self.HEADER.size
+        # key -> offset of its value
+        self.positions = {
+            key: offset for key, offset, _ in self.read_entries(self.map, self.used)
+        }
+
+    @classmethod
+    def read_entries(cls, data, used):
+        offset = cls.HEADER.size
+        while offset < used:
+            (length,) = cls.KEY_LENGTH.unpack_from(data, offset)
+            start = offset + cls.KEY_LENGTH.size
+            key = bytes(data[start : start + length]).decode("utf-8")
+            offset = start + length + cls.padding(cls.KEY_LENGTH.size + length)
+            (value,) = cls.VALUE.unpack_from(data, offset)
+            yield key, offset, value
+            offset += cls.VALUE.size
+
+    @staticmethod
+    def padding(length):
+        return -length % 8
+
+    def add(self, key, amount):
+        with self.lock:
+            offset = self.positions.get(key)
+            if offset is None:
+                offset = self.append(key)
+            (value,) = self.VALUE.unpack_from(self.map, offset)
+            self.VALUE.pack_into(self.map, offset, value + amount)
+
+    def append(self, key):
+        encoded = key.encode("utf-8")
+        length = self.KEY_LENGTH.size + len(encoded)
+        entry_size = length + self.padding(length) + self.VALUE.size
+        if self.used + entry_size > len(self.map):
+            self.grow(self.used + entry_size)
+
+        start = self.used
+        self.KEY_LENGTH.pack_into(self.map, start, len(encoded))
+        self.map[start + self.KEY_LENGTH.size : start + length] = encoded
+        offset = start + entry_size - self.VALUE.size
+        self.VALUE.pack_into(self.map, offset, 0.0)
+        # readers only see the entry once it's complete
+        self.used += entry_size
+        self.HEADER.pack_into(self.map, 0, self.used)
+        self.positions[key] = offset
+        return offset
+
+    def grow(self, size):
+        new_size = len(self.map)
+        while new_size < size:
+            new_size *= 2
+        self.map.close()
+        self.file.truncate(new_size)
+        self.map = mmap.mmap(self.file.fileno(), new_size)
+
+    def collect(self):
+        """Return the values of every process writing to the directory"""
+        values = defaultdict(float)
+        directory = os.path.dirname(self.path)
+        for name in os.listdir(directory):
+            if not name.endswith(".db"):
+                continue
+            try:
+                with open(os.path.join(directory, name), "rb") as file:
+                    data = file.read()
+            except FileNotFoundError:
+                continue
+            if len(data) < self.HEADER.size:
+                continue
+            used = self.HEADER.unpack_from(data, 0)[0]
+            for key, _, value in self.read_entries(data, min(used, len(data))):
+                values[key] += value
+        return dict(values)
+
+
+_store, _store_pid = None, None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return the store of the current process, a new one after a fork"""
+    global _store, _store_pid
+    pid = os.getpid()
+    if _store_pid != pid:
+        with _store_lock:
+            if _store_pid != pid:
+                directory = settings.METRICS_DIR
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                    _store = FileStore(os.path.join(directory, f"{pid}.db"))
+                else:
+                    _store = MemoryStore()
+                _store_pid = pid
+    return _store
+
+
+def metric_key(name, labels):
+    return json.dumps([name, labels], separators=(",", ":"))
+
+
+@functools.lru_cache(maxsize=4096)
+def request_keys(route, action, method, status, bucket):
+    """Return the keys of the values to update for a request"""
+    labels = {"route": route, "action": action}
+    return (
+        metric_key(REQUESTS, {**labels, "method": method, "status": status}),
+        metric_key(f"{DURATION}_bucket", {**labels, "le": bucket}),
+        metric_key(f"{DURATION}_sum", labels),
+    )
+
+
+def observe_request(route, action, method, status, duration):
+    # buckets are counted individually, and made cumulative when exported
+    bucket = next(bound for bound in BUCKETS if duration <= bound)
+    count_key, bucket_key, sum_key = request_keys(route, action, method, status, bucket)
+    store = get_store()
+    store.add(count_key, 1)
+    store.add(bucket_key, 1)
+    store.add(sum_key, duration)
+
+
+def export():
+    """Return the metrics in the Prometheus text format"""
+    counters, histograms = defaultdict(float), defaultdict(dict)
+    sums = {}
+    for key, value in get_store().collect().items():
+        name, labels = json.loads(key)
+        if name == REQUESTS:
+            counters[tuple(labels.items())] += value
+        elif name == f"{DURATION}_bucket":
+            bound = labels.pop("le")
+            buckets = histograms[tuple(labels.items())]
+            buckets[bound] = buckets.get(bound, 0) + value
+        elif name == f"{DURATION}_sum":
+            sums[tuple(labels.items())] = value
+
+    lines = []
+    metric_type, description = HELP[REQUESTS]
+    lines += [f"# HELP {REQUESTS} {description}", f"# TYPE {REQUESTS} {metric_type}"]
+    for labels, value in sorted(counters.items()):
+        lines.append(f"{REQUESTS}{format_labels(labels)} {format_value(value)}")
+
+    metric_type, description = HELP[DURATION]
+    lines += [f"# HELP {DURATION} {description}", f"# TYPE {DURATION} {metric_type}"]
+    for labels, buckets in sorted(histograms.items()):
+        count = 0
+        for bound in BUCKETS:
+            count += buckets.get(bound, 0)
+            le = "+Inf" if bound == math.inf else repr(bound)
+            lines.append(
+                f"{DURATION}_bucket{format_labels(labels + (('le', le),))} "
+                f"{format_value(count)}"
+            )
+        lines.append(
+            f"{DURATION}_sum{format_labels(labels)} {format_value(sums.get(labels, 0))}"
+        )
+        lines.append(f"{DURATION}_count{format_labels(labels)} {format_value(count)}")
+    return "\n".join(lines) + "\n"
+
+
+def format_labels(labels):
+    escaped = (
+        (name, str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n"))
+        for name, value in labels
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def format_value(value):
+    return repr(float(value))
+
+
+def metrics_view(request):
+    return HttpResponse(export(), content_type=CONTENT_TYPE)
+
+
+def get_route(request):
+    """Return the route and action labels of a request"""
+    match = request.resolver_match
+    if match is None:
+        return "unmatched", ""
+    # DRF viewsets map each method to an action
+    actions = getattr(match.func, "actions", None)
+    if actions is not None:
+        action = actions.get(request.method.lower(), "")
+    else:
+        action = match.func.__name__
+    return match.view_name, action
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self.observe(request, response, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self.observe(request, response, time.perf_counter() - start)
+        return response
+
+    def observe(self, request, response, duration):
+        route, action = get_route(request)
+        if route == "metrics":
+            return
+        observe_request(
+            route, action, request.method, str(response.status_code), duration
+        )
@@ -0,0 +1,245 @@
+import json
+import uuid
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+from datetime import date
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import F, Q
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from books.models import Author
+
+PAGE_SIZE = 10
+
+AUTHOR_ORDERING_FIELDS = (
+    "name",
+    "birthday",
+    "created",
+    "modified",
+    "book_count",
+    "latest_publish_date",
+)
+
+
+class AuthorPageNumberPagination(PageNumberPagination):
+    page_size = PAGE_SIZE
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async version of `paginate_queryset`, fetching the count and the page
+        with the async queryset API.
+        """
+        self.request = request
+        paginator = self.django_paginator_class(queryset, self.page_size)
+        # set the (cached) count upfront so the paginator doesn't query it
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+            raise NotFound(msg)
+
+        self.page.object_list = [obj async for obj in self.page.object_list]
+        return self.page.object_list
+
+    def get_metadata(self):
+        """Return the paginated response data, except for the results"""
+        return {
+            "count": self.page.paginator.count,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+        }
+
+
+class BookPageNumberPagination(PageNumberPagination):
+    page_size = PAGE_SIZE
+
+
+class AuthorCursorPagination(BasePagination):
+    """
+    Keyset pagination over `(<ordering field>, id)`.
+
+    Each page is fetched with `WHERE (<field>, id) > (<last value>, <last id>)`
+    instead of an OFFSET, and no `COUNT(*)` is issued, so deep pages cost the
+    same as the first one.
+    """
+
+    page_size = PAGE_SIZE
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, ordering=("name", False)):
+        self.field, self.descending = ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request)
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async version of `paginate_queryset`"""
+        queryset = self.get_page_queryset(queryset, request)
+        return self.set_page([obj async for obj in queryset])
+
+    def get_page_queryset(self, queryset, request):
+        self.base_url = request.build_absolute_uri()
+        self.position, self.reverse = self.decode_cursor(request)
+
+        # previous pages are walked backwards, nulls first
+        descending = self.descending != self.reverse
+        nulls_last = self.reverse is False
+        queryset = order_authors(queryset, self.field, descending, nulls_last)
+
+        if self.position is not None:
+            queryset = queryset.filter(
+                self.after_position(*self.position, descending, nulls_last)
+            )
+
+        # fetch one extra item to find out whether there's a following page
+        return queryset[: self.page_size + 1]
+
+    def after_position(self, value, pk, descending, nulls_last):
+        """Return the filter of the authors following given position"""
+        field = self.field
+        after = "lt" if descending else "gt"
+        nullable = Author._meta.get_field(field).null
+
+        if value is None:
+            condition = Q(**{f"{field}__isnull": True, f"id__{after}": pk})
+            if not nulls_last:
+                condition |= Q(**{f"{field}__isnull": False})
+            return condition
+
+        # the first clause is a range on the (field, id) index
+        condition = Q(**{f"{field}__{after}e": value}) & (
+            Q(**{f"{field}__{after}": value}) | Q(**{f"id__{after}": pk})
+        )
+        if nullable and nulls_last:
+            condition |= Q(**{f"{field}__isnull": True})
+        return condition
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+
+        if self.reverse:
+            results.reverse()
+            self.has_next = self.position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.position is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_metadata(self):
+        """Return the paginated response data, except for the results"""
+        return {"next": self.get_next_link(), "previous": self.get_previous_link()}
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+
+        try:
+            cursor = json.loads(b64decode(encoded.encode("ascii")).decode("utf-8"))
+            # cursors issued before orderings were supported hold the name in `n`
+            value = cursor["v"] if "v" in cursor else cursor["n"]
+            if value is not None:
+                value = Author._meta.get_field(self.field).to_python(value)
+            position = (value, uuid.UUID(cursor["i"]))
+            reverse = bool(cursor.get("r", False))
+        except (
+            BinasciiError,
+            UnicodeError,
+            ValueError,
+            KeyError,
+            TypeError,
+            ValidationError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def encode_cursor(self, author, reverse):
+        value = getattr(author, self.field)
+        if isinstance(value, date):
+            value = value.isoformat()
+        cursor = {"v": value, "i": str(author.id)}
+        if reverse:
+            cursor["r"] = True
+        encoded = b64encode(json.dumps(cursor).encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+
+def get_author_ordering(request):
+    """
+    Return the `(field, descending)` the authors list is sorted by, given by
+    the `ordering` param as a field optionally prefixed with `-`.
+    """
+    value = request.query_params.get("ordering", "name")
+    field = value[1:] if value.startswith("-") else value
+    if field not in AUTHOR_ORDERING_FIELDS:
+        choices = ", ".join(AUTHOR_ORDERING_FIELDS)
+        raise serializers.ValidationError(
+            {"ordering": [f"Invalid ordering, choose among: {choices}."]}
+        )
+    return field, value.startswith("-")
+
+
+def order_authors(queryset, field, descending=False, nulls_last=True):
+    """
+    Sort authors by `field` then `id`, both in the same direction so a single
+    `(field, id)` index serves the ordering. Authors without a value go last.
+    """
+    nulls = {}
+    if Author._meta.get_field(field).null:
+        nulls = {"nulls_last": True} if nulls_last else {"nulls_first": True}
+    expression = F(field).desc(**nulls) if descending else F(field).asc(**nulls)
+    return queryset.order_by(expression, "-id" if descending else "id")
+
+
+def get_author_paginator(request, ordering=("name", False)):
+    """
+    Return the paginator to use for the authors list sorted by `ordering`.
+
+    Cursor pagination is used when the request asks for it (`?pagination=cursor`
+    or a `cursor` param) or when `AUTHORS_PAGINATION` is set to "cursor".
+    """
+    mode = request.query_params.get("pagination", settings.AUTHORS_PAGINATION)
+    if (
+        mode == "cursor"
+        or AuthorCursorPagination.cursor_query_param in request.query_params
+    ):
+        return AuthorCursorPagination(ordering)
+    return AuthorPageNumberPagination()
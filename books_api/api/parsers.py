@@ -0,0 +1,48 @@
+"""
+Parsers of the API request bodies.
+
+`FastJSONParser` decodes JSON with orjson, when installed, and with DRF's
+`JSONParser` otherwise. orjson rejects NaN and infinite values as DRF's strict
+mode does.
+
+`MessagePackParser` decodes `application/msgpack` bodies (requires msgpack).
+"""
+
+from django.conf import settings
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from api.renderers import FastJSONRenderer, msgpack, orjson
+
+
+class FastJSONParser(parsers.JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if (
+            orjson is None
+            or not self.strict
+            or encoding.lower()
+            not in (
+                "utf-8",
+                "utf8",
+            )
+        ):
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class MessagePackParser(parsers.BaseParser):
+    media_type = "application/msgpack"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except ValueError as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
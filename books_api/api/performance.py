@@ -0,0 +1,177 @@
+"""
+Per-request performance instrumentation.
+
+`PerformanceMiddleware` records for every request the number of SQL queries
+run and the time spent in the database, the time spent serializing, rendering
+and compressing the payload, and the size of the response sent. They're sent
+back in a `Server-Timing` header (unless `PERFORMANCE_SERVER_TIMING` is off)
+and logged to the `api.performance` logger, one line per request, with the
+same values in the record's `performance` attribute for structured log
+handlers.
+
+Requests running more queries than their threshold in
+`PERFORMANCE_QUERY_THRESHOLDS` are logged as warnings, which is how N+1
+regressions show up.
+"""
+
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# metrics of the request being processed, None outside of the middleware
+current = ContextVar("performance_metrics", default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        # name -> seconds
+        self.timings = defaultdict(float)
+        self.view_end = None
+
+    def record_query(self, execute, sql, params, many, context):
+        """`execute_wrapper` counting the queries run and their duration"""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.timings["db"] += time.perf_counter() - start
+
+
+@contextmanager
+def timer(name):
+    """
+    Add the time spent in the block to the current request's `name` timing.
+    Queries run in the block count both in it and in `db`.
+    """
+    metrics = current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.timings[name] += time.perf_counter() - start
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    `execute_wrapper` of every database connection, recording its queries into
+    the metrics of the request running them, if any. The request is found
+    through the `current` context variable rather than wrapping the connection
+    per request, since under ASGI the concurrent requests share it.
+    """
+    metrics = current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics.record_query(execute, sql, params, many, context)
+
+
+def install(connection, **kwargs):
+    """Have `connection` record its queries (on `connection_created`)"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def get_query_threshold(method, view_name):
+    """
+    Return the most queries a request may run, from the thresholds of its view
+    for its method, of its view, or by default.
+    """
+    thresholds = settings.PERFORMANCE_QUERY_THRESHOLDS
+    for key in (f"{method} {view_name}", view_name, "default"):
+        if key in thresholds:
+            return thresholds[key]
+    return None
+
+
+class PerformanceMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        metrics = RequestMetrics()
+        token = current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current.set(metrics)
+        try:
+            # its ORM calls, run in other threads, get a copy of the context
+            response = await self.get_response(request)
+        finally:
+            current.reset(token)
+        return self.finish(request, response, metrics)
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered once all middleware got to see them
+        current.get().view_end = time.perf_counter()
+        return response
+
+    def finish(self, request, response, metrics):
+        end = time.perf_counter()
+        if metrics.view_end is not None:
+            # the content is compressed once rendered, which is timed apart
+            metrics.timings["render"] += (
+                end - metrics.view_end - metrics.timings.get("compress", 0)
+            )
+        timings = {"total": end - metrics.start, **metrics.timings}
+        size = None if response.streaming else len(response.content)
+
+        if settings.PERFORMANCE_SERVER_TIMING:
+            response["Server-Timing"] = ", ".join(
+                f"{name};dur={seconds * 1000:.1f}"
+                + (f';desc="{metrics.queries} queries"' if name == "db" else "")
+                for name, seconds in timings.items()
+            )
+
+        match = request.resolver_match
+        view_name = match.view_name if match is not None else None
+        threshold = get_query_threshold(request.method, view_name)
+        exceeded = threshold is not None and metrics.queries > threshold
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "view": view_name,
+            "queries": metrics.queries,
+            "size": size,
+            **{
+                f"{name}_ms": round(seconds * 1000, 1)
+                for name, seconds in timings.items()
+            },
+        }
+        if exceeded:
+            record["query_threshold"] = threshold
+
+        message = " ".join(f"{key}={value}" for key, value in record.items())
+        if exceeded:
+            logger.warning(
+                "Query threshold exceeded: %s", message, extra={"performance": record}
+            )
+        else:
+            logger.info(message, extra={"performance": record})
+        return response
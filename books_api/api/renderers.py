@@ -0,0 +1,83 @@
+"""
+Renderers of the API payloads.
+
+`FastJSONRenderer` encodes JSON with orjson, when installed.
+
+orjson encodes the payload dicts, lists and strings in one call to native code
+instead of walking them with the stdlib encoder. The output is byte for byte
+the one of DRF's `JSONRenderer` with the default settings (compact, UTF-8,
+U+2028 and U+2029 escaped): datetimes and any value orjson doesn't know go
+through DRF's own encoder. Only floats may differ: very small or large ones
+are written in orjson's shortest form (`0.00001` rather than `1e-05`, same
+value), and NaN and infinite ones as null where DRF raises an error.
+
+Indented output, non default JSON settings and payloads orjson can't encode
+(e.g. integers over 64 bits) are rendered by DRF's renderer.
+
+`MessagePackRenderer` encodes the same payloads as MessagePack (requires
+msgpack), for clients sending `Accept: application/msgpack`. Values MessagePack
+has no type for (dates, UUIDs, decimals) are written as the strings JSON has.
+"""
+
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        # formatted by DRF's encoder, which only keeps milliseconds
+        | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+
+encoder = encoders.JSONEncoder()
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if not self.can_encode_fast(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            content = orjson.dumps(data, default=encoder.default, option=OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # as DRF does, since they're not valid in JavaScript strings
+        if b"\xe2\x80" in content:
+            content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return content
+
+    def can_encode_fast(self, accepted_media_type, renderer_context):
+        return (
+            orjson is not None
+            and self.encoder_class is encoders.JSONEncoder
+            and not self.ensure_ascii
+            and self.compact
+            and self.get_indent(accepted_media_type, renderer_context) is None
+        )
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=encoder.default, use_bin_type=True)
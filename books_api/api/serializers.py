@@ -1,6 +1,11 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 
 from books.models import Author, Collaborator, Book
+from books.signals import bulk_saved
 
 
 class AuthorSerializer(serializers.ModelSerializer):
@@ -10,8 +15,19 @@ class AuthorSerializer(serializers.ModelSerializer):
         model = Author
         fields = ("id", "name", "created", "biography", "birthday", "books")
 
+    def __init__(self, *args, fields=None, **kwargs):
+        # `fields` optionally restricts the payload to the named fields
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     def get_books(self, obj):
-        return BaseBookSerializer(obj.books.order_by("name"), many=True).data
+        # use books prefetched by `Author.objects.with_books()` when available
+        books = getattr(obj, "ordered_books", None)
+        if books is None:
+            books = obj.books.order_by("name")
+        return BaseBookSerializer(books, many=True).data
 
 
 class BaseBookSerializer(serializers.ModelSerializer):
@@ -50,3 +66,238 @@ class CollaboratorSerializer(serializers.ModelSerializer):
             "id",
             "name",
         )
+
+
+class BulkBookSerializer(serializers.ModelSerializer):
+    # left out, the links of an existing book are kept
+    collaborators = serializers.ListField(child=serializers.UUIDField(), required=False)
+
+    class Meta:
+        model = Book
+        fields = ("name", "publish_date", "collaborators")
+
+
+class BulkAuthorListSerializer(serializers.ListSerializer):
+    """
+    Validate and write a list of authors, with their books and collaborator
+    links, using a fixed number of queries regardless of the list's length.
+
+    The books of an author given with an `id` are matched by name against the
+    author's existing books (in creation order, for books sharing a name):
+    matches are updated with the fields given, the others created, and the
+    author's books missing from the payload are left alone. Sending the same
+    payload again therefore writes no new book.
+    """
+
+    batch_size = 1000
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            return super().to_internal_value(data)
+
+        items, errors = [], []
+        for item in data:
+            try:
+                items.append(self.child.run_validation(item))
+                errors.append({})
+            except serializers.ValidationError as exc:
+                items.append(None)
+                errors.append(exc.detail)
+
+        self.validate_references(items, errors)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+    def validate_references(self, items, errors):
+        """
+        Check that the authors to update and the collaborators to link exist,
+        with one query each, and attach the authors to their items.
+        """
+        valid_items = [item for item in items if item is not None]
+        id_counts = Counter(item["id"] for item in valid_items if item.get("id"))
+        author_ids = set(id_counts)
+        authors = {
+            author.id: author for author in Author.objects.filter(id__in=author_ids)
+        }
+        collaborator_ids = set(
+            Collaborator.objects.filter(
+                id__in={
+                    collaborator_id
+                    for item in valid_items
+                    for book in item["books"]
+                    for collaborator_id in book.get("collaborators", [])
+                }
+            ).values_list("id", flat=True)
+        )
+
+        for item, item_errors in zip(items, errors):
+            if item is None:
+                continue
+
+            if item.get("id") and item["id"] not in authors:
+                item_errors["id"] = [f"Author with id '{item['id']}' was not found."]
+            elif item.get("id") and id_counts[item["id"]] > 1:
+                item_errors["id"] = [
+                    f"Author with id '{item['id']}' is given more than once."
+                ]
+            item["instance"] = authors.get(item.get("id"))
+
+            books_errors = []
+            for book in item["books"]:
+                collaborator_counts = Counter(book.get("collaborators", []))
+                messages = [
+                    f"Collaborator with id '{collaborator_id}' was not found."
+                    for collaborator_id in collaborator_counts
+                    if collaborator_id not in collaborator_ids
+                ] + [
+                    f"Collaborator with id '{collaborator_id}' is given more than once."
+                    for collaborator_id, count in collaborator_counts.items()
+                    if count > 1
+                ]
+                books_errors.append({"collaborators": messages} if messages else {})
+            if any(books_errors):
+                item_errors["books"] = books_errors
+
+    def create(self, validated_data):
+        now = timezone.now()
+        authors, created_authors, updated_authors = [], [], []
+        created_books, updated_books, links = [], [], []
+        existing_books = self.get_existing_books(
+            [
+                item["instance"]
+                for item in validated_data
+                if item["instance"] and item["books"]
+            ]
+        )
+
+        for item in validated_data:
+            author = item["instance"]
+            if author is None:
+                author = Author()
+                created_authors.append(author)
+            else:
+                author.modified = now
+                updated_authors.append(author)
+            for field in ("name", "biography", "birthday"):
+                if field in item:
+                    setattr(author, field, item[field])
+
+            author.written_books = []
+            for book_data in item["books"]:
+                matches = existing_books.get((author.id, book_data["name"]))
+                if matches:
+                    book = matches.pop(0)
+                    book.modified = now
+                    if "publish_date" in book_data:
+                        book.publish_date = book_data["publish_date"]
+                    updated_books.append(book)
+                else:
+                    book = Book(
+                        author=author,
+                        name=book_data["name"],
+                        publish_date=book_data.get("publish_date"),
+                    )
+                    created_books.append(book)
+                if "collaborators" in book_data:
+                    links += [
+                        Book.collaborators.through(
+                            book_id=book.id, collaborator_id=collaborator_id
+                        )
+                        for collaborator_id in book_data["collaborators"]
+                    ]
+                author.written_books.append(book)
+            authors.append(author)
+
+        # the links of the updated books given collaborators are replaced
+        relinked_book_ids = {link.book_id for link in links} - {
+            book.id for book in created_books
+        }
+
+        with transaction.atomic():
+            Author.objects.bulk_create(created_authors, batch_size=self.batch_size)
+            Author.objects.bulk_update(
+                updated_authors,
+                ("name", "biography", "birthday", "modified"),
+                batch_size=self.batch_size,
+            )
+            Book.objects.bulk_create(created_books, batch_size=self.batch_size)
+            Book.objects.bulk_update(
+                updated_books, ("publish_date", "modified"), batch_size=self.batch_size
+            )
+            if relinked_book_ids:
+                Book.collaborators.through.objects.filter(
+                    book_id__in=relinked_book_ids
+                ).delete()
+            Book.collaborators.through.objects.bulk_create(
+                links, batch_size=self.batch_size
+            )
+
+            bulk_saved.send(sender=Author, instances=created_authors, created=True)
+            bulk_saved.send(sender=Author, instances=updated_authors, created=False)
+            bulk_saved.send(sender=Book, instances=created_books, created=True)
+            bulk_saved.send(sender=Book, instances=updated_books, created=False)
+
+        return authors
+
+    def get_existing_books(self, authors):
+        """Return the books of `authors` by (author id, name), oldest first"""
+        existing_books = defaultdict(list)
+        if authors:
+            for book in Book.objects.filter(author__in=authors).order_by("created"):
+                existing_books[book.author_id, book.name].append(book)
+        return existing_books
+
+
+class BulkAuthorSerializer(serializers.ModelSerializer):
+    id = serializers.UUIDField(required=False)
+    books = BulkBookSerializer(many=True, required=False, default=list)
+
+    class Meta:
+        model = Author
+        fields = ("id", "name", "biography", "birthday", "books")
+        list_serializer_class = BulkAuthorListSerializer
+
+    def to_representation(self, instance):
+        return {
+            "id": str(instance.id),
+            "books": [str(book.id) for book in instance.written_books],
+        }
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=200)
+    type = serializers.MultipleChoiceField(
+        choices=("author", "book", "collaborator"), required=False
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+    offset = serializers.IntegerField(min_value=0, default=0)
+
+    def to_internal_value(self, data):
+        # `type` is given as `?type=author&type=book` or `?type=author,book`
+        if hasattr(data, "getlist"):
+            types = [t for value in data.getlist("type") for t in value.split(",")]
+            data = {key: data[key] for key in data}
+            if types:
+                data["type"] = types
+        return super().to_internal_value(data)
+
+
+class SearchResultSerializer(serializers.Serializer):
+    type = serializers.CharField()
+    id = serializers.UUIDField()
+    name = serializers.CharField()
+    score = serializers.FloatField()
+
+
+class AutocompleteQuerySerializer(SearchQuerySerializer):
+    q = serializers.CharField(max_length=100)
+    type = serializers.MultipleChoiceField(choices=("author", "book"), required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+    offset = None
+
+
+class AutocompleteResultSerializer(serializers.Serializer):
+    type = serializers.CharField()
+    id = serializers.UUIDField()
+    name = serializers.CharField()
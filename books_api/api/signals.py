@@ -0,0 +1,58 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from api.cache import invalidate_authors
+from books.models import NOT_LOADED, Author, Book, Collaborator
+from books.signals import bulk_saved, deleted_with_author
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def invalidate_author(sender, instance, **kwargs):
+    invalidate_authors([instance.pk])
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def invalidate_book_author(sender, instance, **kwargs):
+    if deleted_with_author(kwargs.get("origin")):
+        # invalidated by the author's own deletion
+        return
+    # a book moved to another author also changes its former author's payload
+    invalidate_authors({instance.author_id, instance.loaded_author_id} - {NOT_LOADED})
+
+
+@receiver(post_save, sender=Collaborator)
+@receiver(pre_delete, sender=Collaborator)
+def invalidate_collaborator_authors(sender, instance, created=False, **kwargs):
+    if created:
+        return
+    # the book links are gone by post_delete, so collect the authors before
+    invalidate_authors(
+        Book.objects.filter(collaborators=instance).values_list("author_id", flat=True)
+    )
+
+
+@receiver(m2m_changed, sender=Book.collaborators.through)
+def invalidate_book_collaborators(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if not reverse:
+        invalidate_authors([instance.author_id])
+    elif action == "pre_clear":
+        invalidate_authors(instance.books.values_list("author_id", flat=True))
+    else:
+        invalidate_authors(
+            Book.objects.filter(pk__in=pk_set).values_list("author_id", flat=True)
+        )
+
+
+@receiver(bulk_saved, sender=Author)
+def invalidate_bulk_authors(sender, instances, **kwargs):
+    invalidate_authors([author.pk for author in instances])
+
+
+@receiver(bulk_saved, sender=Book)
+def invalidate_bulk_books_authors(sender, instances, **kwargs):
+    invalidate_authors({book.author_id for book in instances})
@@ -0,0 +1,43 @@
+"""
+Warm-up of the workers at boot.
+
+Django and DRF import and build a lot lazily, on the first request needing it:
+the URLconf and the views, the URL patterns' regular expressions, DRF's
+renderer, parser and authentication classes, the serializers' fields. With
+`PRELOAD_AT_BOOT` on, `preload()` (called by the WSGI and ASGI entry points)
+does it while the worker boots instead, so its first requests are as fast as
+the next ones, and servers loading the application before forking (e.g.
+`gunicorn --preload`) do it once for all their workers.
+"""
+
+from django.conf import settings
+from django.urls import get_resolver
+from rest_framework.settings import api_settings
+
+# DRF settings importing classes on first access
+API_SETTINGS = (
+    "DEFAULT_AUTHENTICATION_CLASSES",
+    "DEFAULT_CONTENT_NEGOTIATION_CLASS",
+    "DEFAULT_PARSER_CLASSES",
+    "DEFAULT_PERMISSION_CLASSES",
+    "DEFAULT_RENDERER_CLASSES",
+)
+
+
+def preload():
+    if not settings.PRELOAD_AT_BOOT:
+        return
+
+    from api.fast_serializers import FAST_SERIALIZERS
+
+    # populating the reverse lookups imports the views and compiles every
+    # URL pattern
+    get_resolver().reverse_dict
+
+    for name in API_SETTINGS:
+        getattr(api_settings, name)
+
+    # builds the DRF serializers' fields (and the models' options they read)
+    # and compiles the fast serializers' tables
+    for fast_serializer_class in FAST_SERIALIZERS.values():
+        fast_serializer_class.get_fields_table()
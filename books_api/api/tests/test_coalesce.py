@@ -0,0 +1,271 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient, APITransactionTestCase
+
+from api import async_views, coalesce
+from api.views import AuthorViewSet
+from books.tests.fixtures import AuthorFactory, BookFactory
+
+STAMPEDE = 8
+
+
+def wait_for_waiters(count, timeout=5):
+    """Wait until `count` threads are waiting on a flight"""
+    deadline = time.monotonic() + timeout
+    while not any(flight.waiters == count for flight in coalesce.flights.values()):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"{count} threads never waited on a flight")
+        time.sleep(0.001)
+
+
+class CoalesceTestCase(SimpleTestCase):
+    def stampede(self, function, key="key"):
+        """Call `function` through `do` from STAMPEDE threads at once"""
+        started = threading.Event()
+
+        def leading():
+            started.set()
+            wait_for_waiters(STAMPEDE - 1)
+            return function()
+
+        with ThreadPoolExecutor(STAMPEDE) as executor:
+            futures = [executor.submit(coalesce.do, key, leading)]
+            started.wait()
+            futures += [
+                executor.submit(coalesce.do, key, function) for _ in range(STAMPEDE - 1)
+            ]
+            return [future.exception() or future.result() for future in futures]
+
+    def test_do(self):
+        """Should compute once the result of concurrent calls with the same key"""
+        function = mock.Mock(return_value={"id": 1})
+
+        results = self.stampede(function)
+
+        self.assertEqual(function.call_count, 1)
+        self.assertEqual(results, [{"id": 1}] * STAMPEDE)
+        self.assertEqual(coalesce.flights, {})
+
+    def test_do_error(self):
+        """Should raise the error of the computation to every concurrent call"""
+        error = ValueError("Database unavailable")
+        function = mock.Mock(side_effect=error)
+
+        results = self.stampede(function)
+
+        self.assertEqual(function.call_count, 1)
+        self.assertEqual(results, [error] * STAMPEDE)
+        self.assertEqual(coalesce.flights, {})
+
+    def test_do_sequential(self):
+        """Should compute again the result of calls made after the first returned"""
+        function = mock.Mock(side_effect=[1, 2])
+
+        self.assertEqual(coalesce.do("key", function), 1)
+        self.assertEqual(coalesce.do("key", function), 2)
+
+    def test_do_keys(self):
+        """Should compute apart the results of calls with different keys"""
+        self.assertEqual(
+            coalesce.do("key_1", lambda: coalesce.do("key_2", lambda: 2)), 2
+        )
+
+    @override_settings(AUTHORS_COALESCING=False)
+    def test_do_disabled(self):
+        """Should compute every call's result when disabled in settings"""
+        function = mock.Mock(return_value=1)
+
+        with ThreadPoolExecutor(STAMPEDE) as executor:
+            futures = [
+                executor.submit(coalesce.do, "key", function) for _ in range(STAMPEDE)
+            ]
+
+        self.assertEqual([future.result() for future in futures], [1] * STAMPEDE)
+        self.assertEqual(function.call_count, STAMPEDE)
+
+    def test_ado(self):
+        """Should compute once the result of concurrent coroutines with the same key"""
+        calls = []
+
+        async def function():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"id": 1}
+
+        async def stampede():
+            return await asyncio.gather(
+                *(coalesce.ado("key", function) for _ in range(STAMPEDE))
+            )
+
+        results = async_to_sync(stampede)()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"id": 1}] * STAMPEDE)
+        self.assertEqual(coalesce.async_flights, {})
+
+    def test_ado_error(self):
+        """Should raise the error of the computation to every concurrent coroutine"""
+
+        async def function():
+            await asyncio.sleep(0.01)
+            raise ValueError("Database unavailable")
+
+        async def stampede():
+            return await asyncio.gather(
+                *(coalesce.ado("key", function) for _ in range(STAMPEDE)),
+                return_exceptions=True,
+            )
+
+        results = async_to_sync(stampede)()
+
+        self.assertEqual(len({id(result) for result in results}), 1)
+        self.assertIsInstance(results[0], ValueError)
+        self.assertEqual(coalesce.async_flights, {})
+
+    def test_ado_cancelled(self):
+        """Should have a waiting coroutine take over when the computing one is cancelled"""
+        calls = []
+
+        async def function():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return len(calls)
+
+        async def stampede():
+            leading = asyncio.ensure_future(coalesce.ado("key", function))
+            await asyncio.sleep(0)
+            waiting = asyncio.ensure_future(coalesce.ado("key", function))
+            await asyncio.sleep(0)
+            leading.cancel()
+            return await waiting, leading.cancelled()
+
+        result, cancelled = async_to_sync(stampede)()
+
+        self.assertTrue(cancelled)
+        self.assertEqual(result, 2)
+        self.assertEqual(coalesce.async_flights, {})
+
+
+class StampedeTestCase(APITransactionTestCase):
+    """Concurrent requests for an author or page missing from the cache"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.user_1 = User.objects.create(username="user_1", is_staff=False)
+        self.author_1 = AuthorFactory(name="Jorge Luis Borges")
+        BookFactory.create_batch(3, author=self.author_1)
+        AuthorFactory.create_batch(2)
+
+    def get_concurrently(self, url, method_name):
+        """
+        GET `url` from STAMPEDE threads at once, the first one serializing with
+        `method_name` once all the others are waiting for it. Return the
+        responses and the number of serializations.
+        """
+        method = getattr(AuthorViewSet, method_name)
+        started = threading.Event()
+        calls = []
+
+        def serialize(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 1:
+                started.set()
+                wait_for_waiters(STAMPEDE - 1)
+            return method(*args, **kwargs)
+
+        def get(client):
+            try:
+                return client.get(url)
+            finally:
+                connection.close()
+
+        # logged in beforehand, the requests only read from the database
+        clients = [APIClient() for _ in range(STAMPEDE)]
+        for client in clients:
+            client.force_login(self.user_1)
+
+        with mock.patch.object(AuthorViewSet, method_name, serialize):
+            with ThreadPoolExecutor(STAMPEDE) as executor:
+                futures = [executor.submit(get, clients[0])]
+                started.wait(5)
+                futures += [executor.submit(get, client) for client in clients[1:]]
+                responses = [future.result() for future in futures]
+        return responses, len(calls)
+
+    def test_retrieve(self):
+        """Should fetch and serialize an author once for concurrent requests"""
+        # preconditions
+        url = f"/api/v1/authors/{self.author_1.id}"
+
+        responses, serializations = self.get_concurrently(url, "serialize_author")
+
+        # postconditions
+        self.assertEqual(serializations, 1)
+        self.assertEqual(
+            [response.status_code for response in responses],
+            [status.HTTP_200_OK] * STAMPEDE,
+        )
+        self.assertEqual(len({response.content for response in responses}), 1)
+        self.assertEqual(len({response["ETag"] for response in responses}), 1)
+        self.assertEqual(len(responses[0].json()["books"]), 3)
+
+    def test_list(self):
+        """Should serialize a page of authors once for concurrent requests"""
+        responses, serializations = self.get_concurrently(
+            "/api/v1/authors", "serialize_page"
+        )
+
+        # postconditions
+        self.assertEqual(serializations, 1)
+        self.assertEqual(len({response.content for response in responses}), 1)
+        self.assertEqual(responses[0].json()["count"], 3)
+
+    def test_async_retrieve(self):
+        """Should fetch and serialize an author once for concurrent async requests"""
+        # preconditions
+        url = f"/api/v1/async/authors/{self.author_1.id}"
+        self.async_client.force_login(self.user_1)
+        ado, serialize_author = coalesce.ado, async_views.serialize_author
+        entered, calls = [], []
+
+        async def counting_ado(*args):
+            entered.append(1)
+            return await ado(*args)
+
+        async def serialize(*args):
+            calls.append(1)
+            # until every request waits for this one
+            deadline = time.monotonic() + 5
+            while len(entered) < STAMPEDE and time.monotonic() < deadline:
+                await asyncio.sleep(0.001)
+            return await serialize_author(*args)
+
+        async def stampede():
+            return await asyncio.gather(
+                *(self.async_client.get(url) for _ in range(STAMPEDE))
+            )
+
+        with mock.patch.object(coalesce, "ado", counting_ado), mock.patch.object(
+            async_views, "serialize_author", serialize
+        ):
+            responses = async_to_sync(stampede)()
+
+        # postconditions
+        self.assertEqual(len(entered), STAMPEDE)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(
+            [response.status_code for response in responses],
+            [status.HTTP_200_OK] * STAMPEDE,
+        )
+        self.assertEqual(len({response.content for response in responses}), 1)
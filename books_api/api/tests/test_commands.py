@@ -0,0 +1,46 @@
+import json
+import os
+import tempfile
+from freezegun import freeze_time
+from django.core.management import call_command
+from django.test import TestCase
+
+from api.serializers import AuthorSerializer
+from books.models import Author
+from books.tests.fixtures import AuthorFactory, BookFactory
+
+
+@freeze_time("2023-01-20T10:00:00")
+class ExportCatalogTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.author_1 = AuthorFactory(name="J. K. Rowling")
+        self.author_2 = AuthorFactory(name="Jorge Luis Borges")
+        self.book_1 = BookFactory(author=self.author_1, name="Book 1")
+
+    def test_export_catalog(self):
+        """Should write every author with its books as newline-delimited JSON"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "catalog.ndjson")
+            call_command("export_catalog", output=path, chunk_size=1)
+            with open(path) as export:
+                exported = [json.loads(line) for line in export]
+
+        expected = [
+            json.loads(json.dumps(AuthorSerializer(author).data))
+            for author in Author.objects.order_by("id")
+        ]
+        self.assertEqual(exported, expected)
+
+    def test_export_catalog_modified_since(self):
+        """Should only write authors modified since given date"""
+        with freeze_time("2023-02-01T10:00:00"):
+            self.author_2.save()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "catalog.ndjson")
+            call_command("export_catalog", output=path, modified_since="2023-01-25")
+            with open(path) as export:
+                exported = [json.loads(line)["id"] for line in export]
+
+        self.assertEqual(exported, [str(self.author_2.id)])
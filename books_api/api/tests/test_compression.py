@@ -0,0 +1,229 @@
+import gzip
+import json
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api import compression
+from books.tests.fixtures import AuthorFactory, BookFactory
+
+
+@override_settings(COMPRESSION_MIN_SIZE=100)
+class CompressionMiddlewareTestCase(APITestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.user_1 = User.objects.create(username="user_1", is_staff=False)
+        self.user_2 = User.objects.create(username="user_2", is_staff=True)
+        self.author_1 = AuthorFactory(name="Jorge Luis Borges")
+        BookFactory.create_batch(3, author=self.author_1)
+        AuthorFactory.create_batch(2)
+
+        # count the bodies compressed with gzip
+        self.gzip = mock.Mock(wraps=compression.ENCODERS["gzip"])
+        patcher = mock.patch.dict(compression.ENCODERS, {"gzip": self.gzip})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_compressed(self):
+        """Should compress responses with an encoding the client accepts"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        expected = self.client.get("/api/v1/authors")
+        self.assertNotIn("Content-Encoding", expected)
+
+        response = self.client.get("/api/v1/authors", HTTP_ACCEPT_ENCODING="gzip")
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertIn("Accept-Encoding", expected["Vary"])
+        self.assertLess(len(response.content), len(expected.content))
+        self.assertEqual(gzip.decompress(response.content), expected.content)
+
+    def test_not_accepted(self):
+        """Should not compress responses when the client accepts no encoding"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        for accept_encoding in ("identity", "gzip;q=0", "unknown"):
+            response = self.client.get(
+                "/api/v1/authors", HTTP_ACCEPT_ENCODING=accept_encoding
+            )
+
+            # postconditions
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("Content-Encoding", response)
+            json.loads(response.content)
+        self.gzip.assert_not_called()
+
+    @override_settings(COMPRESSION_MIN_SIZE=1024 * 1024)
+    def test_small_response(self):
+        """Should not compress responses smaller than the threshold"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        response = self.client.get("/api/v1/authors", HTTP_ACCEPT_ENCODING="gzip")
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Content-Encoding", response)
+        self.assertNotIn("Accept-Encoding", response["Vary"])
+
+    def test_streaming_response(self):
+        """Should not compress streamed responses"""
+        # preconditions
+        self.client.force_login(self.user_2)
+
+        response = self.client.get(
+            "/api/v1/authors/export", HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Content-Encoding", response)
+        self.assertEqual(len(b"".join(response.streaming_content).splitlines()), 3)
+
+    def test_cached(self):
+        """Should compress pages once while their payload doesn't change"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        url = f"/api/v1/authors/{self.author_1.id}"
+
+        responses = [
+            self.client.get(url, HTTP_ACCEPT_ENCODING="gzip") for _ in range(3)
+        ]
+        self.assertEqual(self.gzip.call_count, 1)
+        self.assertEqual(len({response.content for response in responses}), 1)
+
+        self.author_1.name = "Borges"
+        self.author_1.save()
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+
+        # postconditions
+        self.assertEqual(self.gzip.call_count, 2)
+        self.assertEqual(
+            json.loads(gzip.decompress(response.content))["name"], "Borges"
+        )
+
+    def test_cached_by_content_type(self):
+        """Should cache compressed bodies apart for each format"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        json_response = self.client.get("/api/v1/authors", HTTP_ACCEPT_ENCODING="gzip")
+        indented_response = self.client.get(
+            "/api/v1/authors",
+            HTTP_ACCEPT="application/json; indent=4",
+            HTTP_ACCEPT_ENCODING="gzip",
+        )
+
+        # postconditions
+        self.assertEqual(self.gzip.call_count, 2)
+        self.assertNotEqual(
+            gzip.decompress(json_response.content),
+            gzip.decompress(indented_response.content),
+        )
+
+    @override_settings(AUTHORS_CACHE_TIMEOUT=0)
+    def test_cache_disabled(self):
+        """Should compress every response when the cache is disabled"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        for _ in range(2):
+            self.client.get("/api/v1/authors", HTTP_ACCEPT_ENCODING="gzip")
+
+        # postconditions
+        self.assertEqual(self.gzip.call_count, 2)
+
+    def test_browsable_api(self):
+        """Should not compress browsable API pages, which embed the CSRF token"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        response = self.client.get(
+            "/api/v1/authors", HTTP_ACCEPT="text/html", HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertIn(b"csrfToken", response.content)
+        self.gzip.assert_not_called()
+
+    def test_server_timing(self):
+        """Should time the compression apart from the rendering"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        response = self.client.get("/api/v1/authors", HTTP_ACCEPT_ENCODING="gzip")
+
+        # postconditions
+        timings = {
+            metric.split(";")[0] for metric in response["Server-Timing"].split(", ")
+        }
+        self.assertEqual(timings, {"total", "db", "serialize", "render", "compress"})
+
+    def test_async(self):
+        """Should compress the responses of async views served under ASGI"""
+        # preconditions
+        self.async_client.force_login(self.user_1)
+
+        async def get():
+            return await self.async_client.get(
+                "/api/v1/async/authors", ACCEPT_ENCODING="gzip"
+            )
+
+        response = async_to_sync(get)()
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(
+            len(json.loads(gzip.decompress(response.content))["results"]), 3
+        )
+
+
+class GetEncodingTestCase(SimpleTestCase):
+    def get_encoding(self, accept_encoding):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return compression.get_encoding(request)
+
+    @override_settings(COMPRESSION_ENCODINGS=["br", "zstd", "gzip"])
+    def test_preferred_encoding(self):
+        """Should pick the encoding of highest quality, then of the settings' order"""
+        with mock.patch.dict(
+            compression.ENCODERS, {"br": mock.Mock(), "zstd": mock.Mock()}
+        ):
+            cases = {
+                "": None,
+                "identity": None,
+                "gzip": "gzip",
+                "gzip, deflate, br": "br",
+                "GZIP, ZSTD": "zstd",
+                "br;q=0.5, gzip;q=0.8": "gzip",
+                "br;q=0, zstd;q=0, gzip": "gzip",
+                "*": "br",
+                "*;q=0.1, zstd": "zstd",
+                "gzip;q=invalid": None,
+            }
+            for accept_encoding, expected in cases.items():
+                with self.subTest(accept_encoding=accept_encoding):
+                    self.assertEqual(self.get_encoding(accept_encoding), expected)
+
+    @override_settings(COMPRESSION_ENCODINGS=["br", "gzip"])
+    def test_unavailable_encoding(self):
+        """Should skip the encodings whose package isn't installed"""
+        with mock.patch.dict(compression.ENCODERS):
+            compression.ENCODERS.pop("br", None)
+
+            self.assertEqual(self.get_encoding("br, gzip"), "gzip")
+            self.assertIsNone(self.get_encoding("br"))
@@ -0,0 +1,164 @@
+import multiprocessing
+import os
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api import metrics
+from books.tests.fixtures import AuthorFactory
+
+
+def observe_in_child():
+    metrics.observe_request("authors-list", "list", "GET", "200", 0.2)
+
+
+class MetricsTestCase(APITestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        # each test starts with a new store
+        metrics._store_pid = None
+        self.addCleanup(setattr, metrics, "_store_pid", None)
+        self.user_1 = User.objects.create(username="user_1", is_staff=False)
+        self.author_1 = AuthorFactory(name="Jorge Luis Borges")
+
+    def test_metrics(self):
+        """Should count the requests and their latency by route and action"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        self.client.get("/api/v1/authors")
+        self.client.get("/api/v1/authors")
+        self.client.get(f"/api/v1/authors/{self.author_1.id}")
+        self.client.delete(f"/api/v1/authors/{self.author_1.id}")
+
+        response = self.client.get("/metrics")
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], metrics.CONTENT_TYPE)
+        lines = response.content.decode().splitlines()
+        self.assertIn("# TYPE api_requests_total counter", lines)
+        self.assertIn(
+            'api_requests_total{route="authors-list",action="list",method="GET",'
+            'status="200"} 2.0',
+            lines,
+        )
+        self.assertIn(
+            'api_requests_total{route="authors-detail",action="retrieve",'
+            'method="GET",status="200"} 1.0',
+            lines,
+        )
+        self.assertIn(
+            'api_requests_total{route="authors-detail",action="destroy",'
+            'method="DELETE",status="403"} 1.0',
+            lines,
+        )
+        self.assertIn("# TYPE api_request_duration_seconds histogram", lines)
+        self.assertIn(
+            'api_request_duration_seconds_bucket{route="authors-list",action="list",'
+            'le="+Inf"} 2.0',
+            lines,
+        )
+        self.assertIn(
+            'api_request_duration_seconds_count{route="authors-list",action="list"} 2.0',
+            lines,
+        )
+        # /metrics isn't counted
+        self.assertFalse([line for line in lines if 'route="metrics"' in line])
+
+    def test_metrics_async_views(self):
+        """Should label requests to plain async views with the view's name"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        self.client.get("/api/v1/async/authors")
+
+        response = self.client.get("/metrics")
+
+        # postconditions
+        self.assertIn(
+            'api_requests_total{route="async-authors-list",action="author_list",'
+            'method="GET",status="200"} 1.0',
+            response.content.decode().splitlines(),
+        )
+
+    def test_histogram_buckets(self):
+        """Should export cumulative buckets, the sum and the count of observations"""
+        # preconditions
+        for duration in (0.001, 0.03, 0.03, 20):
+            metrics.observe_request("authors-list", "list", "GET", "200", duration)
+
+        lines = metrics.export().splitlines()
+
+        # postconditions
+        labels = 'route="authors-list",action="list"'
+        self.assertIn(
+            f'api_request_duration_seconds_bucket{{{labels},le="0.005"}} 1.0', lines
+        )
+        self.assertIn(
+            f'api_request_duration_seconds_bucket{{{labels},le="0.025"}} 1.0', lines
+        )
+        self.assertIn(
+            f'api_request_duration_seconds_bucket{{{labels},le="0.05"}} 3.0', lines
+        )
+        self.assertIn(
+            f'api_request_duration_seconds_bucket{{{labels},le="10.0"}} 3.0', lines
+        )
+        self.assertIn(
+            f'api_request_duration_seconds_bucket{{{labels},le="+Inf"}} 4.0', lines
+        )
+        self.assertIn(f"api_request_duration_seconds_sum{{{labels}}} 20.061", lines)
+        self.assertIn(f"api_request_duration_seconds_count{{{labels}}} 4.0", lines)
+
+    def test_multiprocess(self):
+        """Should sum the metrics of every process sharing the metrics directory"""
+        # preconditions
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        with override_settings(METRICS_DIR=directory.name):
+            metrics.observe_request("authors-list", "list", "GET", "200", 0.2)
+            for _ in range(2):
+                child = multiprocessing.get_context("fork").Process(
+                    target=observe_in_child
+                )
+                child.start()
+                child.join()
+            lines = metrics.export().splitlines()
+
+        # postconditions
+        self.assertEqual(len(os.listdir(directory.name)), 3)
+        self.assertIn(
+            'api_requests_total{route="authors-list",action="list",method="GET",'
+            'status="200"} 3.0',
+            lines,
+        )
+        self.assertIn(
+            'api_request_duration_seconds_bucket{route="authors-list",action="list",'
+            'le="0.25"} 3.0',
+            lines,
+        )
+
+    def test_file_store_reopened(self):
+        """Should go on from the values of a file left by a previous process"""
+        # preconditions
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "1.db")
+        store = metrics.FileStore(path)
+        store.add("a", 1)
+        # enough keys to grow the file
+        for i in range(5000):
+            store.add(f"key {i}", i)
+
+        store = metrics.FileStore(path)
+        store.add("a", 2)
+
+        # postconditions
+        values = store.collect()
+        self.assertEqual(values["a"], 3)
+        self.assertEqual(values["key 4999"], 4999)
+        self.assertEqual(len(values), 5001)
@@ -0,0 +1,156 @@
+import asyncio
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from books.tests.fixtures import AuthorFactory, BookFactory
+
+
+class PerformanceMiddlewareTestCase(APITestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.user_1 = User.objects.create(username="user_1", is_staff=False)
+        self.author_1 = AuthorFactory(name="Jorge Luis Borges")
+        self.book_1 = BookFactory(author=self.author_1, name="El Aleph")
+
+    def get_timings(self, response):
+        """Return the `Server-Timing` header by metric name"""
+        return {
+            metric.split(";")[0]: metric.split(";")[1:]
+            for metric in response["Server-Timing"].split(", ")
+        }
+
+    def test_server_timing(self):
+        """Should send back the database, serialization and render timings"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/authors")
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timings = self.get_timings(response)
+        self.assertEqual(set(timings), {"total", "db", "serialize", "render"})
+        self.assertIn(f'desc="{len(queries)} queries"', timings["db"])
+
+    @override_settings(PERFORMANCE_SERVER_TIMING=False)
+    def test_server_timing_disabled(self):
+        """Should not send timings back when disabled in settings"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        response = self.client.get("/api/v1/authors")
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Server-Timing", response)
+
+    def test_log(self):
+        """Should log the request's metrics, also as a structured record"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        with self.assertLogs("api.performance", "INFO") as logs:
+            response = self.client.get(f"/api/v1/authors/{self.author_1.id}")
+
+        # postconditions
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(logs.records[0].levelname, "INFO")
+        record = logs.records[0].performance
+        self.assertEqual(record["method"], "GET")
+        self.assertEqual(record["view"], "authors-detail")
+        self.assertEqual(record["status"], 200)
+        self.assertEqual(record["size"], len(response.content))
+        self.assertGreater(record["queries"], 0)
+        self.assertIn(f"queries={record['queries']}", logs.records[0].getMessage())
+
+    def test_query_threshold(self):
+        """Should log a warning when a request exceeds its view's query threshold"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        thresholds = {"default": None, "GET authors-list": 2, "authors-detail": 100}
+
+        with override_settings(PERFORMANCE_QUERY_THRESHOLDS=thresholds):
+            with self.assertLogs("api.performance", "INFO") as logs:
+                self.client.get("/api/v1/authors")
+                self.client.get(f"/api/v1/authors/{self.author_1.id}")
+                self.client.get(f"/api/v1/authors/{self.author_1.id}/books")
+
+        # postconditions
+        self.assertEqual(
+            [record.levelname for record in logs.records], ["WARNING", "INFO", "INFO"]
+        )
+        self.assertEqual(logs.records[0].performance["query_threshold"], 2)
+        self.assertTrue(logs.records[0].getMessage().startswith("Query threshold"))
+
+    def test_query_threshold_read_views(self):
+        """Should keep the read views within their query thresholds"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        BookFactory(author=self.author_1)
+        BookFactory(author=AuthorFactory())
+
+        with self.assertLogs("api.performance", "INFO") as logs:
+            for url in (
+                "/api/v1/authors",
+                f"/api/v1/authors/{self.author_1.id}",
+                "/api/v1/async/authors",
+                f"/api/v1/async/authors/{self.author_1.id}",
+                f"/api/v1/authors/{self.author_1.id}/books",
+                f"/api/v1/authors/{self.author_1.id}/books/{self.book_1.id}",
+            ):
+                cache.clear()
+                self.client.get(url)
+
+        # postconditions
+        self.assertEqual({record.levelname for record in logs.records}, {"INFO"})
+
+    def test_async(self):
+        """Should record the queries of async views served under ASGI"""
+        # preconditions
+        self.async_client.force_login(self.user_1)
+
+        async def get():
+            return await self.async_client.get("/api/v1/async/authors")
+
+        response = async_to_sync(get)()
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timings = self.get_timings(response)
+        self.assertEqual(set(timings), {"total", "db", "serialize", "render"})
+        # session, user, count, page, page ETag and books
+        self.assertIn('desc="6 queries"', timings["db"])
+
+    def test_async_concurrent(self):
+        """Should record apart the queries of concurrent requests under ASGI"""
+        # preconditions
+        self.async_client.force_login(self.user_1)
+
+        async def get():
+            return await asyncio.gather(
+                *(self.async_client.get("/api/v1/async/authors") for _ in range(8))
+            )
+
+        with self.assertLogs("api.performance", "INFO") as logs:
+            with CaptureQueriesContext(connection) as queries:
+                responses = async_to_sync(get)()
+
+        # postconditions
+        self.assertEqual(
+            [response.status_code for response in responses],
+            [status.HTTP_200_OK] * 8,
+        )
+        # each query counts once, in the request running it
+        counts = [record.performance["queries"] for record in logs.records]
+        self.assertEqual(sum(counts), len(queries))
+        self.assertLessEqual(max(counts), 6)
+        self.assertEqual({record.levelname for record in logs.records}, {"INFO"})
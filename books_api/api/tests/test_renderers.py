@@ -0,0 +1,169 @@
+import datetime
+import io
+import json
+import uuid
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.test import TestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.parsers import FastJSONParser, MessagePackParser
+from api.renderers import FastJSONRenderer, MessagePackRenderer, msgpack
+from api.serializers import AuthorSerializer
+from books.models import Author
+from books.tests.fixtures import AuthorFactory, BookFactory, CollaboratorFactory
+
+
+class FastJSONRendererTestCase(TestCase):
+    def assertSameOutput(self, data, accepted_media_type=None):
+        self.assertEqual(
+            FastJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    def test_render(self):
+        """Should render values exactly as JSONRenderer does"""
+        values = [
+            {"id": 1, "name": 'Ünïcödé   "author"', "ratio": 0.1, "books": []},
+            [None, True, False, 2**63 - 1, -(2**63), 1500.25, 0.0001],
+            datetime.datetime(2023, 1, 20, 10, 0, 0, 123456, tzinfo=timezone.utc),
+            datetime.datetime(2023, 1, 20, 10, 0, 0),
+            datetime.date(2023, 1, 20),
+            datetime.time(10, 0, 0, 123456),
+            datetime.timedelta(days=1, seconds=5),
+            uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            Decimal("10.50"),
+            gettext_lazy("Not found."),
+            {1: "integer key", "nested": {"set": {1}}},
+            ("tuple", " line separators", "\x00control\n\t"),
+            "emoji \U0001f4da and “quotes”",
+            # too large for orjson
+            2**64,
+            {"": ""},
+        ]
+        for value in values:
+            with self.subTest(value=value):
+                self.assertSameOutput(value)
+
+    def test_render_float_exponents(self):
+        """Should render very small and large floats with the same values"""
+        data = [0.00001, 1.5e300, -1e16]
+
+        content = FastJSONRenderer().render(data)
+
+        self.assertEqual(json.loads(content), data)
+
+    def test_render_serializer(self):
+        """Should render serialized authors exactly as JSONRenderer does"""
+        author = AuthorFactory(biography="Line break")
+        book = BookFactory(author=author)
+        book.collaborators.add(CollaboratorFactory(), CollaboratorFactory())
+        AuthorFactory()
+
+        self.assertSameOutput(
+            AuthorSerializer(Author.objects.with_books(), many=True).data
+        )
+
+    def test_render_indent(self):
+        """Should render indented output as JSONRenderer does"""
+        data = {"id": 1, "books": [{"id": 2}]}
+        self.assertSameOutput(data, "application/json; indent=4")
+        self.assertIn(
+            b"\n    ", FastJSONRenderer().render(data, "application/json; indent=4")
+        )
+
+    def test_render_none(self):
+        """Should render None as an empty body"""
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_render_without_orjson(self):
+        """Should render with JSONRenderer when orjson isn't installed"""
+        data = {"id": 1, "name": "Author"}
+
+        with mock.patch.object(renderers, "orjson", None):
+            content = FastJSONRenderer().render(data)
+
+        self.assertEqual(content, JSONRenderer().render(data))
+
+
+class FastJSONParserTestCase(TestCase):
+    def parse(self, content, encoding="utf-8"):
+        return FastJSONParser().parse(
+            io.BytesIO(content), parser_context={"encoding": encoding}
+        )
+
+    def test_parse(self):
+        """Should parse JSON documents"""
+        self.assertEqual(
+            self.parse('{"name": "Ünïcödé", "books": [1, 2.5, null]}'.encode()),
+            {"name": "Ünïcödé", "books": [1, 2.5, None]},
+        )
+
+    def test_parse_latin1(self):
+        """Should parse documents in other encodings"""
+        self.assertEqual(
+            self.parse('{"name": "Ünïcödé"}'.encode("latin-1"), "latin-1"),
+            {"name": "Ünïcödé"},
+        )
+
+    def test_parse_errors(self):
+        """Should raise a parse error on invalid documents"""
+        for content in (b"{", b'{"ratio": NaN}', b"\xff", b""):
+            with self.subTest(content=content):
+                with self.assertRaises(ParseError) as context:
+                    self.parse(content)
+                self.assertTrue(
+                    str(context.exception.detail).startswith("JSON parse error")
+                )
+
+
+@skipUnless(msgpack, "requires msgpack")
+class MessagePackTestCase(TestCase):
+    def test_render(self):
+        """Should render values as JSONRenderer does, with strings for non MessagePack types"""
+        data = {
+            "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "created": datetime.datetime(
+                2023, 1, 20, 10, 0, 0, 123456, tzinfo=timezone.utc
+            ),
+            "price": Decimal("10.50"),
+            "detail": gettext_lazy("Not found."),
+            "books": ({"id": 1, "ratio": 0.5, "publish_date": None},),
+        }
+
+        content = MessagePackRenderer().render(data)
+
+        self.assertEqual(
+            MessagePackParser().parse(io.BytesIO(content)),
+            json.loads(JSONRenderer().render(data)),
+        )
+
+    def test_render_serializer(self):
+        """Should render serialized authors more compactly than JSON"""
+        author = AuthorFactory()
+        BookFactory.create_batch(3, author=author)
+        data = AuthorSerializer(Author.objects.with_books(), many=True).data
+
+        content = MessagePackRenderer().render(data)
+
+        self.assertEqual(msgpack.unpackb(content), json.loads(json.dumps(data)))
+        self.assertLess(len(content), len(JSONRenderer().render(data)))
+
+    def test_render_none(self):
+        """Should render None as an empty body"""
+        self.assertEqual(MessagePackRenderer().render(None), b"")
+
+    def test_parse_errors(self):
+        """Should raise a parse error on invalid documents"""
+        for content in (b"", b"\xc1", b"\x81\x01\x02", b"\x01\x02", b"\xa2\xff\xfe"):
+            with self.subTest(content=content):
+                with self.assertRaises(ParseError) as context:
+                    MessagePackParser().parse(io.BytesIO(content))
+                self.assertTrue(
+                    str(context.exception.detail).startswith("MessagePack parse error")
+                )
@@ -0,0 +1,85 @@
+from datetime import date
+from freezegun import freeze_time
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from api.fast_serializers import (
+    FastAuthorSerializer,
+    FastBookSerializer,
+    FastCollaboratorSerializer,
+    read_serializer,
+)
+from api.serializers import AuthorSerializer, BookSerializer, CollaboratorSerializer
+from books.models import Author, Book
+from books.tests.fixtures import AuthorFactory, CollaboratorFactory, BookFactory
+
+
+@freeze_time("2023-01-20T10:00:00.123456")
+class FastSerializersTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.author_1 = AuthorFactory(name="J. K. Rowling", birthday=date(1965, 7, 31))
+        self.author_2 = AuthorFactory(name="Jorge Luis Borges", birthday=None)
+        self.author_3 = AuthorFactory(name='Ünïcödé   "author"', biography="")
+
+        self.collaborator_1 = CollaboratorFactory()
+        self.collaborator_2 = CollaboratorFactory()
+
+        self.book_1 = BookFactory(author=self.author_1, name="Book 1")
+        self.book_2 = BookFactory(author=self.author_1, publish_date=None)
+        self.book_1.collaborators.add(self.collaborator_1, self.collaborator_2)
+
+    def assertSameOutput(
+        self, serializer_class, fast_serializer_class, instance, **kwargs
+    ):
+        renderer = JSONRenderer()
+        expected = serializer_class(instance, many=True, **kwargs).data
+        data = fast_serializer_class(instance, many=True, **kwargs).data
+        self.assertEqual(renderer.render(data), renderer.render(expected))
+
+    def test_author_serializer(self):
+        """Should render authors exactly as AuthorSerializer does"""
+        self.assertSameOutput(
+            AuthorSerializer, FastAuthorSerializer, Author.objects.order_by("name")
+        )
+        self.assertSameOutput(
+            AuthorSerializer,
+            FastAuthorSerializer,
+            Author.objects.with_books().order_by("name"),
+        )
+
+    def test_author_serializer_fields(self):
+        """Should restrict authors to given fields as AuthorSerializer does"""
+        for fields in (("id", "name"), ("birthday", "books"), ()):
+            self.assertSameOutput(
+                AuthorSerializer,
+                FastAuthorSerializer,
+                Author.objects.order_by("name"),
+                fields=fields,
+            )
+
+    def test_book_serializer(self):
+        """Should render books exactly as BookSerializer does"""
+        self.assertSameOutput(BookSerializer, FastBookSerializer, Book.objects.all())
+
+    def test_collaborator_serializer(self):
+        """Should render collaborators exactly as CollaboratorSerializer does"""
+        self.assertSameOutput(
+            CollaboratorSerializer,
+            FastCollaboratorSerializer,
+            self.book_1.collaborators.all(),
+        )
+
+    def test_current_timezone(self):
+        """Should render datetimes in the current timezone as DRF does"""
+        with timezone.override("America/Montevideo"):
+            self.assertSameOutput(
+                AuthorSerializer, FastAuthorSerializer, Author.objects.all()
+            )
+
+    def test_read_serializer(self):
+        """Should pick the serializer of the configured engine"""
+        self.assertIs(read_serializer(AuthorSerializer), AuthorSerializer)
+        with override_settings(API_SERIALIZATION_ENGINE="fast"):
+            self.assertIs(read_serializer(AuthorSerializer), FastAuthorSerializer)
@@ -0,0 +1,46 @@
+import importlib
+import os
+import sys
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+
+def load_prod_settings(**environ):
+    """Import the production settings afresh with given environment"""
+    with mock.patch.dict(os.environ, {"SECRET_KEY": "test", **environ}):
+        with mock.patch.dict(sys.modules):
+            sys.modules.pop("books_api.settings.base", None)
+            sys.modules.pop("books_api.settings.prod", None)
+            return importlib.import_module("books_api.settings.prod")
+
+
+class ProdSettingsTestCase(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.dict(os.environ)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for name in ("CACHE_BACKEND", "CACHE_LOCATION", "AUTHORS_CACHE_TIMEOUT"):
+            os.environ.pop(name, None)
+
+    def test_authors_cache_local_memory(self):
+        """Should turn the authors cache off on a cache private to each process"""
+        settings = load_prod_settings()
+
+        self.assertEqual(settings.AUTHORS_CACHE_TIMEOUT, 0)
+
+    def test_authors_cache_local_memory_explicit(self):
+        """Should keep the authors cache on local memory when asked to"""
+        settings = load_prod_settings(AUTHORS_CACHE_TIMEOUT="60")
+
+        self.assertEqual(settings.AUTHORS_CACHE_TIMEOUT, 60)
+
+    def test_authors_cache_shared(self):
+        """Should keep the authors cache on a shared backend"""
+        settings = load_prod_settings(
+            CACHE_BACKEND="django.core.cache.backends.redis.RedisCache",
+            CACHE_LOCATION="redis://localhost:6379",
+        )
+
+        self.assertEqual(settings.AUTHORS_CACHE_TIMEOUT, 300)
@@ -0,0 +1,106 @@
+import importlib
+import os
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import clear_url_caches, get_resolver
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.settings import api_settings
+from rest_framework.test import APITestCase
+
+from api import startup
+from api.fast_serializers import FAST_SERIALIZERS
+from api.views import AuthorViewSet
+from books.tests.fixtures import AuthorFactory, BookFactory
+
+with mock.patch.dict(os.environ, {"SECRET_KEY": "test"}):
+    api_only = importlib.import_module("books_api.settings.api")
+
+
+@override_settings(
+    MIDDLEWARE=api_only.MIDDLEWARE, REST_FRAMEWORK=api_only.REST_FRAMEWORK
+)
+class APIOnlySettingsTestCase(APITestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.user_1 = User.objects.create(username="user_1", is_staff=False)
+        self.token_1 = Token.objects.create(user=self.user_1)
+        self.author_1 = AuthorFactory(name="Jorge Luis Borges")
+        BookFactory.create_batch(3, author=self.author_1)
+
+        # the views read DRF's settings once, when they're imported
+        for name in ("authentication_classes", "parser_classes", "renderer_classes"):
+            setting = getattr(api_settings, f"DEFAULT_{name.upper()}")
+            patcher = mock.patch.object(AuthorViewSet, name, setting)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_token(self):
+        """Should authenticate requests with a token in one query"""
+        # preconditions
+        url = f"/api/v1/authors/{self.author_1.id}"
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token_1.key}")
+        self.client.get(url)
+
+        # the author is cached, only the token's lookup is left
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["name"], "Jorge Luis Borges")
+
+    def test_session(self):
+        """Should not authenticate requests with a session"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        response = self.client.get("/api/v1/authors")
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response["WWW-Authenticate"], "Token")
+
+    def test_browsable_api(self):
+        """Should not render the browsable API"""
+        # preconditions
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token_1.key}")
+
+        response = self.client.get("/api/v1/authors", HTTP_ACCEPT="text/html")
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+
+
+class PreloadTestCase(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        # back to the state of a worker that just booted
+        clear_url_caches()
+        for fast_serializer_class in FAST_SERIALIZERS.values():
+            if "_fields_table" in fast_serializer_class.__dict__:
+                del fast_serializer_class._fields_table
+
+    @override_settings(PRELOAD_AT_BOOT=True)
+    def test_preload(self):
+        """Should build the URL patterns and serializers at boot"""
+        startup.preload()
+
+        # postconditions
+        self.assertTrue(get_resolver()._populated)
+        for fast_serializer_class in FAST_SERIALIZERS.values():
+            self.assertIn("_fields_table", fast_serializer_class.__dict__)
+
+    @override_settings(PRELOAD_AT_BOOT=False)
+    def test_preload_disabled(self):
+        """Should leave everything to the first requests when disabled in settings"""
+        startup.preload()
+
+        # postconditions
+        self.assertFalse(get_resolver()._populated)
+        for fast_serializer_class in FAST_SERIALIZERS.values():
+            self.assertNotIn("_fields_table", fast_serializer_class.__dict__)
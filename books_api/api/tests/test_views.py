@@ -1,10 +1,21 @@
+import json
 import uuid
+from unittest import skipUnless
 from freezegun import freeze_time
+from asgiref.sync import async_to_sync
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from books.models import Author
+from api import cache as api_cache
+from api.renderers import msgpack
+from books import autocomplete
+from books.models import Author, Book
 from books.tests.fixtures import AuthorFactory, CollaboratorFactory, BookFactory
 
 
@@ -12,6 +23,7 @@ from books.tests.fixtures import AuthorFactory, CollaboratorFactory, BookFactory
 class AuthorTestCase(APITestCase):
     def setUp(self):
         super().setUp()
+        cache.clear()
         self.user_1 = User.objects.create(username="user_1", is_staff=False)
         self.user_2 = User.objects.create(username="user_2", is_staff=True)
 
@@ -90,6 +102,406 @@ class AuthorTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.json(), expected)
 
+    @skipUnless(msgpack, "requires msgpack")
+    def test_authors_list_msgpack(self):
+        """Should return the list of authors as MessagePack when accepted"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        expected = self.client.get("/api/v1/authors").json()
+
+        for _ in range(2):  # rendered from the cached payload the second time
+            response = self.client.get(
+                "/api/v1/authors", HTTP_ACCEPT="application/msgpack"
+            )
+
+            # postconditions
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response["Content-Type"], "application/msgpack")
+            self.assertEqual(response["Vary"], "Accept, Cookie")
+            self.assertEqual(msgpack.unpackb(response.content), expected)
+            self.assertLess(len(response.content), len(json.dumps(expected)))
+
+    def test_authors_list_num_queries(self):
+        """Should fetch the books of the whole page in a single query regardless of page size"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        with CaptureQueriesContext(connection) as small_page:
+            response = self.client.get("/api/v1/authors")
+        self.assertEqual(len(response.json()["results"]), 3)
+
+        for author in AuthorFactory.create_batch(7):
+            BookFactory.create_batch(3, author=author)
+
+        with CaptureQueriesContext(connection) as full_page:
+            response = self.client.get("/api/v1/authors")
+        self.assertEqual(len(response.json()["results"]), 10)
+
+        # postconditions
+        self.assertEqual(len(small_page), len(full_page))
+        # one aggregate for the page's ETag and one to prefetch the books
+        book_queries = [q for q in full_page if 'FROM "books_book"' in q["sql"]]
+        self.assertEqual(len(book_queries), 2)
+
+    def test_authors_list_fields(self):
+        """Should only select and return the requested fields, without books"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/authors?fields=name,id")
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {"id": str(author.id), "name": author.name}
+                for author in (self.author_3, self.author_1, self.author_2)
+            ],
+        )
+        author_queries = [
+            q["sql"]
+            for q in queries
+            if q["sql"].startswith('SELECT "books_author"') and "ORDER BY" in q["sql"]
+        ]
+        self.assertEqual(len(author_queries), 1)
+        self.assertNotIn("biography", author_queries[0])
+        # only the aggregate for the page's ETag, books aren't fetched
+        book_queries = [q for q in queries if 'FROM "books_book"' in q["sql"]]
+        self.assertEqual(len(book_queries), 1)
+
+    def test_authors_list_fields_expand(self):
+        """Should fetch and return the books of a restricted payload when expanded"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/authors?fields=id&expand=books")
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()["results"]
+        self.assertEqual([set(result) for result in results], [{"id", "books"}] * 3)
+        self.assertEqual(
+            [book["id"] for book in results[1]["books"]],
+            [str(self.book_1.id), str(self.book_2.id)],
+        )
+        book_queries = [q for q in queries if 'FROM "books_book"' in q["sql"]]
+        self.assertEqual(len(book_queries), 2)
+
+    def test_authors_list_invalid_fields(self):
+        """Should return 400 when unknown fields are requested"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        response = self.client.get("/api/v1/authors?fields=id,age&expand=name")
+
+        # postconditions
+        expected = {
+            "fields": ["Unknown fields: age."],
+            "expand": ["Unknown fields: name."],
+        }
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), expected)
+
+    def test_authors_list_cached(self):
+        """Should serve cached list pages until any author or book is changed"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        expected = self.client.get("/api/v1/authors").json()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/authors")
+        self.assertEqual(response.json(), expected)
+        self.assertFalse([q for q in queries if "books_" in q["sql"]])
+
+        BookFactory(author=self.author_3, name="Book 4")
+        response = self.client.get("/api/v1/authors")
+
+        # postconditions
+        self.assertEqual(response.json()["results"][0]["books"][0]["name"], "Book 4")
+
+    def test_authors_list_conditional(self):
+        """Should return 304 when the authors of the page were not modified"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        etag = self.client.get("/api/v1/authors")["ETag"]
+
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/authors", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertFalse(
+            [q for q in queries if "ORDER BY" in q["sql"] and "books_book" in q["sql"]]
+        )
+
+        AuthorFactory(name="Another author")
+        response = self.client.get("/api/v1/authors", HTTP_IF_NONE_MATCH=etag)
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["count"], 4)
+
+    def test_authors_list_cursor_pagination(self):
+        """Should walk the authors list forwards and backwards using cursors"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        for i in range(20):
+            AuthorFactory(name=f"Author {i:02d}")
+        expected = list(
+            Author.objects.order_by("name", "id").values_list("name", flat=True)
+        )
+        self.assertEqual(len(expected), 23)
+
+        names, pages = [], []
+        url = "/api/v1/authors?pagination=cursor"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.json())
+            pages.append(response.json())
+            names += [author["name"] for author in response.json()["results"]]
+            url = response.json()["next"]
+
+        # postconditions
+        self.assertEqual(names, expected)
+        self.assertEqual([len(page["results"]) for page in pages], [10, 10, 3])
+        self.assertIsNone(pages[0]["previous"])
+
+        response = self.client.get(pages[2]["previous"])
+        self.assertEqual(response.json()["results"], pages[1]["results"])
+        self.assertEqual(response.json()["next"], pages[1]["next"])
+
+        response = self.client.get(response.json()["previous"])
+        self.assertEqual(response.json()["results"], pages[0]["results"])
+        self.assertIsNone(response.json()["previous"])
+
+    @override_settings(AUTHORS_PAGINATION="cursor")
+    def test_authors_list_cursor_pagination_setting(self):
+        """Should use cursor pagination by default when enabled in settings"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        response = self.client.get("/api/v1/authors")
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.json().keys()), ["next", "previous", "results"])
+        self.assertEqual(len(response.json()["results"]), 3)
+
+    def test_authors_list_invalid_cursor(self):
+        """Should return 404 when the given cursor is not valid"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        response = self.client.get("/api/v1/authors?cursor=invalid")
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json(), {"detail": "Invalid cursor"})
+
+    def test_authors_list_ordering(self):
+        """Should order the authors by the requested field, then by id"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        response = self.client.get("/api/v1/authors?ordering=-book_count")
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [author["id"] for author in response.json()["results"]],
+            [str(self.author_1.id), str(self.author_2.id), str(self.author_3.id)],
+        )
+
+    def test_authors_list_ordering_nulls_last(self):
+        """Should list the authors without books last, in both directions"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        Book.objects.filter(pk=self.book_1.pk).update(publish_date="1990-01-01")
+        Book.objects.filter(pk=self.book_2.pk).update(publish_date="1980-01-01")
+        Book.objects.filter(pk=self.book_3.pk).update(publish_date="1985-01-01")
+        Author.objects.recompute_stats()
+
+        ascending = self.client.get("/api/v1/authors?ordering=latest_publish_date")
+        descending = self.client.get("/api/v1/authors?ordering=-latest_publish_date")
+
+        # postconditions
+        self.assertEqual(
+            [author["id"] for author in ascending.json()["results"]],
+            [str(self.author_2.id), str(self.author_1.id), str(self.author_3.id)],
+        )
+        self.assertEqual(
+            [author["id"] for author in descending.json()["results"]],
+            [str(self.author_1.id), str(self.author_2.id), str(self.author_3.id)],
+        )
+
+    def test_authors_list_ordering_cursor_pagination(self):
+        """Should walk an ordered authors list forwards and backwards"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        for i in range(20):
+            author = AuthorFactory(name=f"Author {i:02d}")
+            if i % 3:
+                BookFactory(author=author, publish_date=f"19{i:02d}-01-01")
+        expected = [
+            str(pk)
+            for pk in Author.objects.order_by(
+                F("latest_publish_date").desc(nulls_last=True), "-id"
+            ).values_list("id", flat=True)
+        ]
+
+        ids, pages = [], []
+        url = "/api/v1/authors?pagination=cursor&ordering=-latest_publish_date"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(response.json())
+            ids += [author["id"] for author in response.json()["results"]]
+            url = response.json()["next"]
+
+        # postconditions
+        self.assertEqual(ids, expected)
+        self.assertEqual([len(page["results"]) for page in pages], [10, 10, 3])
+
+        response = self.client.get(pages[2]["previous"])
+        self.assertEqual(response.json()["results"], pages[1]["results"])
+
+        response = self.client.get(response.json()["previous"])
+        self.assertEqual(response.json()["results"], pages[0]["results"])
+        self.assertIsNone(response.json()["previous"])
+
+    def test_authors_list_invalid_ordering(self):
+        """Should return 400 when ordering by an unsupported field"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        response = self.client.get("/api/v1/authors?ordering=biography")
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("ordering", response.json())
+
+    def test_authors_list_filters(self):
+        """Should only return the authors matching every filter given"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        Author.objects.filter(pk=self.author_1.pk).update(birthday="1965-07-31")
+        Author.objects.filter(pk=self.author_2.pk).update(birthday="1899-08-24")
+        with freeze_time("2023-02-01T10:00:00"):
+            self.author_3.birthday = "1948-09-20"
+            self.author_3.save()
+
+        def get_ids(query):
+            response = self.client.get(f"/api/v1/authors?{query}")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return [author["id"] for author in response.json()["results"]]
+
+        # postconditions
+        self.assertEqual(
+            get_ids("birthday_after=1900-01-01&birthday_before=1965-07-31"),
+            [str(self.author_3.id), str(self.author_1.id)],
+        )
+        self.assertEqual(
+            get_ids("modified_after=2023-01-25T00:00:00Z"), [str(self.author_3.id)]
+        )
+        self.assertEqual(get_ids("created_before=2023-01-01T00:00:00Z"), [])
+        self.assertEqual(
+            get_ids("has_books=true"), [str(self.author_1.id), str(self.author_2.id)]
+        )
+        self.assertEqual(get_ids("has_books=false"), [str(self.author_3.id)])
+        self.assertEqual(
+            get_ids("name_prefix=J"), [str(self.author_1.id), str(self.author_2.id)]
+        )
+        self.assertEqual(
+            get_ids("name_prefix=Jo&has_books=true"), [str(self.author_2.id)]
+        )
+        self.assertEqual(get_ids("name_prefix=jo"), [])
+        # the next character would be a surrogate
+        self.assertEqual(get_ids("name_prefix=J%ED%9F%BF"), [])
+
+    def test_authors_list_filters_ordering(self):
+        """Should order filtered authors and paginate them by cursor"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        for i in range(15):
+            author = AuthorFactory(name=f"Author {i:02d}", birthday=f"19{i:02d}-01-01")
+            BookFactory(author=author)
+
+        ids, url = [], (
+            "/api/v1/authors?pagination=cursor&has_books=true&name_prefix=Author"
+            "&ordering=-birthday"
+        )
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [author["id"] for author in response.json()["results"]]
+            url = response.json()["next"]
+
+        # postconditions
+        self.assertEqual(
+            ids,
+            [
+                str(pk)
+                for pk in Author.objects.filter(name__startswith="Author")
+                .order_by("-birthday", "-id")
+                .values_list("id", flat=True)
+            ],
+        )
+
+    @skipUnless(connection.vendor == "sqlite", "query plans are SQLite's")
+    def test_authors_list_filters_use_indexes(self):
+        """Should search an index of the authors for every filter, not scan them"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        filters = {
+            "birthday_after=1900-01-01": "author_birthday_idx",
+            "birthday_before=1900-01-01": "author_birthday_idx",
+            "created_after=2023-01-01T00:00:00Z": "author_created_idx",
+            "created_before=2023-01-01T00:00:00Z": "author_created_idx",
+            "modified_after=2023-01-01T00:00:00Z": "author_modified_idx",
+            "modified_before=2023-01-01T00:00:00Z": "author_modified_idx",
+            "has_books=true": "author_book_count_idx",
+            "has_books=false": "author_book_count_idx",
+            "name_prefix=Jo": "author_name_idx",
+        }
+
+        for query, index in filters.items():
+            with self.subTest(query), CaptureQueriesContext(connection) as queries:
+                response = self.client.get(f"/api/v1/authors?{query}")
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            # postconditions
+            # the page's count and, unless it's empty, the page itself
+            author_queries = [
+                q["sql"] for q in queries if 'FROM "books_author"' in q["sql"]
+            ]
+            self.assertTrue(author_queries)
+            for sql in author_queries:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                    plan = " ".join(row[-1] for row in cursor.fetchall())
+                self.assertRegex(
+                    plan, f"SEARCH books_author USING (COVERING )?INDEX {index} "
+                )
+                self.assertNotIn("SCAN books_author", plan)
+
+    def test_authors_list_invalid_filters(self):
+        """Should return 400 when filters are not valid"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        response = self.client.get(
+            "/api/v1/authors?birthday_after=yesterday&has_books=maybe"
+        )
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.json()), {"birthday_after", "has_books"})
+
     def test_authors_list_not_authenticated(self):
         """Should return 403 when listing authors as anonymous user"""
         # preconditions
@@ -135,6 +547,140 @@ class AuthorTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.json(), expected)
 
+    def test_authors_retrieve_num_queries(self):
+        """Should fetch the author and its books with one query each"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/api/v1/authors/{self.author_1.id}")
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["books"]), 2)
+        book_queries = [q for q in queries if 'FROM "books_book"' in q["sql"]]
+        self.assertEqual(len(book_queries), 1)
+
+    def test_authors_retrieve_fields(self):
+        """Should only select and return the requested fields, without books"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        url = f"/api/v1/authors/{self.author_1.id}"
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"{url}?fields=name,birthday")
+
+        # postconditions
+        expected = {
+            "name": self.author_1.name,
+            "birthday": self.author_1.birthday.isoformat(),
+        }
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), expected)
+        self.assertFalse([q for q in queries if 'FROM "books_book"' in q["sql"]])
+        author_queries = [
+            q["sql"]
+            for q in queries
+            if q["sql"].startswith('SELECT "books_author"') and "LIMIT 21" in q["sql"]
+        ]
+        self.assertEqual(len(author_queries), 1)
+        self.assertNotIn("biography", author_queries[0])
+
+        # variants are cached separately
+        response = self.client.get(f"{url}?fields=id&expand=books")
+        self.assertEqual(set(response.json()), {"id", "books"})
+        self.assertEqual(len(response.json()["books"]), 2)
+        response = self.client.get(url)
+        self.assertEqual(len(response.json()), 6)
+
+    def test_authors_retrieve_cached(self):
+        """Should serve a cached author until the author or its books are changed"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        url = f"/api/v1/authors/{self.author_1.id}"
+        expected = self.client.get(url).json()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.json(), expected)
+        self.assertFalse([q for q in queries if "books_" in q["sql"]])
+
+        self.book_1.name = "Updated book"
+        self.book_1.save()
+        response = self.client.get(url)
+        self.assertEqual(response.json()["books"][0]["name"], "Book 2")
+        self.assertEqual(response.json()["books"][1]["name"], "Updated book")
+
+        self.book_2.collaborators.add(self.collaborator_1)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        self.assertTrue([q for q in queries if "books_" in q["sql"]])
+
+        self.book_2.delete()
+        response = self.client.get(url)
+
+        # postconditions
+        self.assertEqual(len(response.json()["books"]), 1)
+
+    def test_authors_retrieve_cached_before_write(self):
+        """Should not serve a payload cached by a read started before a write"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        url = f"/api/v1/authors/{self.author_1.id}"
+        stale = self.client.get(url).json()
+        cache.clear()
+
+        # a read fetches the author, then a write commits before it caches it
+        request = RequestFactory().get(url)
+        cache_key = api_cache.author_cache_key(self.author_1.id)
+        self.author_1.name = "Updated author"
+        self.author_1.save()
+        api_cache.set_cached_author(
+            cache_key, request, {"data": stale, "etag": '"stale"'}
+        )
+
+        response = self.client.get(url)
+
+        # postconditions
+        self.assertEqual(response.json()["name"], "Updated author")
+
+    def test_authors_retrieve_conditional(self):
+        """Should return 304 when the author and its books were not modified"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        url = f"/api/v1/authors/{self.author_1.id}"
+        response = self.client.get(url)
+        etag, last_modified = response["ETag"], response["Last-Modified"]
+        self.assertEqual(last_modified, "Fri, 20 Jan 2023 10:00:00 GMT")
+
+        # served from cache
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+        # served from the database, without serializing
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        book_queries = [q for q in queries if 'FROM "books_book"' in q["sql"]]
+        self.assertEqual(book_queries, [])
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with freeze_time("2023-01-21T10:00:00"):
+            self.book_2.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Last-Modified"], "Sat, 21 Jan 2023 10:00:00 GMT")
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["books"]), 1)
+
     def test_authors_retrieve_not_authenticated(self):
         """Should return 403 when retrieving authors as anonymous user"""
         # preconditions
@@ -161,6 +707,95 @@ class AuthorTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         self.assertEqual(response.json(), expected)
 
+    def test_authors_async_list(self):
+        """Should return the same authors list from the async view"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        for i in range(10):
+            AuthorFactory(name=f"Author {i:02d}")
+        expected = self.client.get("/api/v1/authors?page=2").json()
+        cache.clear()
+
+        response = self.client.get("/api/v1/async/authors?page=2")
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 13)
+        self.assertEqual(response.json()["results"], expected["results"])
+        self.assertEqual(
+            response.json()["previous"], "http://testserver/api/v1/async/authors"
+        )
+        self.assertEqual(
+            self.client.get("/api/v1/async/authors?pagination=cursor").json()[
+                "results"
+            ],
+            self.client.get("/api/v1/authors?pagination=cursor").json()["results"],
+        )
+
+        response = self.client.get("/api/v1/async/authors?page=3")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_authors_async_retrieve(self):
+        """Should return the same author from the async view"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        url = f"/api/v1/async/authors/{self.author_1.id}"
+        expected = self.client.get(f"/api/v1/authors/{self.author_1.id}").json()
+        cache.clear()
+
+        response = self.client.get(url)
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), expected)
+
+        cache.clear()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        invalid_id = uuid.uuid4()
+        response = self.client.get(f"/api/v1/async/authors/{invalid_id}")
+        expected = {"detail": f"Author with id '{invalid_id}' was not found."}
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json(), expected)
+
+    def test_authors_async_fields(self):
+        """Should restrict the async views' payloads to the requested fields"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        response = self.client.get("/api/v1/async/authors?fields=id,name")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [set(result) for result in response.json()["results"]], [{"id", "name"}] * 3
+        )
+
+        response = self.client.get(
+            f"/api/v1/async/authors/{self.author_1.id}?fields=id&expand=books"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.json()), {"id", "books"})
+
+        response = self.client.get("/api/v1/async/authors?fields=age")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {"fields": ["Unknown fields: age."]})
+
+    def test_authors_async_not_authenticated(self):
+        """Should return 403 when using the async views as anonymous user"""
+        # preconditions
+        self.client.logout()
+
+        expected = {"detail": "Authentication credentials were not provided."}
+        for url in (
+            "/api/v1/async/authors",
+            f"/api/v1/async/authors/{self.author_1.id}",
+        ):
+            response = self.client.get(url)
+
+            # postconditions
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+            self.assertEqual(response.json(), expected)
+
     def test_authors_create(self):
         """Should create a new author when provided data is valid"""
         # preconditions
@@ -189,58 +824,380 @@ class AuthorTestCase(APITestCase):
             new_author.created.isoformat().startswith("2023-01-20T10:00:00")
         )
 
-    def test_authors_create_not_authenticated(self):
-        """Should return 403 when creating authors as anonymous user"""
+    @skipUnless(msgpack, "requires msgpack")
+    def test_authors_create_msgpack(self):
+        """Should create a new author from a MessagePack payload"""
+        # preconditions
+        self.client.force_login(self.user_2)
+        self.assertFalse(Author.objects.filter(name="New author").exists())
+
+        payload = {
+            "name": "New author",
+            "biography": "Some bio here",
+            "birthday": "1950-12-25",
+        }
+        response = self.client.post(
+            "/api/v1/authors",
+            data=msgpack.packb(payload),
+            content_type="application/msgpack",
+            HTTP_ACCEPT="application/msgpack",
+        )
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        new_author = Author.objects.get(name="New author")
+        self.assertEqual(
+            msgpack.unpackb(response.content),
+            {
+                "id": str(new_author.id),
+                "name": "New author",
+                "biography": "Some bio here",
+                "birthday": "1950-12-25",
+                "created": "2023-01-20T10:00:00Z",
+                "books": [],
+            },
+        )
+
+    def test_authors_create_invalid_msgpack(self):
+        """Should return 400 when the MessagePack payload can't be decoded"""
+        # preconditions
+        self.client.force_login(self.user_2)
+
+        response = self.client.post(
+            "/api/v1/authors", data=b"\x81\xa4name", content_type="application/msgpack"
+        )
+
+        # postconditions
+        if msgpack is None:
+            self.assertEqual(
+                response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+            )
+        else:
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertTrue(
+                response.json()["detail"].startswith("MessagePack parse error")
+            )
+        self.assertEqual(Author.objects.count(), 3)
+
+    def test_authors_create_not_authenticated(self):
+        """Should return 403 when creating authors as anonymous user"""
+        # preconditions
+        self.client.logout()
+
+        payload = {
+            "name": "New author",
+            "biography": "Some bio here",
+            "birthday": "1950-12-25",
+        }
+        response = self.client.post("/api/v1/authors", data=payload)
+
+        # postconditions
+        expected = {"detail": "Authentication credentials were not provided."}
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.json(), expected)
+
+    def test_authors_create_not_staff(self):
+        """Should return 403 while creating author with a non-staff user"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        self.assertEqual(self.user_1.is_staff, False)
+        self.assertEqual(Author.objects.count(), 3)
+
+        payload = {
+            "name": "New author",
+            "biography": "Some bio here",
+            "birthday": "1950-12-25",
+        }
+        response = self.client.post("/api/v1/authors", data=payload)
+
+        # postconditions
+        expected = {"detail": "You do not have permission to perform this action."}
+        self.assertEqual(Author.objects.count(), 3)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_authors_create_missing_data(self):
+        """Should return 400 while creating author with missing required data in given payload"""
+        # preconditions
+        self.client.force_login(self.user_2)
+        self.assertEqual(self.user_2.is_staff, True)
+        self.assertEqual(Author.objects.count(), 3)
+        self.assertFalse(Author.objects.filter(name="New author").exists())
+
+        payload = {}
+        response = self.client.post("/api/v1/authors", data=payload)
+
+        # postconditions
+        self.assertEqual(Author.objects.count(), 3)
+        expected = {"name": ["This field is required."]}
+        self.assertEqual(response.json(), expected)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_authors_bulk(self):
+        """Should create and update authors, books and collaborators from a list"""
+        # preconditions
+        self.client.force_login(self.user_2)
+        self.assertEqual(Author.objects.count(), 3)
+        self.assertEqual(Book.objects.count(), 3)
+
+        payload = [
+            {
+                "name": "New author",
+                "biography": "Some bio here",
+                "birthday": "1950-12-25",
+                "books": [
+                    {
+                        "name": "New book",
+                        "publish_date": "1990-01-01",
+                        "collaborators": [
+                            str(self.collaborator_1.id),
+                            str(self.collaborator_2.id),
+                        ],
+                    },
+                    {"name": "Another book"},
+                ],
+            },
+            {"id": str(self.author_3.id), "name": "Updated name"},
+        ] + [{"name": f"Author {i}", "books": [{"name": "Book"}]} for i in range(20)]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/api/v1/authors/bulk", data=payload, format="json"
+            )
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertLess(len(queries), 15)
+        self.assertEqual(Author.objects.count(), 24)
+        self.assertEqual(Book.objects.count(), 25)
+
+        new_author = Author.objects.get(name="New author")
+        self.assertEqual(response.json()[0]["id"], str(new_author.id))
+        self.assertEqual(new_author.birthday.isoformat(), "1950-12-25")
+        self.assertEqual(
+            sorted(new_author.books.values_list("name", flat=True)),
+            ["Another book", "New book"],
+        )
+        self.assertEqual(
+            set(Book.objects.get(name="New book").collaborators.all()),
+            {self.collaborator_1, self.collaborator_2},
+        )
+
+        self.author_3.refresh_from_db()
+        self.assertEqual(response.json()[1], {"id": str(self.author_3.id), "books": []})
+        self.assertEqual(self.author_3.name, "Updated name")
+        self.assertEqual(self.author_3.biography, "Some biography of the author here")
+
+    def test_authors_bulk_invalid_data(self):
+        """Should write nothing and report errors per item when an item is invalid"""
+        # preconditions
+        self.client.force_login(self.user_2)
+        self.assertEqual(Author.objects.count(), 3)
+        invalid_id = uuid.uuid4()
+
+        payload = [
+            {"name": "New author"},
+            {"biography": "Some bio here"},
+            {"id": str(invalid_id), "name": "Updated name"},
+            {
+                "name": "Another author",
+                "books": [
+                    {"name": "New book"},
+                    {"name": "Another book", "collaborators": [str(invalid_id)]},
+                ],
+            },
+        ]
+        response = self.client.post("/api/v1/authors/bulk", data=payload, format="json")
+
+        # postconditions
+        expected = [
+            {},
+            {"name": ["This field is required."]},
+            {"id": [f"Author with id '{invalid_id}' was not found."]},
+            {
+                "books": [
+                    {},
+                    {
+                        "collaborators": [
+                            f"Collaborator with id '{invalid_id}' was not found."
+                        ]
+                    },
+                ]
+            },
+        ]
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), expected)
+        self.assertEqual(Author.objects.count(), 3)
+
+    def test_authors_bulk_update_books(self):
+        """Should match the books of updated authors by name instead of duplicating them"""
+        # preconditions
+        self.client.force_login(self.user_2)
+        book_1 = BookFactory(author=self.author_3, name="El Aleph")
+        book_1.collaborators.add(self.collaborator_1)
+        books_count = self.author_3.books.count()
+        payload = [
+            {
+                "id": str(self.author_3.id),
+                "name": self.author_3.name,
+                "books": [
+                    {
+                        "name": "El Aleph",
+                        "publish_date": "1949-01-01",
+                        "collaborators": [str(self.collaborator_2.id)],
+                    },
+                    {"name": "Ficciones"},
+                ],
+            }
+        ]
+
+        responses = [
+            self.client.post("/api/v1/authors/bulk", data=payload, format="json")
+            for _ in range(2)
+        ]
+
+        # postconditions
+        self.assertEqual(
+            [response.status_code for response in responses],
+            [status.HTTP_201_CREATED] * 2,
+        )
+        self.assertEqual(responses[0].json(), responses[1].json())
+        self.assertEqual(responses[0].json()[0]["books"][0], str(book_1.id))
+        self.assertEqual(self.author_3.books.count(), books_count + 1)
+        book_1.refresh_from_db()
+        self.assertEqual(book_1.publish_date.isoformat(), "1949-01-01")
+        self.assertEqual(list(book_1.collaborators.all()), [self.collaborator_2])
+
+    def test_authors_bulk_duplicate_ids(self):
+        """Should reject an author given more than once"""
+        # preconditions
+        self.client.force_login(self.user_2)
+        author_id = str(self.author_3.id)
+        payload = [
+            {"id": author_id, "name": "Updated name"},
+            {"id": author_id, "name": "Another name"},
+        ]
+
+        response = self.client.post("/api/v1/authors/bulk", data=payload, format="json")
+
+        # postconditions
+        error = f"Author with id '{author_id}' is given more than once."
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), [{"id": [error]}, {"id": [error]}])
+        self.author_3.refresh_from_db()
+        self.assertNotEqual(self.author_3.name, "Updated name")
+
+    def test_authors_bulk_duplicate_collaborators(self):
+        """Should reject a book linking the same collaborator more than once"""
+        # preconditions
+        self.client.force_login(self.user_2)
+        collaborator_id = str(self.collaborator_1.id)
+        payload = [
+            {
+                "name": "New author",
+                "books": [
+                    {"name": "New book", "collaborators": [collaborator_id] * 2},
+                ],
+            }
+        ]
+
+        response = self.client.post("/api/v1/authors/bulk", data=payload, format="json")
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json(),
+            [
+                {
+                    "books": [
+                        {
+                            "collaborators": [
+                                f"Collaborator with id '{collaborator_id}' is given "
+                                "more than once."
+                            ]
+                        }
+                    ]
+                }
+            ],
+        )
+        self.assertFalse(Author.objects.filter(name="New author").exists())
+
+    def test_authors_bulk_not_staff(self):
+        """Should return 403 while bulk creating authors with a non-staff user"""
         # preconditions
-        self.client.logout()
+        self.client.force_login(self.user_1)
+        self.assertEqual(self.user_1.is_staff, False)
 
-        payload = {
-            "name": "New author",
-            "biography": "Some bio here",
-            "birthday": "1950-12-25",
-        }
-        response = self.client.post("/api/v1/authors", data=payload)
+        response = self.client.post(
+            "/api/v1/authors/bulk", data=[{"name": "New"}], format="json"
+        )
 
         # postconditions
-        expected = {"detail": "Authentication credentials were not provided."}
+        self.assertEqual(Author.objects.count(), 3)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-        self.assertEqual(response.json(), expected)
 
-    def test_authors_create_not_staff(self):
-        """Should return 403 while creating author with a non-staff user"""
+    def test_authors_export(self):
+        """Should stream every author with its books as newline-delimited JSON"""
         # preconditions
-        self.client.force_login(self.user_1)
-        self.assertEqual(self.user_1.is_staff, False)
-        self.assertEqual(Author.objects.count(), 3)
+        self.client.force_login(self.user_2)
+        expected = {
+            author["id"]: author
+            for author in self.client.get("/api/v1/authors").json()["results"]
+        }
 
-        payload = {
-            "name": "New author",
-            "biography": "Some bio here",
-            "birthday": "1950-12-25",
+        response = self.client.get("/api/v1/authors/export")
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        exported = [json.loads(line) for line in lines]
+        self.assertEqual({author["id"]: author for author in exported}, expected)
+
+    def test_authors_export_asgi(self):
+        """Should stream the export chunk by chunk under ASGI"""
+        # preconditions
+        self.client.force_login(self.user_2)
+        self.async_client.force_login(self.user_2)
+        expected = {
+            author["id"]: author
+            for author in self.client.get("/api/v1/authors").json()["results"]
         }
-        response = self.client.post("/api/v1/authors", data=payload)
+
+        async def export():
+            response = await self.async_client.get("/api/v1/authors/export")
+            return response, [chunk async for chunk in response.streaming_content]
+
+        response, chunks = async_to_sync(export)()
 
         # postconditions
-        expected = {"detail": "You do not have permission to perform this action."}
-        self.assertEqual(Author.objects.count(), 3)
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        lines = b"".join(chunks).decode().splitlines()
+        exported = [json.loads(line) for line in lines]
+        self.assertEqual({author["id"]: author for author in exported}, expected)
 
-    def test_authors_create_missing_data(self):
-        """Should return 400 while creating author with missing required data in given payload"""
+    def test_authors_export_modified_since(self):
+        """Should only export authors modified, or with books modified, since given date"""
         # preconditions
         self.client.force_login(self.user_2)
-        self.assertEqual(self.user_2.is_staff, True)
-        self.assertEqual(Author.objects.count(), 3)
-        self.assertFalse(Author.objects.filter(name="New author").exists())
+        with freeze_time("2023-02-01T10:00:00"):
+            BookFactory(author=self.author_2)
+            self.author_3.save()
 
-        payload = {}
-        response = self.client.post("/api/v1/authors", data=payload)
+        response = self.client.get(
+            "/api/v1/authors/export", {"modified_since": "2023-01-25T00:00:00Z"}
+        )
 
         # postconditions
-        self.assertEqual(Author.objects.count(), 3)
-        expected = {"name": ["This field is required."]}
-        self.assertEqual(response.json(), expected)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            {json.loads(line)["id"] for line in lines},
+            {str(self.author_2.id), str(self.author_3.id)},
+        )
+
+        response = self.client.get("/api/v1/authors/export?modified_since=invalid")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("modified_since", response.json())
 
     def test_authors_update(self):
         """Should update author with given id when provided data is valid"""
@@ -463,3 +1420,372 @@ class AuthorTestCase(APITestCase):
         expected = {"detail": f"Author with id '{invalid_id}' was not found."}
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         self.assertEqual(response.json(), expected)
+
+
+@freeze_time("2023-01-20T10:00:00")
+class BookTestCase(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user_1 = User.objects.create(username="user_1", is_staff=False)
+
+        self.author_1 = AuthorFactory(name="J. K. Rowling")
+        self.author_2 = AuthorFactory(name="Jorge Luis Borges")
+
+        self.collaborator_1 = CollaboratorFactory(name="Collaborator A")
+        self.collaborator_2 = CollaboratorFactory(name="Collaborator B")
+
+        self.book_1 = BookFactory(author=self.author_1, name="Book 1")
+        self.book_2 = BookFactory(author=self.author_1, name="Book 2")
+        self.book_3 = BookFactory(author=self.author_2, name="Book 3")
+        self.book_1.collaborators.add(self.collaborator_2, self.collaborator_1)
+
+    def book_payload(self, book, collaborators=()):
+        return {
+            "id": str(book.id),
+            "name": book.name,
+            "created": "2023-01-20T10:00:00Z",
+            "publish_date": book.publish_date.isoformat(),
+            "author": {"id": str(book.author.id), "name": book.author.name},
+            "collaborators": [
+                {"id": str(collaborator.id), "name": collaborator.name}
+                for collaborator in collaborators
+            ],
+        }
+
+    def test_books_list(self):
+        """Should return the books of given author paginated and ordered by name"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        expected = {
+            "count": 2,
+            "next": None,
+            "previous": None,
+            "results": [
+                self.book_payload(
+                    self.book_1, [self.collaborator_1, self.collaborator_2]
+                ),
+                self.book_payload(self.book_2),
+            ],
+        }
+        response = self.client.get(f"/api/v1/authors/{self.author_1.id}/books")
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), expected)
+
+    def test_books_list_num_queries(self):
+        """Should fetch a page of books with a constant number of queries"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        url = f"/api/v1/authors/{self.author_1.id}/books"
+
+        with CaptureQueriesContext(connection) as small_page:
+            response = self.client.get(url)
+        self.assertEqual(len(response.json()["results"]), 2)
+
+        for book in BookFactory.create_batch(8, author=self.author_1):
+            book.collaborators.add(self.collaborator_1, self.collaborator_2)
+
+        with CaptureQueriesContext(connection) as full_page:
+            response = self.client.get(url)
+        self.assertEqual(len(response.json()["results"]), 10)
+
+        # postconditions
+        self.assertEqual(len(small_page), len(full_page))
+        author_queries = [q for q in full_page if 'FROM "books_author"' in q["sql"]]
+        self.assertEqual(len(author_queries), 1)
+        collaborator_queries = [
+            q for q in full_page if 'FROM "books_collaborator"' in q["sql"]
+        ]
+        self.assertEqual(len(collaborator_queries), 1)
+
+    def test_books_list_author_not_found(self):
+        """Should return 404 when author with given id is not found"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        invalid_id = uuid.uuid4()
+
+        response = self.client.get(f"/api/v1/authors/{invalid_id}/books")
+
+        # postconditions
+        expected = {"detail": f"Author with id '{invalid_id}' was not found."}
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json(), expected)
+
+    def test_books_list_not_authenticated(self):
+        """Should return 403 when user is not authenticated"""
+        response = self.client.get(f"/api/v1/authors/{self.author_1.id}/books")
+
+        # postconditions
+        expected = {"detail": "Authentication credentials were not provided."}
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.json(), expected)
+
+    def test_books_retrieve(self):
+        """Should return the book with given id, with its author and collaborators"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                f"/api/v1/authors/{self.author_1.id}/books/{self.book_1.id}"
+            )
+
+        # postconditions
+        expected = self.book_payload(
+            self.book_1, [self.collaborator_1, self.collaborator_2]
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), expected)
+        book_queries = [q for q in queries if 'FROM "books_book"' in q["sql"]]
+        self.assertEqual(len(book_queries), 1)
+
+    def test_books_retrieve_not_found(self):
+        """Should return 404 when the book doesn't exist or belongs to another author"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        for book_id in (uuid.uuid4(), self.book_3.id, "invalid"):
+            response = self.client.get(
+                f"/api/v1/authors/{self.author_1.id}/books/{book_id}"
+            )
+
+            # postconditions
+            expected = {"detail": f"Book with id '{book_id}' was not found."}
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(response.json(), expected)
+
+    def test_collaborators_list(self):
+        """Should return the collaborators of given book ordered by name"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        response = self.client.get(
+            f"/api/v1/authors/{self.author_1.id}/books/{self.book_1.id}/collaborators"
+        )
+
+        # postconditions
+        expected = [
+            {"id": str(self.collaborator_1.id), "name": self.collaborator_1.name},
+            {"id": str(self.collaborator_2.id), "name": self.collaborator_2.name},
+        ]
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), expected)
+
+    def test_collaborators_list_book_not_found(self):
+        """Should return 404 when the book doesn't belong to given author"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        response = self.client.get(
+            f"/api/v1/authors/{self.author_1.id}/books/{self.book_3.id}/collaborators"
+        )
+
+        # postconditions
+        expected = {"detail": f"Book with id '{self.book_3.id}' was not found."}
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json(), expected)
+
+    def test_collaborators_retrieve(self):
+        """Should return the collaborator with given id"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        url = f"/api/v1/authors/{self.author_1.id}/books/{self.book_1.id}"
+
+        response = self.client.get(f"{url}/collaborators/{self.collaborator_1.id}")
+
+        # postconditions
+        expected = {"id": str(self.collaborator_1.id), "name": "Collaborator A"}
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), expected)
+
+    def test_collaborators_retrieve_not_found(self):
+        """Should return 404 when the collaborator didn't collaborate on given book"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        url = f"/api/v1/authors/{self.author_1.id}/books/{self.book_2.id}"
+
+        response = self.client.get(f"{url}/collaborators/{self.collaborator_1.id}")
+
+        # postconditions
+        expected = {
+            "detail": f"Collaborator with id '{self.collaborator_1.id}' was not found."
+        }
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json(), expected)
+
+
+class SearchTestCase(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user_1 = User.objects.create(username="user_1", is_staff=False)
+
+        self.author_1 = AuthorFactory(name="Jorge Luis Borges")
+        self.author_2 = AuthorFactory(name="J. K. Rowling")
+        self.book_1 = BookFactory(author=self.author_1, name="Borges y yo")
+        self.book_2 = BookFactory(author=self.author_2, name="Harry Potter")
+
+    def test_search(self):
+        """Should return the authors, books and collaborators matching the query"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        response = self.client.get("/api/v1/search", {"q": "Borges"})
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data["next"], None)
+        self.assertEqual(data["previous"], None)
+        self.assertEqual(
+            sorted((result["type"], result["id"]) for result in data["results"]),
+            [("author", str(self.author_1.id)), ("book", str(self.book_1.id))],
+        )
+        self.assertEqual(
+            {result["name"] for result in data["results"]},
+            {"Jorge Luis Borges", "Borges y yo"},
+        )
+
+    def test_search_types(self):
+        """Should only return results of the given types"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        response = self.client.get("/api/v1/search?q=borges&type=book,collaborator")
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()["results"]
+        self.assertEqual([result["id"] for result in results], [str(self.book_1.id)])
+
+    def test_search_pagination(self):
+        """Should paginate results with limit and offset"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        response = self.client.get("/api/v1/search", {"q": "borges", "limit": 1})
+
+        # postconditions
+        data = response.json()
+        self.assertEqual(len(data["results"]), 1)
+        self.assertEqual(
+            data["next"], "http://testserver/api/v1/search?limit=1&offset=1&q=borges"
+        )
+        self.assertEqual(data["previous"], None)
+
+        response = self.client.get(data["next"])
+        data = response.json()
+        self.assertEqual(len(data["results"]), 1)
+        self.assertEqual(data["next"], None)
+        self.assertEqual(
+            data["previous"], "http://testserver/api/v1/search?limit=1&q=borges"
+        )
+
+    def test_search_invalid_params(self):
+        """Should return 400 when the query is missing or params are invalid"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        response = self.client.get("/api/v1/search", {"type": "publisher"})
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.json()), {"q", "type"})
+
+    def test_search_not_authenticated(self):
+        """Should return 403 when user is not authenticated"""
+        response = self.client.get("/api/v1/search", {"q": "borges"})
+
+        # postconditions
+        expected = {"detail": "Authentication credentials were not provided."}
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.json(), expected)
+
+
+class AutocompleteTestCase(APITestCase):
+    def setUp(self):
+        super().setUp()
+        autocomplete.index.invalidate()
+        self.addCleanup(autocomplete.index.invalidate)
+        self.user_1 = User.objects.create(username="user_1", is_staff=False)
+
+        self.author_1 = AuthorFactory(name="Jorge Luis Borges")
+        self.book_1 = BookFactory(author=self.author_1, name="Borges y yo")
+        self.book_2 = BookFactory(author=self.author_1, name="El Aleph")
+
+    def test_autocomplete(self):
+        """Should return the authors and books with a name word starting with q"""
+        # preconditions
+        self.client.force_login(self.user_1)
+        # build the index
+        self.client.get("/api/v1/autocomplete", {"q": "borges"})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/autocomplete", {"q": "borg"})
+
+        # postconditions
+        expected = {
+            "results": [
+                {
+                    "type": "author",
+                    "id": str(self.author_1.id),
+                    "name": "Jorge Luis Borges",
+                },
+                {"type": "book", "id": str(self.book_1.id), "name": "Borges y yo"},
+            ]
+        }
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), expected)
+        # only the session and user lookups
+        self.assertFalse(
+            [q for q in queries if 'FROM "books_' in q["sql"]], "queried the catalog"
+        )
+
+    def test_autocomplete_types(self):
+        """Should only return results of the given types, up to the limit"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        response = self.client.get(
+            "/api/v1/autocomplete", {"q": "b", "type": "author", "limit": 1}
+        )
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result["id"] for result in response.json()["results"]],
+            [str(self.author_1.id)],
+        )
+
+    def test_autocomplete_invalid_params(self):
+        """Should return 400 when the prefix is missing or params are invalid"""
+        # preconditions
+        self.client.force_login(self.user_1)
+
+        response = self.client.get(
+            "/api/v1/autocomplete", {"type": "collaborator", "limit": 500}
+        )
+
+        # postconditions
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.json()), {"q", "type", "limit"})
+
+    def test_autocomplete_not_authenticated(self):
+        """Should return 403 when user is not authenticated"""
+        response = self.client.get("/api/v1/autocomplete", {"q": "borg"})
+
+        # postconditions
+        expected = {"detail": "Authentication credentials were not provided."}
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.json(), expected)
+
+
+@override_settings(API_SERIALIZATION_ENGINE="fast")
+class FastSerializersAuthorTestCase(AuthorTestCase):
+    """Run the authors tests using the fast serialization engine"""
+
+
+@override_settings(API_SERIALIZATION_ENGINE="fast")
+class FastSerializersBookTestCase(BookTestCase):
+    """Run the books tests using the fast serialization engine"""
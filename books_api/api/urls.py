@@ -1,13 +1,35 @@
 from django.urls import path, include
 from rest_framework_nested import routers
 
-from api import views
+from api import async_views, views
 
 
 router = routers.DefaultRouter(trailing_slash=False)
 router.register(r"authors", views.AuthorViewSet, basename="authors")
+router.register(r"search", views.SearchViewSet, basename="search")
+router.register(r"autocomplete", views.AutocompleteViewSet, basename="autocomplete")
+
+authors_router = routers.NestedDefaultRouter(
+    router, r"authors", lookup="author", trailing_slash=False
+)
+authors_router.register(r"books", views.BookViewSet, basename="author-books")
+
+books_router = routers.NestedDefaultRouter(
+    authors_router, r"books", lookup="book", trailing_slash=False
+)
+books_router.register(
+    r"collaborators", views.CollaboratorViewSet, basename="book-collaborators"
+)
 
 
 urlpatterns = [
     path("", include(router.urls)),
+    path("", include(authors_router.urls)),
+    path("", include(books_router.urls)),
+    path("async/authors", async_views.author_list, name="async-authors-list"),
+    path(
+        "async/authors/<str:pk>",
+        async_views.author_retrieve,
+        name="async-authors-detail",
+    ),
 ]
@@ -1,42 +1,152 @@
+from django.core.exceptions import ValidationError
+from django.db.models import prefetch_related_objects
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework import serializers
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
-from books.models import Author, Collaborator, Book
-from api.serializers import AuthorSerializer, CollaboratorSerializer, BookSerializer
+from books import autocomplete, search
+from books.models import Author, Collaborator, Book, books_prefetch
+from api import cache, coalesce, conditional, fieldsets, filters, performance
+from api.export import aiterate, buffered, export_lines
+from api.fast_serializers import read_serializer
+from api.pagination import (
+    BookPageNumberPagination,
+    get_author_ordering,
+    get_author_paginator,
+    order_authors,
+)
+from api.serializers import (
+    AuthorSerializer,
+    BulkAuthorSerializer,
+    CollaboratorSerializer,
+    BookSerializer,
+    SearchQuerySerializer,
+    SearchResultSerializer,
+    AutocompleteQuerySerializer,
+    AutocompleteResultSerializer,
+)
 
 
 class AuthorViewSet(viewsets.ViewSet):
-    
     def get_permissions(self):
-        if self.action in ("create", "update", "partial_update", "destroy"):
+        if self.action in (
+            "create",
+            "bulk",
+            "export",
+            "update",
+            "partial_update",
+            "destroy",
+        ):
             return (IsAuthenticated(), IsAdminUser())
         return (IsAuthenticated(),)
 
     def list(self, request):
-        authors = Author.objects.order_by("name")
+        cache_key = cache.author_list_cache_key(request)
+        cached = cache.get_cached_list(cache_key)
+        if cached is not None:
+            return self.conditional_response(request, cached["data"], cached["etag"])
 
-        # paginate response
-        paginator = PageNumberPagination()
-        paginator.page_size = 10
+        fields = fieldsets.get_author_fields(request)
+        ordering = get_author_ordering(request)
+        author_filters = filters.get_author_filters(request)
+        authors = filters.filter_authors(Author.objects.all(), author_filters)
+        authors = order_authors(authors, *ordering)
+        if fields is not None:
+            authors = authors.only(*fieldsets.author_columns(fields), ordering[0])
+
+        # paginate response, either by page number or by cursor
+        paginator = get_author_paginator(request, ordering)
         page = paginator.paginate_queryset(authors, request)
 
-        serializer = AuthorSerializer(page, many=True)
-        return paginator.get_paginated_response(serializer.data)
+        # answer conditional requests before fetching books and serializing
+        etag = conditional.get_page_etag(request, page, paginator.get_metadata())
+        response = conditional.not_modified(request, etag)
+        if response is not None:
+            return conditional.set_validators(response, etag)
+
+        # concurrent requests for the same page share a single serialization
+        data = coalesce.do(
+            (cache_key, etag),
+            lambda: self.serialize_page(page, paginator, fields, cache_key, etag),
+        )
+        response = Response(data, status=status.HTTP_200_OK)
+        return conditional.set_validators(response, etag)
 
     def retrieve(self, request, pk=None):
-        # validate that author with given id exists
-        try:
-            author = Author.objects.get(id=pk)
-        except Author.DoesNotExist:
+        cache_key = cache.author_cache_key(pk)
+        cached = cache.get_cached_author(cache_key, request)
+        if cached is not None:
+            return self.conditional_response(request, **cached)
+
+        fields = fieldsets.get_author_fields(request)
+
+        # answer conditional requests before fetching books and serializing
+        # (validators are None when there's no author with given id)
+        validators = conditional.get_author_validators(pk, request)
+        if validators is None:
             return Response(
                 {"detail": f"Author with id '{pk}' was not found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        serializer = AuthorSerializer(author)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        response = conditional.not_modified(request, *validators)
+        if response is not None:
+            return conditional.set_validators(response, *validators)
+
+        # concurrent requests for the same author share a single fetch and
+        # serialization (None when the author was deleted since)
+        data = coalesce.do(
+            (cache_key, request.GET.urlencode(), *validators),
+            lambda: self.serialize_author(request, pk, fields, cache_key, validators),
+        )
+        if data is None:
+            return Response(
+                {"detail": f"Author with id '{pk}' was not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        response = Response(data, status=status.HTTP_200_OK)
+        return conditional.set_validators(response, *validators)
+
+    def serialize_page(self, page, paginator, fields, cache_key, etag):
+        """Return the payload of a page of authors, and cache it"""
+        if fieldsets.includes_books(fields):
+            prefetch_related_objects(page, books_prefetch())
+        serializer = read_serializer(AuthorSerializer)(page, many=True, fields=fields)
+        with performance.timer("serialize"):
+            data = serializer.data
+        data = paginator.get_paginated_response(data).data
+        cache.set_cached_list(cache_key, {"data": data, "etag": etag})
+        return data
+
+    def serialize_author(self, request, pk, fields, cache_key, validators):
+        """Return the payload of an author, and cache it, or None if not found"""
+        try:
+            author = fieldsets.author_queryset(fields).get(id=pk)
+        except Author.DoesNotExist:
+            return None
+
+        serializer = read_serializer(AuthorSerializer)(author, fields=fields)
+        with performance.timer("serialize"):
+            data = serializer.data
+        etag, last_modified = validators
+        cache.set_cached_author(
+            cache_key,
+            request,
+            {"data": data, "etag": etag, "last_modified": last_modified},
+        )
+        return data
+
+    def conditional_response(self, request, data, etag, last_modified=None):
+        """Return a response for a cached payload, or 304 if the client has it"""
+        response = conditional.not_modified(request, etag, last_modified)
+        if response is None:
+            response = Response(data, status=status.HTTP_200_OK)
+        return conditional.set_validators(response, etag, last_modified)
 
     def create(self, request):
         serializer = AuthorSerializer(data=request.data)
@@ -44,6 +154,46 @@ class AuthorViewSet(viewsets.ViewSet):
         author = serializer.save()
         return Response(AuthorSerializer(author).data, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """
+        Create authors, or update the ones given with an `id`, along with their
+        books and collaborators, from a list payload. Nothing is written unless
+        every item is valid, errors are reported per item, and an `id` can only
+        be given once.
+
+        The books of an updated author are matched by name with its existing
+        ones: a match gets the `publish_date` and `collaborators` given (its
+        links are replaced), other names are created, and existing books left
+        out of the payload are kept. Posting the same payload twice is thus
+        idempotent. Each item of the response lists the ids of its books in
+        the payload's order.
+        """
+        serializer = BulkAuthorSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        """
+        Stream every author, with its books, as newline-delimited JSON. Pass
+        `modified_since` (ISO 8601) to only export the authors changed since.
+        """
+        modified_since = request.query_params.get("modified_since")
+        if modified_since is not None:
+            try:
+                modified_since = serializers.DateTimeField().run_validation(
+                    modified_since
+                )
+            except serializers.ValidationError as exc:
+                raise serializers.ValidationError({"modified_since": exc.detail})
+
+        blocks = buffered(export_lines(modified_since))
+        if isinstance(request._request, ASGIRequest):
+            blocks = aiterate(blocks)
+        return StreamingHttpResponse(blocks, content_type="application/x-ndjson")
+
     def update(self, request, pk=None):
         # validate that author with given id exists
         try:
@@ -86,3 +236,151 @@ class AuthorViewSet(viewsets.ViewSet):
 
         author.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class BookViewSet(viewsets.ViewSet):
+    """Books of an author, with their author and collaborators"""
+
+    permission_classes = (IsAuthenticated,)
+
+    def list(self, request, author_pk=None):
+        # validate that author with given id exists
+        try:
+            Author.objects.only("id").get(id=author_pk)
+        except (Author.DoesNotExist, ValidationError):
+            return Response(
+                {"detail": f"Author with id '{author_pk}' was not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        books = Book.objects.filter(author_id=author_pk).order_by("name", "id")
+
+        # paginate books before loading their relations, so only the page's
+        # collaborators are prefetched
+        paginator = BookPageNumberPagination()
+        page = paginator.paginate_queryset(books.with_relations(), request)
+        serializer = read_serializer(BookSerializer)(page, many=True)
+        with performance.timer("serialize"):
+            data = serializer.data
+        return paginator.get_paginated_response(data)
+
+    def retrieve(self, request, author_pk=None, pk=None):
+        # validate that book with given id exists for given author
+        try:
+            book = Book.objects.with_relations().get(author_id=author_pk, id=pk)
+        except (Book.DoesNotExist, ValidationError):
+            return Response(
+                {"detail": f"Book with id '{pk}' was not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        serializer = read_serializer(BookSerializer)(book)
+        with performance.timer("serialize"):
+            data = serializer.data
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class CollaboratorViewSet(viewsets.ViewSet):
+    """Collaborators of an author's book"""
+
+    permission_classes = (IsAuthenticated,)
+
+    def list(self, request, author_pk=None, book_pk=None):
+        # validate that book with given id exists for given author
+        try:
+            Book.objects.only("id").get(author_id=author_pk, id=book_pk)
+        except (Book.DoesNotExist, ValidationError):
+            return Response(
+                {"detail": f"Book with id '{book_pk}' was not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        collaborators = Collaborator.objects.filter(books__id=book_pk).order_by(
+            "name", "id"
+        )
+        serializer = read_serializer(CollaboratorSerializer)(collaborators, many=True)
+        with performance.timer("serialize"):
+            data = serializer.data
+        return Response(data, status=status.HTTP_200_OK)
+
+    def retrieve(self, request, author_pk=None, book_pk=None, pk=None):
+        # validate that collaborator with given id collaborated on given book
+        try:
+            collaborator = Collaborator.objects.get(
+                books__id=book_pk, books__author_id=author_pk, id=pk
+            )
+        except (Collaborator.DoesNotExist, ValidationError):
+            return Response(
+                {"detail": f"Collaborator with id '{pk}' was not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        serializer = read_serializer(CollaboratorSerializer)(collaborator)
+        with performance.timer("serialize"):
+            data = serializer.data
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class SearchViewSet(viewsets.ViewSet):
+    """Full-text search over authors, books and collaborators"""
+
+    permission_classes = (IsAuthenticated,)
+
+    def list(self, request):
+        params = SearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data
+
+        backend = search.get_backend()
+        if backend is None:
+            return Response(
+                {"detail": "Search is not available."},
+                status=status.HTTP_501_NOT_IMPLEMENTED,
+            )
+
+        # fetch one extra result to find out whether there's a following page
+        limit, offset = query["limit"], query["offset"]
+        results = backend.search(
+            query["q"], sorted(query.get("type", ())), limit + 1, offset
+        )
+
+        url = request.build_absolute_uri()
+        next_link = previous_link = None
+        if len(results) > limit:
+            next_link = replace_query_param(url, "offset", offset + limit)
+        if offset > limit:
+            previous_link = replace_query_param(url, "offset", offset - limit)
+        elif offset:
+            previous_link = remove_query_param(url, "offset")
+
+        serializer = SearchResultSerializer(results[:limit], many=True)
+        with performance.timer("serialize"):
+            data = serializer.data
+        return Response(
+            {"next": next_link, "previous": previous_link, "results": data},
+            status=status.HTTP_200_OK,
+        )
+
+
+class AutocompleteViewSet(viewsets.ViewSet):
+    """Author and book names starting with the typed prefix"""
+
+    permission_classes = (IsAuthenticated,)
+
+    def list(self, request):
+        params = AutocompleteQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data
+
+        # served from memory, without querying the database
+        results = autocomplete.get_index().complete(
+            query["q"], sorted(query.get("type", ())), query["limit"]
+        )
+        serializer = AutocompleteResultSerializer(
+            [
+                {"type": item_type, "id": pk, "name": name}
+                for item_type, pk, name in results
+            ],
+            many=True,
+        )
+        return Response({"results": serializer.data}, status=status.HTTP_200_OK)
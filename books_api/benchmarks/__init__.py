@@ -0,0 +1,60 @@
+"""
+Benchmarks for the books API.
+
+Each benchmark is a module runnable from the Django project directory, e.g.
+
+    $ python -m benchmarks.indexes --books 1000000
+
+Benchmarks never touch the configured database: they run against a throwaway
+test database created (and destroyed) by `benchmark_database()`.
+"""
+
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "books_api.settings.dev")
+
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def benchmark_database():
+    """
+    Create a migrated test database and point the default connection at it.
+
+    SQLite test databases are kept on disk instead of in memory so that large
+    seeded datasets don't need to fit in RAM.
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    # allows the test clients' host and turns DEBUG (and query logging) off
+    setup_test_environment()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if connection.vendor == "sqlite":
+            connection.settings_dict["TEST"]["NAME"] = os.path.join(
+                tmp_dir, "benchmark.sqlite3"
+            )
+        old_name = connection.creation.create_test_db(verbosity=0, serialize=False)
+        try:
+            yield connection
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+
+@contextmanager
+def timer():
+    """Yield a dict whose `elapsed` key holds the block's wall time in seconds"""
+    result = {}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["elapsed"] = time.perf_counter() - start
@@ -0,0 +1,351 @@
+"""
+Benchmark the authors endpoints (list, retrieve, create and update, and the
+async list and retrieve) served by both the WSGI and the ASGI applications, on
+a catalog seeded with the test factories. Reports the p50/p95/p99 latency, the
+SQL queries per request and the memory allocated per request, and compares
+them against the committed baseline (`benchmarks/baseline.json`):
+
+    $ python -m benchmarks.api --check
+    $ python -m benchmarks.api --update-baseline
+
+With `--check` the command exits with an error when a scenario runs more
+queries than in the baseline, or its median latency or memory grew by more
+than the tolerance (tail latencies are reported, but too noisy to fail on).
+Latencies depend on the machine, so compare runs made on the same one (or
+raise `--latency-tolerance`).
+"""
+
+import argparse
+import asyncio
+import gc
+import io
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks import benchmark_database, setup_django, timer
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+CSRF_TOKEN = "b" * 32
+
+# scenario -> (method, url, body)
+SCENARIOS = {
+    "list": ("GET", "/api/v1/authors", None),
+    "list page 5": ("GET", "/api/v1/authors?page=5", None),
+    "retrieve": ("GET", "/api/v1/authors/{pk}", None),
+    "async list": ("GET", "/api/v1/async/authors", None),
+    "async retrieve": ("GET", "/api/v1/async/authors/{pk}", None),
+    "create": (
+        "POST",
+        "/api/v1/authors",
+        {"name": "Benchmark author", "biography": "Bio", "birthday": "1950-01-01"},
+    ),
+    "update": (
+        "PUT",
+        "/api/v1/authors/{pk}",
+        {"name": "Updated author", "biography": "Bio", "birthday": "1950-01-01"},
+    ),
+}
+
+
+def get_headers(cookies, body):
+    headers = {"cookie": cookies, "x-csrftoken": CSRF_TOKEN}
+    if body is not None:
+        headers["content-type"] = "application/json"
+        headers["content-length"] = str(len(body))
+    return headers
+
+
+def wsgi_request(application, method, url, cookies, body=None, headers=None):
+    """
+    Send a request straight to the WSGI application, as a WSGI server would,
+    with the extra `headers` if any. Return its status and headers.
+    """
+    path, _, query_string = url.partition("?")
+    environ = {
+        "REQUEST_METHOD": method,
+        "PATH_INFO": path,
+        "QUERY_STRING": query_string,
+        "SERVER_NAME": "testserver",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "REMOTE_ADDR": "127.0.0.1",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(body or b""),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": False,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for name, value in {**get_headers(cookies, body), **(headers or {})}.items():
+        name = name.upper().replace("-", "_")
+        if name not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            name = f"HTTP_{name}"
+        environ[name] = value
+
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response["status"] = int(status.split()[0])
+        response["headers"] = {name.lower(): value for name, value in headers}
+
+    result = application(environ, start_response)
+    try:
+        for _ in result:
+            pass
+    finally:
+        if hasattr(result, "close"):
+            result.close()
+    return response["status"], response["headers"]
+
+
+async def asgi_request(application, method, url, cookies, body=None):
+    """
+    Send a request straight to the ASGI application, as an ASGI server would.
+    Return its status and headers.
+    """
+    path, _, query_string = url.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query_string.encode(),
+        "headers": [
+            (name.encode(), value.encode())
+            for name, value in {
+                "host": "testserver",
+                **get_headers(cookies, body),
+            }.items()
+        ],
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 0),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": body or b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    headers = {
+        name.decode().lower(): value.decode() for name, value in messages[0]["headers"]
+    }
+    return messages[0]["status"], headers
+
+
+def count_queries(headers):
+    """Return the number of queries reported by the `Server-Timing` header"""
+    for metric in headers["server-timing"].split(", "):
+        name, *params = metric.split(";")
+        if name == "db":
+            return int(params[-1].split('"')[1].split()[0])
+    return 0
+
+
+def measure_memory(send, repeat):
+    """Return the median peak of memory (KiB) allocated while sending a request"""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(repeat):
+            # don't count garbage left by the previous requests
+            gc.collect()
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            send()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append((peak - current) / 1024)
+    finally:
+        tracemalloc.stop()
+    return statistics.median(peaks)
+
+
+def run_scenario(send, requests, memory_repeat):
+    """Send the scenario's request, return its measures"""
+    # warm up
+    status, headers = send()
+    assert status < 400, status
+    queries = count_queries(headers)
+
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        send()
+        latencies.append((time.perf_counter() - start) * 1000)
+    quantiles = statistics.quantiles(latencies, n=100)
+
+    return {
+        "p50_ms": round(quantiles[49], 2),
+        "p95_ms": round(quantiles[94], 2),
+        "p99_ms": round(quantiles[98], 2),
+        "queries": queries,
+        "memory_kib": round(measure_memory(send, memory_repeat), 1),
+    }
+
+
+def run(author_ids, cookies, requests, memory_repeat):
+    from django.core.asgi import get_asgi_application
+    from django.core.wsgi import get_wsgi_application
+
+    wsgi_application = get_wsgi_application()
+    asgi_application = get_asgi_application()
+    # the ASGI requests of a scenario are all sent from the same event loop
+    loop = asyncio.new_event_loop()
+
+    results = {}
+    try:
+        for label, (method, url, data) in SCENARIOS.items():
+            url = url.format(pk=author_ids[0])
+            body = json.dumps(data).encode() if data is not None else None
+
+            def send_wsgi():
+                return wsgi_request(wsgi_application, method, url, cookies, body)
+
+            def send_asgi():
+                return loop.run_until_complete(
+                    asgi_request(asgi_application, method, url, cookies, body)
+                )
+
+            for app, send in (("wsgi", send_wsgi), ("asgi", send_asgi)):
+                results[f"{app} {label}"] = run_scenario(send, requests, memory_repeat)
+    finally:
+        loop.close()
+    return results
+
+
+def compare(results, baseline, latency_tolerance, memory_tolerance):
+    """Return the regressions of `results` against `baseline`"""
+    regressions = []
+    for scenario, measures in results.items():
+        expected = baseline["results"].get(scenario)
+        if expected is None:
+            continue
+        if measures["queries"] > expected["queries"]:
+            regressions.append(
+                f"{scenario}: {measures['queries']} queries, "
+                f"baseline {expected['queries']}"
+            )
+        for measure, tolerance in (
+            ("p50_ms", latency_tolerance),
+            ("memory_kib", memory_tolerance),
+        ):
+            if measures[measure] > expected[measure] * (1 + tolerance):
+                regressions.append(
+                    f"{scenario}: {measure} {measures[measure]}, "
+                    f"baseline {expected[measure]} (+{tolerance:.0%} allowed)"
+                )
+    return regressions
+
+
+def report(results, baseline):
+    print(
+        f"{'scenario':>20} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} "
+        f"{'queries':>8} {'mem (KiB)':>10} {'p50 vs baseline':>16}"
+    )
+    for scenario, measures in results.items():
+        expected = (baseline or {}).get("results", {}).get(scenario)
+        change = ""
+        if expected:
+            change = f"{measures['p50_ms'] / expected['p50_ms'] - 1:+.0%}"
+        print(
+            f"{scenario:>20} {measures['p50_ms']:>9.2f} {measures['p95_ms']:>9.2f} "
+            f"{measures['p99_ms']:>9.2f} {measures['queries']:>8} "
+            f"{measures['memory_kib']:>10.1f} {change:>16}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--authors", type=int, default=1000)
+    parser.add_argument("--books", type=int, default=5000)
+    parser.add_argument("--collaborators", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--memory-repeat", type=int, default=20)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--latency-tolerance", type=float, default=0.5)
+    parser.add_argument("--memory-tolerance", type=float, default=0.2)
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument(
+        "--check", action="store_true", help="Fail on regressions against baseline"
+    )
+    action.add_argument(
+        "--update-baseline", action="store_true", help="Save results as baseline"
+    )
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.test import Client
+
+    from benchmarks.seed import seed_factories
+
+    # measure the views rather than the response cache, and count queries
+    settings.AUTHORS_CACHE_TIMEOUT = 0
+    settings.PERFORMANCE_SERVER_TIMING = True
+
+    size = {
+        "authors": args.authors,
+        "books": args.books,
+        "collaborators": args.collaborators,
+    }
+    baseline = None
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        if baseline["size"] != size:
+            if args.check:
+                parser.error(
+                    f"the baseline was measured on a catalog of {baseline['size']}"
+                )
+            baseline = None
+
+    with benchmark_database():
+        with timer() as elapsed:
+            author_ids = seed_factories(args.authors, args.books, args.collaborators)
+        print(
+            f"Seeded {args.authors} authors, {args.books} books and "
+            f"{args.collaborators} collaborators in {elapsed['elapsed']:.1f}s\n"
+        )
+        client = Client()
+        client.force_login(User.objects.create(username="benchmark", is_staff=True))
+        client.cookies["csrftoken"] = CSRF_TOKEN
+        cookies = client.cookies.output(attrs=[], header="", sep=";").strip()
+
+        results = run(author_ids, cookies, args.requests, args.memory_repeat)
+
+    report(results, baseline)
+
+    if args.update_baseline:
+        args.baseline.write_text(
+            json.dumps({"size": size, "results": results}, indent=2) + "\n"
+        )
+        print(f"\nSaved baseline to {args.baseline}")
+
+    if args.check:
+        if baseline is None:
+            parser.error(f"no baseline found at {args.baseline}")
+        regressions = compare(
+            results, baseline, args.latency_tolerance, args.memory_tolerance
+        )
+        if regressions:
+            print("\nRegressions:\n" + "\n".join(regressions))
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
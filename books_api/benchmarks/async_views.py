@@ -0,0 +1,131 @@
+"""
+Compare the throughput of the sync (DRF) and async authors views served by
+the ASGI application, at several concurrency levels. Requests are sent
+straight to the ASGI callable, as an ASGI server would. A fixed latency can be
+added to every SQL query to simulate a slow database.
+
+    $ python -m benchmarks.async_views --concurrency 1 10 50 --db-latency 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks import benchmark_database, setup_django
+
+ENDPOINTS = {
+    "sync list": "/api/v1/authors",
+    "async list": "/api/v1/async/authors",
+    "sync retrieve": "/api/v1/authors/{pk}",
+    "async retrieve": "/api/v1/async/authors/{pk}",
+}
+
+
+def add_db_latency(latency):
+    """Sleep `latency` seconds before every query, on every connection"""
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    def slow_query(execute, sql, params, many, context):
+        time.sleep(latency)
+        return execute(sql, params, many, context)
+
+    def install(connection, **kwargs):
+        connection.execute_wrappers.append(slow_query)
+
+    connection_created.connect(install, weak=False)
+    for connection in connections.all():
+        install(connection)
+
+
+async def asgi_get(application, url, cookies):
+    """Send a GET request straight to the ASGI application, return its status"""
+    path, _, query_string = url.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query_string.encode(),
+        "headers": [(b"host", b"testserver"), (b"cookie", cookies.encode())],
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 0),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    return messages[0]["status"]
+
+
+async def run(application, url, cookies, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def request():
+        async with semaphore:
+            start = time.perf_counter()
+            status = await asgi_get(application, url, cookies)
+            latencies.append(time.perf_counter() - start)
+            assert status == 200, status
+
+    start = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    return requests / elapsed, statistics.quantiles(latencies, n=100)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--db-latency", type=float, default=5, help="milliseconds")
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.core.asgi import get_asgi_application
+    from django.test import Client
+
+    from benchmarks.seed import seed_catalog
+
+    # measure the views, not the response cache
+    settings.AUTHORS_CACHE_TIMEOUT = 0
+
+    with benchmark_database():
+        author_ids = seed_catalog(100, 500)
+        client = Client()
+        client.force_login(User.objects.create(username="benchmark"))
+        cookies = client.cookies.output(attrs=[], header="", sep=";").strip()
+        application = get_asgi_application()
+        add_db_latency(args.db_latency / 1000)
+
+        print(
+            f"{'endpoint':>15} {'concurrency':>11} {'req/s':>8} "
+            f"{'p50 (ms)':>9} {'p95 (ms)':>9}"
+        )
+        for label, url in ENDPOINTS.items():
+            url = url.format(pk=author_ids[0])
+            for concurrency in args.concurrency:
+                throughput, quantiles = asyncio.run(
+                    run(application, url, cookies, args.requests, concurrency)
+                )
+                print(
+                    f"{label:>15} {concurrency:>11} {throughput:>8.1f} "
+                    f"{quantiles[49] * 1000:>9.1f} {quantiles[94] * 1000:>9.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
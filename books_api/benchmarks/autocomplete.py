@@ -0,0 +1,78 @@
+"""
+Measure the in-memory autocomplete index: build time, memory footprint and
+lookup latency, against the `LIKE 'x%'` queries it replaces.
+
+    $ python -m benchmarks.autocomplete --authors 100000 --books 1000000
+"""
+
+import argparse
+import statistics
+import tracemalloc
+
+from benchmarks import benchmark_database, setup_django, timer
+
+PREFIXES = ("a", "author 0", "author 00012", "book 1", "book 0000123")
+
+
+def measure(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        with timer() as elapsed:
+            function()
+        timings.append(elapsed["elapsed"] * 1_000_000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--authors", type=int, default=100000)
+    parser.add_argument("--books", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from books import autocomplete
+    from books.models import Author, Book
+
+    from benchmarks.seed import seed_catalog
+
+    with benchmark_database():
+        print(f"Seeding {args.authors} authors and {args.books} books...")
+        seed_catalog(args.authors, args.books)
+
+        index = autocomplete.AutocompleteIndex()
+        with timer() as elapsed:
+            index.build(autocomplete.iter_names())
+        # measured on a second build, tracing slows it down severalfold
+        traced = autocomplete.AutocompleteIndex()
+        tracemalloc.start()
+        traced.build(autocomplete.iter_names())
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del traced
+        keys = sum(map(len, index.keys.values()))
+        print(
+            f"Built {keys} keys in {elapsed['elapsed']:.1f}s, "
+            f"{memory / 1024 / 1024:.0f} MB\n"
+        )
+
+        print(f"{'prefix':>14} {'index p50 (us)':>15} {'LIKE p50 (us)':>14}")
+        for prefix in PREFIXES:
+            lookup = measure(lambda: index.complete(prefix, limit=10), args.repeat)
+            like = measure(
+                lambda: [
+                    list(
+                        model.objects.filter(name__istartswith=prefix)
+                        .order_by("name")
+                        .values_list("id", "name")[:10]
+                    )
+                    for model in (Author, Book)
+                ],
+                max(1, args.repeat // 20),
+            )
+            print(f"{prefix:>14} {lookup:>15.1f} {like:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Weigh the CPU time spent compressing author pages (with their nested books,
+seeded by the test factories) against the bytes it saves, for each encoding
+available (see api.compression) at several levels, and against serving the
+compressed body from the response cache.
+
+    $ python -m benchmarks.compression --sizes 10 100
+"""
+
+import argparse
+import gzip
+import time
+
+from benchmarks import benchmark_database, setup_django
+
+# encoding -> level -> function compressing content
+LEVELS = {
+    "gzip": {
+        level: lambda content, level=level: gzip.compress(
+            content, compresslevel=level, mtime=0
+        )
+        for level in (1, 6, 9)
+    },
+}
+
+
+def cpu_time(function, repeat):
+    """Return the CPU time (ms) a call to `function` takes, on average"""
+    start = time.process_time()
+    for _ in range(repeat):
+        function()
+    return (time.process_time() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--books-per-author", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from api import cache
+    from api.compression import brotli, zstandard
+    from api.renderers import FastJSONRenderer
+    from api.serializers import AuthorSerializer
+    from benchmarks.seed import seed_factories
+    from books.models import Author
+
+    if brotli is not None:
+        LEVELS["br"] = {
+            level: lambda content, level=level: brotli.compress(content, quality=level)
+            for level in (1, 5, 11)
+        }
+    if zstandard is not None:
+        LEVELS["zstd"] = {
+            level: lambda content, level=level: zstandard.compress(content, level)
+            for level in (1, 3, 19)
+        }
+
+    renderer = FastJSONRenderer()
+    largest = max(args.sizes)
+
+    with benchmark_database():
+        seed_factories(largest, largest * args.books_per_author)
+
+        print(
+            f"{'authors':>8} {'encoding':>9} {'KiB':>8} {'saved':>6} "
+            f"{'cpu (ms)':>9} {'KiB saved/cpu ms':>17}"
+        )
+        for size in args.sizes:
+            authors = Author.objects.with_books().order_by("name")[:size]
+            content = renderer.render(AuthorSerializer(authors, many=True).data)
+            print(f"{size:>8} {'identity':>9} {len(content) / 1024:>8.1f}")
+
+            for encoding, levels in LEVELS.items():
+                for level, compress in levels.items():
+                    compressed = compress(content)
+                    saved = len(content) - len(compressed)
+                    cpu = cpu_time(lambda: compress(content), args.repeat)
+                    print(
+                        f"{size:>8} {f'{encoding}-{level}':>9} "
+                        f"{len(compressed) / 1024:>8.1f} "
+                        f"{saved / len(content):>6.0%} {cpu:>9.3f} "
+                        f"{saved / 1024 / cpu:>17.1f}"
+                    )
+
+            key = cache.compressed_cache_key('W/"benchmark"', "", "gzip")
+            cache.get_cache().set(key, LEVELS["gzip"][6](content))
+            cpu = cpu_time(lambda: cache.get_cache().get(key), args.repeat)
+            print(f"{size:>8} {'cached':>9} {'':>8} {'':>6} {cpu:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Measure what opening a database connection costs each request, by serving the
+same requests through the WSGI application with a new connection per request
+(`CONN_MAX_AGE=0`, as in development), with persistent connections, and with
+persistent connections checked before reuse (as in `settings.prod`). Also
+reports the cost of a bare connect, with and without `SQLITE_PRAGMAS`.
+
+    $ python -m benchmarks.connections --requests 500
+"""
+
+import argparse
+import json
+import statistics
+
+from benchmarks import benchmark_database, setup_django, timer
+
+VARIANTS = {
+    "per request": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False},
+    "persistent": {"CONN_MAX_AGE": 600, "CONN_HEALTH_CHECKS": False},
+    "persistent + checks": {"CONN_MAX_AGE": 600, "CONN_HEALTH_CHECKS": True},
+}
+
+
+def measure_connect(repeat):
+    """Return the median time (ms) to open and close a connection"""
+    from django.db import DEFAULT_DB_ALIAS, connections
+
+    timings = []
+    for _ in range(repeat):
+        connection = connections.create_connection(DEFAULT_DB_ALIAS)
+        with timer() as elapsed:
+            connection.ensure_connection()
+        connection.close()
+        timings.append(elapsed["elapsed"] * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.core.wsgi import get_wsgi_application
+    from django.db.backends.signals import connection_created
+    from django.test import Client
+
+    from benchmarks.api import CSRF_TOKEN, SCENARIOS, wsgi_request
+    from benchmarks.seed import seed_catalog
+
+    # measure the views rather than the response cache
+    settings.AUTHORS_CACHE_TIMEOUT = 0
+
+    connects = []
+    connection_created.connect(lambda **kwargs: connects.append(1), weak=False)
+
+    with benchmark_database() as connection:
+        author_ids = seed_catalog(1000, 5000)
+        client = Client()
+        client.force_login(User.objects.create(username="benchmark", is_staff=True))
+        client.cookies["csrftoken"] = CSRF_TOKEN
+        cookies = client.cookies.output(attrs=[], header="", sep=";").strip()
+        application = get_wsgi_application()
+        requests = {
+            "retrieve": ("GET", f"/api/v1/authors/{author_ids[0]}", None),
+            "update": (
+                "PUT",
+                f"/api/v1/authors/{author_ids[0]}",
+                json.dumps(SCENARIOS["update"][2]).encode(),
+            ),
+        }
+
+        pragmas = settings.SQLITE_PRAGMAS
+        connect = measure_connect(args.requests)
+        settings.SQLITE_PRAGMAS = {}
+        bare_connect = measure_connect(args.requests)
+        settings.SQLITE_PRAGMAS = pragmas
+        print(
+            f"Connect: {connect:.3f} ms, {bare_connect:.3f} ms without "
+            f"SQLITE_PRAGMAS ({connection.vendor})\n"
+        )
+
+        print(f"{'request':>9} {'connections':>20} {'p50 (ms)':>9} {'connects':>9}")
+        for label, (method, url, body) in requests.items():
+            for variant, options in VARIANTS.items():
+                connection.close()
+                connection.settings_dict.update(options)
+                # warm up
+                wsgi_request(application, method, url, cookies, body)
+                connects.clear()
+                latencies = []
+                for _ in range(args.requests):
+                    with timer() as elapsed:
+                        status, _ = wsgi_request(
+                            application, method, url, cookies, body
+                        )
+                    assert status < 400, status
+                    latencies.append(elapsed["elapsed"] * 1000)
+                print(
+                    f"{label:>9} {variant:>20} {statistics.median(latencies):>9.2f} "
+                    f"{len(connects):>9}"
+                )
+
+
+if __name__ == "__main__":
+    main()
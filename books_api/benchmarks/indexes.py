@@ -0,0 +1,96 @@
+"""
+Compare query plans and timings of the hot author/book queries with and
+without the indexes added in `books.0002_indexes`.
+
+    $ python -m benchmarks.indexes --authors 100000 --books 1000000
+"""
+
+import argparse
+
+from benchmarks import benchmark_database, setup_django, timer
+
+
+def get_queries(author_ids):
+    from django.db.models import Q
+
+    from books.models import Author, Book, Collaborator
+
+    first_page = list(Author.objects.order_by("name", "id")[:10])
+    last = first_page[-1]
+    page_ids = [author.id for author in first_page]
+
+    return {
+        "authors list page": Author.objects.order_by("name", "id")[:10],
+        "authors cursor page": Author.objects.filter(
+            Q(name__gte=last.name), Q(name__gt=last.name) | Q(id__gt=last.id)
+        ).order_by("name", "id")[:11],
+        "books of a page": Book.objects.filter(author_id__in=page_ids).order_by("name"),
+        "books of an author": Book.objects.filter(author_id=author_ids[0]).order_by(
+            "name"
+        ),
+        "collaborator by name": Collaborator.objects.filter(
+            name="Collaborator 00000042"
+        ),
+    }
+
+
+def get_indexes():
+    from books.models import Author, Book, Collaborator
+
+    return [
+        (model, index)
+        for model in (Author, Book, Collaborator)
+        for index in model._meta.indexes
+    ]
+
+
+def run_queries(author_ids, repeat):
+    results = {}
+    for label, queryset in get_queries(author_ids).items():
+        with timer() as elapsed:
+            for _ in range(repeat):
+                list(queryset.all())
+        results[label] = (queryset.explain(), elapsed["elapsed"] / repeat)
+    return results
+
+
+def report(title, results):
+    print(f"\n=== {title}")
+    for label, (plan, elapsed) in results.items():
+        print(f"\n--- {label}: {elapsed * 1000:.2f} ms")
+        print(plan)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--authors", type=int, default=100_000)
+    parser.add_argument("--books", type=int, default=1_000_000)
+    parser.add_argument("--collaborators", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from benchmarks.seed import seed_catalog
+
+    with benchmark_database() as connection:
+        with timer() as elapsed:
+            author_ids = seed_catalog(args.authors, args.books, args.collaborators)
+        print(
+            f"Seeded {args.authors} authors, {args.books} books and "
+            f"{args.collaborators} collaborators in {elapsed['elapsed']:.1f}s"
+        )
+
+        with connection.schema_editor() as schema_editor:
+            for model, index in get_indexes():
+                schema_editor.remove_index(model, index)
+        report("without indexes", run_queries(author_ids, args.repeat))
+
+        with connection.schema_editor() as schema_editor:
+            for model, index in get_indexes():
+                schema_editor.add_index(model, index)
+        report("with indexes", run_queries(author_ids, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compare the response formats (see api.renderers and api.parsers) on pages of
+author payloads with their nested books: payload size, and the time to encode
+and decode them, with DRF's JSON renderer and parser, the orjson ones and
+MessagePack.
+
+    $ python -m benchmarks.renderers --sizes 10 100 1000
+"""
+
+import argparse
+import io
+
+from benchmarks import benchmark_database, setup_django, timer
+
+
+def measure(encode, repeat):
+    with timer() as elapsed:
+        for _ in range(repeat):
+            encode()
+    return elapsed["elapsed"] / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--books-per-author", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from api.parsers import FastJSONParser, MessagePackParser
+    from api.renderers import FastJSONRenderer, MessagePackRenderer, msgpack, orjson
+    from api.serializers import AuthorSerializer
+    from benchmarks.seed import seed_catalog
+    from books.models import Author
+
+    # format -> (renderer, parser)
+    formats = {"json": (JSONRenderer(), JSONParser())}
+    if orjson is not None:
+        formats["json (orjson)"] = (FastJSONRenderer(), FastJSONParser())
+    if msgpack is not None:
+        formats["msgpack"] = (MessagePackRenderer(), MessagePackParser())
+    largest = max(args.sizes)
+
+    with benchmark_database():
+        seed_catalog(largest, largest * args.books_per_author)
+
+        print(
+            f"{'authors':>8} {'format':>14} {'KiB':>8} {'encode (ms)':>12} "
+            f"{'decode (ms)':>12}"
+        )
+        for size in args.sizes:
+            authors = Author.objects.with_books().order_by("name")[:size]
+            data = AuthorSerializer(authors, many=True).data
+            expected = JSONParser().parse(io.BytesIO(JSONRenderer().render(data)))
+
+            for label, (renderer, format_parser) in formats.items():
+                content = renderer.render(data)
+                assert format_parser.parse(io.BytesIO(content)) == expected
+
+                encode = measure(lambda: renderer.render(data), args.repeat)
+                decode = measure(
+                    lambda: format_parser.parse(io.BytesIO(content)), args.repeat
+                )
+                print(
+                    f"{size:>8} {label:>14} {len(content) / 1024:>8.1f} "
+                    f"{encode * 1000:>12.3f} {decode * 1000:>12.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
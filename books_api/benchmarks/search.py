@@ -0,0 +1,82 @@
+"""
+Measure full-text search latency against the `icontains` scans it replaces.
+
+    $ python -m benchmarks.search --authors 100000 --books 1000000
+"""
+
+import argparse
+import statistics
+
+from benchmarks import benchmark_database, setup_django, timer
+
+
+def get_queries(book_name):
+    number = book_name.split()[-1]
+    return {
+        "exact name": number,
+        "name prefix": number[:5],
+        "two terms": f"book {number[:6]}",
+        "biography": "biography",
+    }
+
+
+def measure(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        with timer() as elapsed:
+            function()
+        timings.append(elapsed["elapsed"] * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--authors", type=int, default=100000)
+    parser.add_argument("--books", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db.models import Q
+
+    from books import search
+    from books.models import Author, Book, Collaborator
+
+    from benchmarks.seed import seed_catalog
+
+    with benchmark_database():
+        print(f"Seeding {args.authors} authors and {args.books} books...")
+        seed_catalog(args.authors, args.books)
+
+        backend = search.get_backend()
+        with timer() as elapsed:
+            count = search.rebuild(backend, Author, Book, Collaborator)
+        print(f"Indexed {count} documents in {elapsed['elapsed']:.1f}s\n")
+
+        book_name = Book.objects.order_by("id").values_list("name", flat=True)[0]
+        print(
+            f"{'query':>12} {'fts p50 (ms)':>13} {'fts max (ms)':>13} "
+            f"{'icontains p50 (ms)':>19}"
+        )
+        for label, query in get_queries(book_name).items():
+            fts = measure(lambda: backend.search(query, limit=20), args.repeat)
+            # the scan the index replaces, first page only
+            scan = measure(
+                lambda: list(
+                    Book.objects.filter(name__icontains=query)[:20].values_list(
+                        "id", flat=True
+                    )
+                )
+                + list(
+                    Author.objects.filter(
+                        Q(name__icontains=query) | Q(biography__icontains=query)
+                    )[:20].values_list("id", flat=True)
+                ),
+                max(1, args.repeat // 10),
+            )
+            print(f"{label:>12} {fts[0]:>13.2f} {fts[1]:>13.2f} {scan[0]:>19.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import random
+import uuid
+from datetime import date, timedelta
+
+from django.db import transaction
+
+
+def seed_catalog(
+    authors, books, collaborators=0, batch_size=10000, seed=0, factories=False
+):
+    """
+    Insert `authors` authors, `books` books spread evenly among them and
+    `collaborators` collaborators, with up to two collaborators per book.
+
+    With `factories` the objects are built by the test factories, so they hold
+    the same kind of data as the test suite's, but are still bulk inserted.
+    """
+    from books.models import Author, Book, Collaborator
+
+    rng = random.Random(seed)
+    epoch = date(1900, 1, 1)
+
+    if factories:
+        from books.tests.fixtures import AuthorFactory, BookFactory, CollaboratorFactory
+
+        def build_authors(start, stop):
+            return AuthorFactory.build_batch(stop - start)
+
+        def build_collaborators(start, stop):
+            return CollaboratorFactory.build_batch(stop - start)
+
+        def build_books(start, stop):
+            return BookFactory.build_batch(stop - start, author=None)
+
+    else:
+
+        def build_authors(start, stop):
+            return [
+                Author(
+                    name=f"Author {rng.randrange(authors * 10):08d}",
+                    biography="Some biography of the author here",
+                    birthday=epoch + timedelta(days=rng.randrange(40000)),
+                )
+                for _ in range(start, stop)
+            ]
+
+        def build_collaborators(start, stop):
+            return [
+                Collaborator(name=f"Collaborator {i:08d}") for i in range(start, stop)
+            ]
+
+        def build_books(start, stop):
+            return [
+                Book(
+                    id=uuid.uuid4(),
+                    name=f"Book {rng.randrange(books * 10):08d}",
+                    publish_date=epoch + timedelta(days=rng.randrange(45000)),
+                )
+                for _ in range(start, stop)
+            ]
+
+    with transaction.atomic():
+        author_ids = []
+        for start in range(0, authors, batch_size):
+            batch = build_authors(start, min(start + batch_size, authors))
+            Author.objects.bulk_create(batch)
+            author_ids += [author.id for author in batch]
+
+        collaborator_ids = []
+        for start in range(0, collaborators, batch_size):
+            batch = build_collaborators(start, min(start + batch_size, collaborators))
+            Collaborator.objects.bulk_create(batch)
+            collaborator_ids += [collaborator.id for collaborator in batch]
+
+        Through = Book.collaborators.through
+        for start in range(0, books, batch_size):
+            batch = build_books(start, min(start + batch_size, books))
+            for i, book in enumerate(batch, start):
+                book.author_id = author_ids[i % len(author_ids)]
+            Book.objects.bulk_create(batch)
+
+            if collaborator_ids:
+                links = {
+                    (book.id, rng.choice(collaborator_ids))
+                    for book in batch
+                    for _ in range(rng.randrange(3))
+                }
+                Through.objects.bulk_create(
+                    Through(book_id=book_id, collaborator_id=collaborator_id)
+                    for book_id, collaborator_id in links
+                )
+
+        # bulk inserts don't send signals, so the authors' stats are left behind
+        Author.objects.recompute_stats()
+
+    return author_ids
+
+
+def seed_factories(authors, books, collaborators=0, batch_size=5000, seed=0):
+    """`seed_catalog` with objects built by the test factories"""
+    return seed_catalog(
+        authors, books, collaborators, batch_size=batch_size, seed=seed, factories=True
+    )
@@ -0,0 +1,59 @@
+"""
+Compare the DRF and fast serialization engines on author payloads with their
+nested books, at several page sizes.
+
+    $ python -m benchmarks.serializers --sizes 10 100 1000
+"""
+
+import argparse
+
+from benchmarks import benchmark_database, setup_django, timer
+
+
+def measure(serializer_class, authors, repeat):
+    with timer() as elapsed:
+        for _ in range(repeat):
+            serializer_class(authors, many=True).data
+    return elapsed["elapsed"] / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--books-per-author", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from rest_framework.renderers import JSONRenderer
+
+    from api.fast_serializers import FastAuthorSerializer
+    from api.serializers import AuthorSerializer
+    from benchmarks.seed import seed_catalog
+    from books.models import Author
+
+    renderer = JSONRenderer()
+    largest = max(args.sizes)
+
+    with benchmark_database():
+        seed_catalog(largest, largest * args.books_per_author)
+
+        print(f"{'authors':>8} {'drf (ms)':>10} {'fast (ms)':>10} {'speedup':>8}")
+        for size in args.sizes:
+            authors = list(Author.objects.with_books().order_by("name")[:size])
+
+            assert renderer.render(
+                FastAuthorSerializer(authors, many=True).data
+            ) == renderer.render(AuthorSerializer(authors, many=True).data)
+
+            drf = measure(AuthorSerializer, authors, args.repeat)
+            fast = measure(FastAuthorSerializer, authors, args.repeat)
+            print(
+                f"{size:>8} {drf * 1000:>10.2f} {fast * 1000:>10.2f} "
+                f"{drf / fast:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Measure a cache stampede: concurrent requests for the same author, and the
+same page of authors, right after the response cache was cleared. They're sent
+from threads to the WSGI application and as tasks to the ASGI one (async
+views), with and without coalescing (see api.coalesce). Reports the median
+time for all of the requests to be served, the SQL queries they ran in total
+(as traced by SQLite) and how many of them serialized the payload.
+
+    $ python -m benchmarks.stampede --concurrency 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import benchmark_database, setup_django, timer
+
+# scenario -> (url of the WSGI view, url of the ASGI view)
+SCENARIOS = {
+    "retrieve": ("/api/v1/authors/{pk}", "/api/v1/async/authors/{pk}"),
+    "list": ("/api/v1/authors", "/api/v1/async/authors"),
+}
+
+
+def serializations(responses):
+    """Return how many of the responses serialized their payload"""
+    return sum("serialize;" in headers["server-timing"] for _, headers in responses)
+
+
+def wsgi_stampede(application, url, cookies, concurrency):
+    from benchmarks.api import wsgi_request
+
+    barrier = threading.Barrier(concurrency)
+
+    def send():
+        barrier.wait()
+        return wsgi_request(application, "GET", url, cookies)
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        futures = [executor.submit(send) for _ in range(concurrency)]
+        return [future.result() for future in futures]
+
+
+def asgi_stampede(application, url, cookies, concurrency, loop):
+    from benchmarks.api import asgi_request
+
+    async def send():
+        return await asyncio.gather(
+            *(
+                asgi_request(application, "GET", url, cookies)
+                for _ in range(concurrency)
+            )
+        )
+
+    return loop.run_until_complete(send())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--authors", type=int, default=1000)
+    parser.add_argument("--books-per-author", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.core.asgi import get_asgi_application
+    from django.core.wsgi import get_wsgi_application
+    from django.db.backends.signals import connection_created
+    from django.test import Client
+
+    from api import cache
+    from benchmarks.seed import seed_catalog
+
+    settings.PERFORMANCE_SERVER_TIMING = True
+
+    # the SELECTs of all the requests of a stampede
+    statements = []
+
+    def trace(connection, **kwargs):
+        connection.connection.set_trace_callback(
+            lambda sql: sql.startswith("SELECT") and statements.append(sql)
+        )
+
+    connection_created.connect(trace, weak=False)
+
+    with benchmark_database() as connection:
+        if connection.vendor != "sqlite":
+            parser.error("queries can only be traced on SQLite")
+        author_ids = seed_catalog(args.authors, args.authors * args.books_per_author)
+        client = Client()
+        client.force_login(User.objects.create(username="benchmark"))
+        cookies = client.cookies.output(attrs=[], header="", sep=";").strip()
+        wsgi_application = get_wsgi_application()
+        asgi_application = get_asgi_application()
+        loop = asyncio.new_event_loop()
+
+        def stampede(app, url):
+            if app == "wsgi":
+                return wsgi_stampede(wsgi_application, url, cookies, args.concurrency)
+            return asgi_stampede(asgi_application, url, cookies, args.concurrency, loop)
+
+        print(
+            f"{'scenario':>9} {'app':>5} {'coalescing':>11} {'p50 (ms)':>9} "
+            f"{'queries':>8} {'serialized':>11}"
+        )
+        for scenario, urls in SCENARIOS.items():
+            for app, url in zip(("wsgi", "asgi"), urls):
+                url = url.format(pk=author_ids[0])
+                for coalescing in (False, True):
+                    settings.AUTHORS_COALESCING = coalescing
+                    durations, queries, serialized = [], [], []
+                    for _ in range(args.rounds):
+                        cache.get_cache().clear()
+                        statements.clear()
+                        with timer() as elapsed:
+                            responses = stampede(app, url)
+                        assert all(status == 200 for status, _ in responses)
+                        durations.append(elapsed["elapsed"] * 1000)
+                        queries.append(len(statements))
+                        serialized.append(serializations(responses))
+                    print(
+                        f"{scenario:>9} {app:>5} {'on' if coalescing else 'off':>11} "
+                        f"{statistics.median(durations):>9.1f} "
+                        f"{statistics.median(queries):>8.0f} "
+                        f"{statistics.median(serialized):>11.0f}"
+                    )
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Compare the production settings (`books_api.settings.prod`) with the API-only
+ones (`books_api.settings.api`): how long a fresh worker takes to import the
+WSGI application and serve its first request, how many modules it loaded, and
+the median time and SQL queries of the next requests for an author (served
+from the response cache, so mostly the middleware and authentication). Each
+worker is a fresh Python process, run on a seeded catalog:
+
+    $ python -m benchmarks.startup --workers 5 --requests 500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks import benchmark_database, setup_django, timer
+
+# profile -> (settings module, authentication, PRELOAD_AT_BOOT)
+PROFILES = {
+    "prod": ("books_api.settings.prod", "session", "0"),
+    "prod + token": ("books_api.settings.prod", "token", "0"),
+    "api": ("books_api.settings.api", "token", "1"),
+}
+
+
+def worker(url, cookies, authorization, requests):
+    """
+    Boot the WSGI application and send it `requests` requests for `url`, then
+    print the measures as JSON.
+    """
+    start = time.perf_counter()
+    from books_api.wsgi import application
+
+    boot = time.perf_counter() - start
+    modules = len(sys.modules)
+
+    from django.db.backends.signals import connection_created
+
+    from benchmarks.api import wsgi_request
+
+    statements = []
+
+    def trace(connection, **kwargs):
+        connection.connection.set_trace_callback(statements.append)
+
+    connection_created.connect(trace, weak=False)
+    headers = {"authorization": authorization} if authorization else None
+
+    def get():
+        status, _ = wsgi_request(application, "GET", url, cookies, headers=headers)
+        assert status == 200, status
+
+    with timer() as first:
+        get()
+    durations, queries = [], []
+    for _ in range(requests):
+        statements.clear()
+        with timer() as elapsed:
+            get()
+        durations.append(elapsed["elapsed"] * 1000)
+        queries.append(len(statements))
+
+    print(
+        json.dumps(
+            {
+                "boot": boot * 1000,
+                "first": first["elapsed"] * 1000,
+                "modules": modules,
+                "p50": statistics.median(durations),
+                "queries": statistics.median(queries),
+            }
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--authors", type=int, default=100)
+    parser.add_argument("--books-per-author", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--worker", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return worker(*args.worker, args.requests)
+
+    setup_django()
+
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.test import Client
+    from rest_framework.authtoken.models import Token
+
+    from benchmarks.seed import seed_catalog
+
+    with benchmark_database() as connection:
+        if connection.vendor != "sqlite":
+            parser.error("workers can only share a SQLite benchmark database")
+        author_ids = seed_catalog(args.authors, args.authors * args.books_per_author)
+        user = User.objects.create(username="benchmark")
+        client = Client()
+        client.force_login(user)
+        credentials = {
+            "session": client.cookies.output(attrs=[], header="", sep=";").strip(),
+            "token": f"Token {Token.objects.create(user=user).key}",
+        }
+        url = f"/api/v1/authors/{author_ids[0]}"
+        environ = {
+            **os.environ,
+            # the session's user is checked against a hash of the secret key
+            "SECRET_KEY": settings.SECRET_KEY,
+            "DATABASE_URL": f"sqlite:///{connection.settings_dict['NAME']}",
+            "ALLOWED_HOSTS": "testserver",
+        }
+
+        def run(module, authentication, preload):
+            cookies = credentials["session"] if authentication == "session" else ""
+            authorization = credentials["token"] if authentication == "token" else ""
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.startup",
+                    "--requests",
+                    str(args.requests),
+                    "--worker",
+                    url,
+                    cookies,
+                    authorization,
+                ],
+                env={
+                    **environ,
+                    "DJANGO_SETTINGS_MODULE": module,
+                    "PRELOAD_AT_BOOT": preload,
+                },
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            return json.loads(output)
+
+        # profile -> measures of its workers, run in turns so that the
+        # machine's load varies alike for all of them
+        runs = {profile: [] for profile in PROFILES}
+        for _ in range(args.workers):
+            for profile, options in PROFILES.items():
+                runs[profile].append(run(*options))
+
+        print(
+            f"{'profile':>13} {'boot (ms)':>10} {'first (ms)':>11} {'modules':>8} "
+            f"{'p50 (ms)':>9} {'queries':>8}"
+        )
+        for profile, measures in runs.items():
+
+            def median(name):
+                return statistics.median(measure[name] for measure in measures)
+
+            print(
+                f"{profile:>13} {median('boot'):>10.1f} {median('first'):>11.1f} "
+                f"{median('modules'):>8.0f} {median('p50'):>9.3f} "
+                f"{median('queries'):>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class BooksConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "books"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from books import db, signals  # noqa: F401
+
+        # before any connection is opened
+        connection_created.connect(db.configure_sqlite)
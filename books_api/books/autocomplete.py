@@ -0,0 +1,207 @@
+"""
+In-process prefix index of author and book names, for typeahead.
+
+Names are normalized (case folded, accents removed) and the rest of the name
+from every word on is a key, so "bor" finds "Jorge Luis Borges". Keys are
+truncated to the longest prefix looked up (`MAX_PREFIX_LENGTH`), so a name
+costs at most that many characters per word. They're kept in one sorted list
+of plain strings per type, each ending with the object's slot, a small integer
+in hex standing for its id, and prefix lookups are a bisect followed by a
+short forward scan: no database access and no per-key objects besides the
+strings themselves.
+
+The index is built from the database on first use, updated from the model
+signals in `books.signals` once writes commit, and, when
+`AUTOCOMPLETE_REFRESH_INTERVAL` is set, rebuilt periodically to pick up the
+writes made by other processes.
+"""
+
+import bisect
+import heapq
+import threading
+import time
+import unicodedata
+import uuid
+
+from django.conf import settings
+
+SEPARATOR = "\x00"
+
+# the `q` of autocomplete requests is at most this long (see
+# api.serializers.AutocompleteQuerySerializer)
+MAX_PREFIX_LENGTH = 100
+
+TYPES = ("author", "book")
+
+
+def normalize(value):
+    value = unicodedata.normalize("NFKD", value.casefold())
+    return "".join(char for char in value if not unicodedata.combining(char))
+
+
+def normalize_words(value):
+    return " ".join(normalize(value).split())
+
+
+def name_keys(name, slot):
+    name = normalize_words(name)
+    suffix = f"{SEPARATOR}{slot:x}"
+    return {
+        name[start : start + MAX_PREFIX_LENGTH] + suffix
+        for start in range(len(name))
+        if start == 0 or name[start - 1] == " "
+    }
+
+
+class AutocompleteIndex:
+    def __init__(self, refresh_interval=None):
+        self.refresh_interval = refresh_interval
+        self.lock = threading.Lock()
+        self.build_lock = threading.Lock()
+        # type -> sorted keys
+        self.keys = {item_type: [] for item_type in TYPES}
+        # slot -> object id (as an integer) and name, None once removed
+        self.ids, self.names = [], []
+        # object id (as an integer) -> slot
+        self.slots = {}
+        # slots of removed objects, reused by the next ones added
+        self.free = []
+        self.built_at = None
+
+    def build(self, items):
+        """Replace the index with `items`, an iterable of `(type, id, name)`"""
+        keys = {item_type: [] for item_type in TYPES}
+        ids, names, slots = [], [], {}
+        for item_type, pk, name in items:
+            slots[pk.int] = slot = len(ids)
+            ids.append(pk.int)
+            names.append(name)
+            keys[item_type].extend(name_keys(name, slot))
+        for type_keys in keys.values():
+            type_keys.sort()
+
+        with self.lock:
+            self.keys, self.ids, self.names, self.slots = keys, ids, names, slots
+            self.free = []
+            self.built_at = time.monotonic()
+
+    def invalidate(self):
+        """Have the index rebuilt from the database on next use"""
+        self.built_at = None
+
+    def is_stale(self):
+        if self.built_at is None:
+            return True
+        return (
+            self.refresh_interval is not None
+            and time.monotonic() - self.built_at > self.refresh_interval
+        )
+
+    def update(self, items):
+        """Add or rename `items`, an iterable of `(type, id, name)`"""
+        if self.built_at is None:
+            # it will be built from the database on first use
+            return
+        with self.lock:
+            for item_type, pk, name in items:
+                slot = self.slots.get(pk.int)
+                if slot is not None:
+                    if self.names[slot] == name:
+                        continue
+                    self._remove_keys(slot)
+                elif self.free:
+                    slot = self.free.pop()
+                else:
+                    slot = len(self.ids)
+                    self.ids.append(None)
+                    self.names.append(None)
+                self.slots[pk.int] = slot
+                self.ids[slot], self.names[slot] = pk.int, name
+                for key in name_keys(name, slot):
+                    bisect.insort(self.keys[item_type], key)
+
+    def remove(self, pks):
+        if self.built_at is None:
+            return
+        with self.lock:
+            for pk in pks:
+                self._remove(pk)
+
+    def _remove(self, pk):
+        slot = self.slots.pop(pk.int, None)
+        if slot is None:
+            return
+        self._remove_keys(slot)
+        self.ids[slot] = self.names[slot] = None
+        self.free.append(slot)
+
+    def _remove_keys(self, slot):
+        for key in name_keys(self.names[slot], slot):
+            for keys in self.keys.values():
+                position = bisect.bisect_left(keys, key)
+                if position < len(keys) and keys[position] == key:
+                    del keys[position]
+
+    def complete(self, prefix, types=None, limit=10):
+        """
+        Return up to `limit` `(type, id, name)` whose name has a word starting
+        with `prefix`, ordered by the matching part of the name.
+        """
+        prefix = normalize_words(prefix)
+        if not prefix:
+            return []
+        # keys only hold the start of long names, check the rest on the names
+        truncated = len(prefix) > MAX_PREFIX_LENGTH
+
+        results, seen = [], set()
+        with self.lock:
+            matches = heapq.merge(
+                *(
+                    self.iter_prefix(
+                        self.keys[item_type], prefix[:MAX_PREFIX_LENGTH], item_type
+                    )
+                    for item_type in types or TYPES
+                )
+            )
+            for key, item_type in matches:
+                slot = int(key.rpartition(SEPARATOR)[2], 16)
+                if slot in seen:
+                    continue
+                seen.add(slot)
+                name = self.names[slot]
+                if truncated and f" {prefix}" not in f" {normalize_words(name)}":
+                    continue
+                results.append((item_type, uuid.UUID(int=self.ids[slot]), name))
+                if len(results) == limit:
+                    break
+        return results
+
+    @staticmethod
+    def iter_prefix(keys, prefix, item_type):
+        position = bisect.bisect_left(keys, prefix)
+        while position < len(keys) and keys[position].startswith(prefix):
+            yield keys[position], item_type
+            position += 1
+
+
+index = AutocompleteIndex()
+
+
+def iter_names():
+    from books.models import Author, Book
+
+    for model, item_type in ((Author, "author"), (Book, "book")):
+        queryset = model.objects.order_by().values_list("id", "name")
+        for pk, name in queryset.iterator(chunk_size=5000):
+            yield item_type, pk, name
+
+
+def get_index():
+    """Return the process' index, (re)building it when needed"""
+    index.refresh_interval = settings.AUTOCOMPLETE_REFRESH_INTERVAL
+    if index.is_stale():
+        # requests arriving meanwhile wait for the build instead of repeating it
+        with index.build_lock:
+            if index.is_stale():
+                index.build(iter_names())
+    return index
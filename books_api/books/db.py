@@ -0,0 +1,10 @@
+from django.conf import settings
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """Apply `SQLITE_PRAGMAS` to every new SQLite connection"""
+    if connection.vendor != "sqlite":
+        return
+    # on the DB-API connection: these aren't queries of the request opening it
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f"PRAGMA {name} = {value}")
@@ -0,0 +1,209 @@
+import csv
+import itertools
+import json
+import os
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from books.models import Author, Book, Collaborator
+from books.signals import bulk_saved
+
+
+class Command(BaseCommand):
+    help = (
+        "Import books from a CSV or newline-delimited JSON file with one book per "
+        "row: `author`, `book`, and optionally `publish_date`, `collaborators`, "
+        "`author_biography` and `author_birthday`. In CSV files collaborators are "
+        "separated by `|`. Authors and collaborators are matched by name and "
+        "created when missing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or NDJSON file to import")
+        parser.add_argument("--format", choices=("csv", "ndjson"))
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--checkpoint",
+            help="File recording the rows already imported, defaults to "
+            "`<path>.checkpoint`. The import resumes from it after a failure "
+            "and it's removed once the import completes.",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore any existing checkpoint and import from the first row",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError(f"Invalid --batch-size '{options['batch_size']}'")
+
+        path = options["path"]
+        file_format = options["format"] or (
+            "ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv"
+        )
+        checkpoint_path = options["checkpoint"] or f"{path}.checkpoint"
+        skip = 0 if options["restart"] else self.read_checkpoint(checkpoint_path)
+        if skip:
+            self.stdout.write(f"Resuming after row {skip}")
+
+        self.authors = dict(Author.objects.values_list("name", "id"))
+        self.collaborators = dict(Collaborator.objects.values_list("name", "id"))
+
+        start = time.perf_counter()
+        imported = 0
+        with open(path, newline="", encoding="utf-8") as source:
+            rows = self.read_rows(source, file_format)
+            rows = itertools.islice(rows, skip, None)
+            while batch := list(itertools.islice(rows, options["batch_size"])):
+                done = skip + imported
+
+                def write_pending(book_id):
+                    self.write_checkpoint(
+                        checkpoint_path,
+                        done,
+                        pending={"rows": done + len(batch), "book": str(book_id)},
+                    )
+
+                self.import_batch(
+                    batch, first_row=done + 1, before_commit=write_pending
+                )
+                imported += len(batch)
+                self.write_checkpoint(checkpoint_path, skip + imported)
+
+                rate = imported / (time.perf_counter() - start)
+                self.stdout.write(f"{skip + imported} rows ({rate:.0f} rows/sec)")
+
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {imported} rows in {elapsed:.1f}s "
+                f"({imported / elapsed if elapsed else 0:.0f} rows/sec)"
+            )
+        )
+
+    def read_rows(self, source, file_format):
+        if file_format == "ndjson":
+            lines = (line for line in source if line.strip())
+            for number, line in enumerate(lines, start=1):
+                try:
+                    yield json.loads(line)
+                except ValueError as exc:
+                    raise CommandError(f"Invalid row {number}: {exc!r}")
+        else:
+            for row in csv.DictReader(source):
+                collaborators = row.get("collaborators") or ""
+                row["collaborators"] = [
+                    name for name in collaborators.split("|") if name.strip()
+                ]
+                yield row
+
+    def import_batch(self, rows, first_row, before_commit=None):
+        """
+        Write a batch of rows in a single transaction. Lookup tables are only
+        updated once the transaction commits, so a failed batch leaves them
+        consistent with the database. `before_commit` is called with the id of
+        a book of the batch right before the transaction commits.
+        """
+        new_authors, new_collaborators = {}, {}
+        books, links = [], []
+
+        for number, row in enumerate(rows, start=first_row):
+            try:
+                author_name = row["author"].strip()
+                book_name = row["book"].strip()
+                if not author_name or not book_name:
+                    raise ValueError("`author` and `book` are required")
+
+                author_id = self.authors.get(author_name)
+                if author_id is None:
+                    if author_name not in new_authors:
+                        new_authors[author_name] = Author(
+                            name=author_name,
+                            biography=row.get("author_biography") or "",
+                            birthday=parse_date(row.get("author_birthday")),
+                        )
+                    author_id = new_authors[author_name].id
+
+                book = Book(
+                    author_id=author_id,
+                    name=book_name,
+                    publish_date=parse_date(row.get("publish_date")),
+                )
+                books.append(book)
+
+                for name in row.get("collaborators") or []:
+                    name = name.strip()
+                    collaborator_id = self.collaborators.get(name)
+                    if collaborator_id is None:
+                        if name not in new_collaborators:
+                            new_collaborators[name] = Collaborator(name=name)
+                        collaborator_id = new_collaborators[name].id
+                    links.append(
+                        Book.collaborators.through(
+                            book_id=book.id, collaborator_id=collaborator_id
+                        )
+                    )
+            except (KeyError, TypeError, ValueError, AttributeError) as exc:
+                raise CommandError(f"Invalid row {number}: {exc!r}")
+
+        with transaction.atomic():
+            Author.objects.bulk_create(new_authors.values())
+            Collaborator.objects.bulk_create(new_collaborators.values())
+            Book.objects.bulk_create(books)
+            Book.collaborators.through.objects.bulk_create(links, ignore_conflicts=True)
+
+            bulk_saved.send(
+                sender=Author, instances=list(new_authors.values()), created=True
+            )
+            bulk_saved.send(
+                sender=Collaborator,
+                instances=list(new_collaborators.values()),
+                created=True,
+            )
+            bulk_saved.send(sender=Book, instances=books, created=True)
+
+            if before_commit is not None:
+                before_commit(books[0].id)
+
+        self.authors.update((name, author.id) for name, author in new_authors.items())
+        self.collaborators.update(
+            (name, collaborator.id) for name, collaborator in new_collaborators.items()
+        )
+
+    def read_checkpoint(self, path):
+        """
+        Return the number of rows already imported. A checkpoint is written
+        before each batch commits, as `pending` along with one of its books,
+        and again once it did: should the import stop in between, the batch
+        was committed if and only if its book exists.
+        """
+        if not os.path.exists(path):
+            return 0
+        with open(path) as checkpoint:
+            checkpoint = json.load(checkpoint)
+        pending = checkpoint.get("pending")
+        if pending and Book.objects.filter(pk=pending["book"]).exists():
+            return pending["rows"]
+        return checkpoint["rows"]
+
+    def write_checkpoint(self, path, rows, pending=None):
+        data = {"rows": rows}
+        if pending is not None:
+            data["pending"] = pending
+        # write then rename, so a crash can't leave a truncated checkpoint
+        with open(f"{path}.tmp", "w") as checkpoint:
+            json.dump(data, checkpoint)
+        os.replace(f"{path}.tmp", path)
+
+
+def parse_date(value):
+    if value is None or value == "":
+        return None
+    return date.fromisoformat(value)
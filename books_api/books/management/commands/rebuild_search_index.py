@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from books import search
+from books.models import Author, Book, Collaborator
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the full-text search index of authors, books and collaborators "
+        "from scratch. Searches keep seeing the previous index until the rebuild "
+        "commits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        backend = search.get_backend()
+        if backend is None:
+            raise CommandError("The database has no supported full-text engine")
+
+        start = time.perf_counter()
+        backend.create()
+        count = search.rebuild(
+            backend, Author, Book, Collaborator, options["batch_size"]
+        )
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(f"Indexed {count} documents in {elapsed:.1f}s")
+        )
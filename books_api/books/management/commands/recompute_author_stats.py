@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from books.models import Author, book_count_subquery, latest_publish_date_subquery
+
+
+class Command(BaseCommand):
+    help = (
+        "Repair drift in the authors' denormalized `book_count` and "
+        "`latest_publish_date` by recomputing them from their books. Only the "
+        "authors whose stats differ are written."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the authors whose stats have drifted",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        authors = Author.objects.annotate(
+            actual_book_count=book_count_subquery(),
+            actual_latest_publish_date=latest_publish_date_subquery(),
+        ).values_list(
+            "id",
+            "book_count",
+            "latest_publish_date",
+            "actual_book_count",
+            "actual_latest_publish_date",
+        )
+
+        checked, drifted = 0, []
+        for pk, count, latest, actual_count, actual_latest in authors.iterator(
+            chunk_size=options["batch_size"]
+        ):
+            checked += 1
+            if (count, latest) != (actual_count, actual_latest):
+                drifted.append(pk)
+
+        if not options["dry_run"]:
+            # recomputed in the database, so writes made since the check count
+            batch_size = options["batch_size"]
+            for offset in range(0, len(drifted), batch_size):
+                Author.objects.filter(
+                    pk__in=drifted[offset : offset + batch_size]
+                ).recompute_stats()
+
+        elapsed = time.perf_counter() - start
+        action = "Found" if options["dry_run"] else "Repaired"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{action} {len(drifted)} of {checked} authors with drifted stats "
+                f"in {elapsed:.1f}s"
+            )
+        )
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("books", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="author",
+            index=models.Index(fields=["name", "id"], name="author_name_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(fields=["author", "name"], name="book_author_name_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="collaborator",
+            index=models.Index(fields=["name"], name="collaborator_name_idx"),
+        ),
+    ]
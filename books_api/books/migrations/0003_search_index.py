@@ -0,0 +1,32 @@
+from django.db import migrations
+
+from books import search
+
+
+def create_search_index(apps, schema_editor):
+    backend = search.get_backend(schema_editor.connection)
+    if backend is None:
+        return
+    backend.create()
+    search.rebuild(
+        backend,
+        apps.get_model("books", "Author"),
+        apps.get_model("books", "Book"),
+        apps.get_model("books", "Collaborator"),
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    backend = search.get_backend(schema_editor.connection)
+    if backend is not None:
+        backend.drop()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("books", "0002_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:50
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def compute_author_stats(apps, schema_editor):
+    Author = apps.get_model("books", "Author")
+    Book = apps.get_model("books", "Book")
+
+    books = Book.objects.filter(author_id=OuterRef("pk")).order_by()
+    books = books.values("author_id")
+    Author.objects.update(
+        book_count=Coalesce(
+            Subquery(books.annotate(count=Count("id")).values("count")), 0
+        ),
+        latest_publish_date=Subquery(
+            books.annotate(latest=Max("publish_date")).values("latest")
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("books", "0003_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="author",
+            name="book_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="author",
+            name="latest_publish_date",
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="author",
+            index=models.Index(
+                fields=["book_count", "id"], name="author_book_count_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="author",
+            index=models.Index(
+                fields=["latest_publish_date", "id"], name="author_latest_publish_idx"
+            ),
+        ),
+        migrations.RunPython(compute_author_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("books", "0004_author_stats"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="author",
+            index=models.Index(fields=["birthday", "id"], name="author_birthday_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="author",
+            index=models.Index(fields=["created", "id"], name="author_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="author",
+            index=models.Index(fields=["modified", "id"], name="author_modified_idx"),
+        ),
+    ]
@@ -1,6 +1,8 @@
 import uuid
 
 from django.db import models
+from django.db.models import Count, Max
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from model_utils.models import TimeStampedModel
 
@@ -17,11 +19,96 @@ class BaseModel(TimeStampedModel, UUIDModelMixin):
         abstract = True
 
 
+def books_prefetch():
+    """Prefetch of the authors' books ordered by name into `ordered_books`"""
+    return models.Prefetch(
+        "books", queryset=Book.objects.order_by("name"), to_attr="ordered_books"
+    )
+
+
+def _author_books():
+    return (
+        Book.objects.filter(author_id=models.OuterRef("pk"))
+        .order_by()
+        .values("author_id")
+    )
+
+
+def book_count_subquery():
+    """Number of books of the outer author"""
+    books = _author_books().annotate(count=Count("id")).values("count")
+    return Coalesce(models.Subquery(books), 0)
+
+
+def latest_publish_date_subquery():
+    """Latest publish date of the outer author's books"""
+    books = _author_books().annotate(latest=Max("publish_date")).values("latest")
+    return models.Subquery(books)
+
+
+class AuthorQuerySet(models.QuerySet):
+    def with_books(self):
+        """Prefetch each author's books ordered by name in a single query"""
+        return self.prefetch_related(books_prefetch())
+
+    def recompute_stats(self):
+        """Recompute the denormalized book stats of the authors from their books"""
+        return self.update(
+            book_count=book_count_subquery(),
+            latest_publish_date=latest_publish_date_subquery(),
+        )
+
+
+class BookQuerySet(models.QuerySet):
+    def with_relations(self):
+        """
+        Join each book's author and prefetch its collaborators ordered by name,
+        so any number of books is fetched with two queries.
+        """
+        return self.select_related("author").prefetch_related(
+            models.Prefetch(
+                "collaborators", queryset=Collaborator.objects.order_by("name", "id")
+            )
+        )
+
+
 class Author(BaseModel):
     name = models.CharField(max_length=1500)
     biography = models.TextField(blank=True)
     birthday = models.DateField(blank=True, null=True)
 
+    # denormalized from the author's books by `books.signals`
+    book_count = models.PositiveIntegerField(default=0, editable=False)
+    latest_publish_date = models.DateField(blank=True, null=True, editable=False)
+
+    objects = AuthorQuerySet.as_manager()
+
+    # never written back from instances, which may hold stale values
+    DENORMALIZED_FIELDS = ("book_count", "latest_publish_date")
+
+    class Meta:
+        indexes = [
+            # `id` is the tiebreaker of the list ordering and cursor pagination
+            models.Index(fields=["name", "id"], name="author_name_idx"),
+            models.Index(fields=["book_count", "id"], name="author_book_count_idx"),
+            models.Index(
+                fields=["latest_publish_date", "id"],
+                name="author_latest_publish_idx",
+            ),
+            models.Index(fields=["birthday", "id"], name="author_birthday_idx"),
+            models.Index(fields=["created", "id"], name="author_created_idx"),
+            models.Index(fields=["modified", "id"], name="author_modified_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.DENORMALIZED_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     @property
     def age(self):
         return int((timezone.now().date() - self.birthday).days / 365)
@@ -33,10 +120,19 @@ class Author(BaseModel):
 class Collaborator(BaseModel):
     name = models.CharField(max_length=1500)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["name"], name="collaborator_name_idx"),
+        ]
+
     def __str__(self):
         return f"{self.name}"
 
 
+# `Book.loaded_author_id` of books whose author wasn't loaded
+NOT_LOADED = object()
+
+
 class Book(BaseModel):
     author = models.ForeignKey(
         "books.Author", on_delete=models.CASCADE, related_name="books"
@@ -47,5 +143,33 @@ class Book(BaseModel):
     name = models.CharField(max_length=1500)
     publish_date = models.DateField(blank=True, null=True)
 
+    objects = BookQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # serves the per-author books fetch ordered by name
+            models.Index(fields=["author", "name"], name="book_author_name_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_author_id = instance.__dict__.get("author_id", NOT_LOADED)
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # `post_save` receivers have seen the previous value by now
+        self._loaded_author_id = self.author_id
+
+    @property
+    def loaded_author_id(self):
+        """
+        Id of the author the book had when it was loaded from, or last saved
+        to, the database, `NOT_LOADED` when unknown (e.g. `author_id` was
+        deferred)
+        """
+        return getattr(self, "_loaded_author_id", NOT_LOADED)
+
     def __str__(self):
         return f"{self.name}"
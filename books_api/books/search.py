@@ -0,0 +1,270 @@
+"""
+Full-text search index over authors, books and collaborators.
+
+Every indexed object is a `Document`: its type, id, a `title` (the name) and a
+`body` (the author's biography). Documents live in a single `books_search`
+table maintained by the database's own full-text engine, SQLite FTS5 or
+Postgres `tsvector`, behind the `SearchBackend` interface. The index is kept
+up to date by the receivers in `books.signals` and can be rebuilt from scratch
+with the `rebuild_search_index` command.
+
+Matches in the title weigh more than matches in the body, and the last term of
+a query matches as a prefix, so results are relevant while the user types.
+"""
+
+import itertools
+import re
+from collections import namedtuple
+
+from django.db import connections, router, transaction
+
+TABLE = "books_search"
+
+# relevance weight of a match in the title over a match in the body
+TITLE_WEIGHT = 10
+
+Document = namedtuple("Document", ("type", "id", "title", "body"))
+SearchResult = namedtuple("SearchResult", ("type", "id", "name", "score"))
+
+
+def author_document(author):
+    return Document("author", author.id, author.name, author.biography)
+
+
+def book_document(book):
+    return Document("book", book.id, book.name, "")
+
+
+def collaborator_document(collaborator):
+    return Document("collaborator", collaborator.id, collaborator.name, "")
+
+
+def document_rowid(pk):
+    """Integer key of the document of the object with given UUID"""
+    # UUID4s are random, so their low 63 bits are a collision-free key in
+    # practice and keep the rowid within SQLite's signed 64-bit integers
+    return pk.int & ((1 << 63) - 1)
+
+
+def query_terms(query):
+    return re.findall(r"\w+", query.lower())
+
+
+class SearchBackend:
+    vendor = None
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def create(self):
+        raise NotImplementedError
+
+    def drop(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+    def clear(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TABLE}")
+
+    def index(self, documents):
+        """Add or replace the given documents"""
+        raise NotImplementedError
+
+    def remove(self, pks):
+        """Remove the documents of the objects with given ids"""
+        rowids = [(document_rowid(pk),) for pk in pks]
+        if rowids:
+            with self.connection.cursor() as cursor:
+                cursor.executemany(f"DELETE FROM {TABLE} WHERE rowid = %s", rowids)
+
+    def search(self, query, types=None, limit=20, offset=0):
+        """
+        Return the `SearchResult`s matching `query`, most relevant first,
+        optionally restricted to the given document types.
+        """
+        raise NotImplementedError
+
+    def optimize(self):
+        """Compact the index after a rebuild"""
+
+
+class SQLiteSearchBackend(SearchBackend):
+    vendor = "sqlite"
+
+    def create(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+                "type UNINDEXED, object_id UNINDEXED, title, body, "
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+
+    def index(self, documents):
+        rows = [
+            (document_rowid(pk), document_type, str(pk), title, body)
+            for document_type, pk, title, body in documents
+        ]
+        if not rows:
+            return
+        with self.connection.cursor() as cursor:
+            # FTS5 replaces the document with the same rowid
+            cursor.executemany(
+                f"INSERT OR REPLACE INTO {TABLE} (rowid, type, object_id, title, body) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                rows,
+            )
+
+    def search(self, query, types=None, limit=20, offset=0):
+        terms = query_terms(query)
+        if not terms:
+            return []
+
+        # quote every term so that FTS5 operators in the query are ignored
+        match = " ".join(f'"{term}"' for term in terms) + "*"
+        sql = (
+            f"SELECT type, object_id, title, bm25({TABLE}, 0, 0, %s, 1) AS score "
+            f"FROM {TABLE} WHERE {TABLE} MATCH %s"
+        )
+        params = [TITLE_WEIGHT, match]
+        if types:
+            sql += f" AND type IN ({', '.join(['%s'] * len(types))})"
+            params += types
+        sql += " ORDER BY score LIMIT %s OFFSET %s"
+        params += [limit, offset]
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            # bm25 scores are lower for better matches
+            return [
+                SearchResult(document_type, pk, name, -score)
+                for document_type, pk, name, score in cursor.fetchall()
+            ]
+
+    def optimize(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {TABLE} ({TABLE}) VALUES ('optimize')")
+
+
+class PostgresSearchBackend(SearchBackend):
+    vendor = "postgresql"
+
+    # language agnostic: names are not stemmed
+    config = "simple"
+
+    def create(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {TABLE} ("
+                "rowid bigint PRIMARY KEY, "
+                "type varchar(20) NOT NULL, "
+                "object_id uuid NOT NULL, "
+                "title text NOT NULL, "
+                "body text NOT NULL, "
+                "document tsvector GENERATED ALWAYS AS ("
+                f"setweight(to_tsvector('{self.config}', title), 'A') || "
+                f"setweight(to_tsvector('{self.config}', body), 'D')"
+                ") STORED)"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {TABLE}_document_idx "
+                f"ON {TABLE} USING gin (document)"
+            )
+
+    def index(self, documents):
+        rows = [
+            (document_rowid(pk), document_type, pk, title, body)
+            for document_type, pk, title, body in documents
+        ]
+        if not rows:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (rowid, type, object_id, title, body) "
+                "VALUES (%s, %s, %s, %s, %s) "
+                "ON CONFLICT (rowid) DO UPDATE SET type = EXCLUDED.type, "
+                "object_id = EXCLUDED.object_id, title = EXCLUDED.title, "
+                "body = EXCLUDED.body",
+                rows,
+            )
+
+    def search(self, query, types=None, limit=20, offset=0):
+        terms = query_terms(query)
+        if not terms:
+            return []
+
+        # `\w` terms carry no tsquery operators, the last one matches a prefix
+        tsquery = " & ".join(terms) + ":*"
+        # weights of the D, C, B and A labels, title matches are labelled A
+        weights = f"{{{1 / TITLE_WEIGHT}, 0, 0, 1}}"
+        sql = (
+            "SELECT type, object_id, title, "
+            "ts_rank(%s::float4[], document, query) AS score "
+            f"FROM {TABLE}, to_tsquery('{self.config}', %s) query "
+            "WHERE document @@ query"
+        )
+        params = [weights, tsquery]
+        if types:
+            sql += " AND type = ANY(%s)"
+            params.append(list(types))
+        sql += " ORDER BY score DESC LIMIT %s OFFSET %s"
+        params += [limit, offset]
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [
+                SearchResult(document_type, str(pk), name, score)
+                for document_type, pk, name, score in cursor.fetchall()
+            ]
+
+    def optimize(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {TABLE}")
+
+
+BACKENDS = {
+    backend.vendor: backend for backend in (SQLiteSearchBackend, PostgresSearchBackend)
+}
+
+
+def get_backend(connection=None):
+    """
+    Return the search backend of `connection`, by default the database the
+    books are written to, or None when its database has no supported
+    full-text engine.
+    """
+    if connection is None:
+        from books.models import Book
+
+        connection = connections[router.db_for_write(Book)]
+    backend = BACKENDS.get(connection.vendor)
+    return backend(connection) if backend is not None else None
+
+
+def rebuild(backend, author_model, book_model, collaborator_model, batch_size=2000):
+    """
+    Replace the whole index with the documents of every indexed object, in a
+    single transaction so searches keep seeing the previous index until then.
+    """
+    documents = iter_documents(author_model, book_model, collaborator_model)
+    count = 0
+    with transaction.atomic(using=backend.connection.alias):
+        backend.clear()
+        while batch := list(itertools.islice(documents, batch_size)):
+            backend.index(batch)
+            count += len(batch)
+        backend.optimize()
+    return count
+
+
+def iter_documents(author_model, book_model, collaborator_model, chunk_size=2000):
+    """Yield the documents of every indexed object"""
+    models = (
+        (author_model, ("id", "name", "biography"), author_document),
+        (book_model, ("id", "name"), book_document),
+        (collaborator_model, ("id", "name"), collaborator_document),
+    )
+    for model, fields, to_document in models:
+        queryset = model.objects.only(*fields).order_by()
+        for instance in queryset.iterator(chunk_size=chunk_size):
+            yield to_document(instance)
@@ -0,0 +1,178 @@
+from django.db import transaction
+from django.db.models import F, QuerySet, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from books import autocomplete, search
+from books.models import (
+    NOT_LOADED,
+    Author,
+    Book,
+    Collaborator,
+    latest_publish_date_subquery,
+)
+
+# Sent after instances of `sender` are written with `bulk_create` or
+# `bulk_update`, which don't send `post_save`. Receives `instances`, the list
+# of instances written, and `created`.
+bulk_saved = Signal()
+
+
+def deleted_with_author(origin):
+    """
+    Whether the deletion started from `origin` (the `origin` of `post_delete`)
+    is the one of authors, which cascades to their books: the receivers of the
+    books' deletions then have nothing to update on their authors.
+    """
+    if isinstance(origin, QuerySet):
+        return origin.model is Author
+    return isinstance(origin, Author)
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def touch_author(sender, instance, created=False, **kwargs):
+    """
+    Bump the `modified` timestamp of the author that lost a book, either
+    because it was deleted or moved to another author, so that the author's
+    Last-Modified reflects it.
+    """
+    if kwargs["signal"] is post_delete:
+        if deleted_with_author(kwargs["origin"]):
+            return
+        author_id = instance.author_id
+    elif not created and instance.loaded_author_id not in (
+        instance.author_id,
+        NOT_LOADED,
+    ):
+        author_id = instance.loaded_author_id
+    else:
+        return
+
+    Author.objects.filter(pk=author_id).update(modified=timezone.now())
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def update_author_stats(sender, instance, created=False, **kwargs):
+    """
+    Keep the authors' denormalized `book_count` and `latest_publish_date`
+    current. Counts are adjusted with F() expressions in the same transaction
+    as the book write, so concurrent writes can't lose updates.
+    """
+    if created:
+        add_books(instance.author_id, 1, [instance.publish_date])
+    elif kwargs["signal"] is post_delete:
+        if not deleted_with_author(kwargs["origin"]):
+            add_books(instance.author_id, -1)
+    elif instance.loaded_author_id in (instance.author_id, NOT_LOADED):
+        # the publish date may have changed, or whether the author did isn't
+        # known: the book was loaded without it
+        Author.objects.filter(pk=instance.author_id).recompute_stats()
+    else:
+        add_books(instance.loaded_author_id, -1)
+        add_books(instance.author_id, 1)
+
+
+@receiver(bulk_saved, sender=Book)
+def update_bulk_authors_stats(sender, instances, **kwargs):
+    # a single statement however many authors the batch touches
+    author_ids = {book.author_id for book in instances}
+    if author_ids:
+        Author.objects.filter(pk__in=author_ids).recompute_stats()
+
+
+def add_books(author_id, count, publish_dates=None):
+    """
+    Add `count` (possibly negative) books to the author's stats. The latest
+    publish date is bumped to the latest of `publish_dates` when given, and
+    recomputed from the remaining books otherwise.
+    """
+    if publish_dates is None:
+        latest_publish_date = latest_publish_date_subquery()
+    else:
+        latest = max(filter(None, publish_dates), default=None)
+        latest_publish_date = F("latest_publish_date")
+        if latest is not None:
+            latest_publish_date = Greatest(
+                Coalesce(latest_publish_date, Value(latest)), Value(latest)
+            )
+
+    Author.objects.filter(pk=author_id).update(
+        # a count that drifted (e.g. books inserted without signals) must not
+        # break deletes on the column's CHECK constraint
+        book_count=Greatest(F("book_count") + count, Value(0)),
+        latest_publish_date=latest_publish_date,
+    )
+
+
+SEARCH_DOCUMENTS = {
+    Author: search.author_document,
+    Book: search.book_document,
+    Collaborator: search.collaborator_document,
+}
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=Book)
+@receiver(post_save, sender=Collaborator)
+def index_instance(sender, instance, **kwargs):
+    index_instances(sender, [instance])
+
+
+@receiver(bulk_saved, sender=Author)
+@receiver(bulk_saved, sender=Book)
+@receiver(bulk_saved, sender=Collaborator)
+def index_instances(sender, instances, **kwargs):
+    backend = search.get_backend()
+    if backend is not None:
+        backend.index(map(SEARCH_DOCUMENTS[sender], instances))
+
+
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=Book)
+@receiver(post_delete, sender=Collaborator)
+def unindex_instance(sender, instance, **kwargs):
+    if sender is Book and deleted_with_author(kwargs["origin"]):
+        # removed along with the other books of the author (see below)
+        return
+    backend = search.get_backend()
+    if backend is not None:
+        backend.remove([instance.pk])
+
+
+@receiver(pre_delete, sender=Author)
+def unindex_author_books(sender, instance, **kwargs):
+    # a single statement for the books cascading from the author, in the
+    # deletion's transaction
+    backend = search.get_backend()
+    if backend is not None:
+        backend.remove(
+            Book.objects.filter(author=instance).values_list("pk", flat=True)
+        )
+
+
+AUTOCOMPLETE_TYPES = {Author: "author", Book: "book"}
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=Book)
+def autocomplete_instance(sender, instance, **kwargs):
+    autocomplete_instances(sender, [instance])
+
+
+@receiver(bulk_saved, sender=Author)
+@receiver(bulk_saved, sender=Book)
+def autocomplete_instances(sender, instances, **kwargs):
+    # the index is shared by the whole process, so only committed names go in
+    items = [(AUTOCOMPLETE_TYPES[sender], obj.pk, obj.name) for obj in instances]
+    transaction.on_commit(lambda: autocomplete.index.update(items))
+
+
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=Book)
+def unautocomplete_instance(sender, instance, **kwargs):
+    pks = [instance.pk]
+    transaction.on_commit(lambda: autocomplete.index.remove(pks))
@@ -0,0 +1,170 @@
+import uuid
+from django.test import TestCase, override_settings
+from freezegun import freeze_time
+
+from books import autocomplete
+from books.models import Author, Book
+from books.signals import bulk_saved
+from books.tests.fixtures import AuthorFactory, BookFactory
+
+
+class AutocompleteIndexTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.index = autocomplete.AutocompleteIndex()
+        self.borges = uuid.uuid4()
+        self.aleph = uuid.uuid4()
+        self.index.build(
+            [
+                ("author", self.borges, "Jorge Luis Borges"),
+                ("author", uuid.uuid4(), "J. K. Rowling"),
+                ("book", self.aleph, "El Aleph"),
+            ]
+        )
+
+    def test_complete(self):
+        """Should match the start of any word, ignoring case and accents"""
+        self.assertEqual(
+            self.index.complete("BÓR"), [("author", self.borges, "Jorge Luis Borges")]
+        )
+        self.assertEqual(
+            self.index.complete("jorge  luis b"),
+            [("author", self.borges, "Jorge Luis Borges")],
+        )
+        self.assertEqual(self.index.complete("orges"), [])
+        self.assertEqual(self.index.complete("  "), [])
+
+    def test_complete_order_and_limit(self):
+        """Should order matches by name, each object once, up to the limit"""
+        book = uuid.uuid4()
+        self.index.update([("book", book, "Jorge and Jorge")])
+
+        self.assertEqual(
+            [name for _, _, name in self.index.complete("j")],
+            ["J. K. Rowling", "Jorge and Jorge", "Jorge Luis Borges"],
+        )
+        self.assertEqual(len(self.index.complete("j", limit=2)), 2)
+
+    def test_complete_types(self):
+        """Should only return objects of the given types"""
+        self.assertEqual(self.index.complete("el", types=["author"]), [])
+        self.assertEqual(
+            self.index.complete("el", types=["book"]),
+            [("book", self.aleph, "El Aleph")],
+        )
+
+    def test_update_and_remove(self):
+        """Should replace the keys of renamed objects and drop removed ones"""
+        self.index.update([("book", self.aleph, "Ficciones")])
+        self.assertEqual(self.index.complete("aleph"), [])
+        self.assertEqual(
+            self.index.complete("fic"), [("book", self.aleph, "Ficciones")]
+        )
+
+        self.index.remove([self.aleph])
+        self.assertEqual(self.index.complete("fic"), [])
+        self.assertEqual(sum(map(len, self.index.keys.values())), 6)
+
+    def test_update_reuses_slots(self):
+        """Should keep the slot of updated objects and reuse removed ones"""
+        for name in ("Ficciones", "Ficciones", "El Aleph"):
+            self.index.update([("book", self.aleph, name)])
+        self.assertEqual(len(self.index.ids), 3)
+
+        self.index.remove([self.aleph])
+        book = uuid.uuid4()
+        self.index.update([("book", book, "Ficciones")])
+
+        self.assertEqual(len(self.index.ids), 3)
+        self.assertEqual(self.index.complete("el"), [])
+        self.assertEqual(self.index.complete("fic"), [("book", book, "Ficciones")])
+
+    def test_long_names(self):
+        """Should keep keys of at most the longest prefix looked up"""
+        words = [f"word{i:03}" for i in range(250)]
+        book = uuid.uuid4()
+        self.index.update([("book", book, " ".join(words))])
+
+        self.assertLessEqual(
+            max(
+                len(key.partition(autocomplete.SEPARATOR)[0])
+                for key in self.index.keys["book"]
+            ),
+            autocomplete.MAX_PREFIX_LENGTH,
+        )
+        self.assertEqual(self.index.complete("word249")[0][1], book)
+        # longer than the keys, the rest is checked on the name
+        self.assertEqual(self.index.complete(" ".join(words[10:30]))[0][1], book)
+        self.assertEqual(self.index.complete(" ".join(words[10:29] + ["x"])), [])
+
+    def test_refresh_interval(self):
+        """Should be stale once the refresh interval is over"""
+        with freeze_time("2023-01-20T10:00:00") as frozen:
+            index = autocomplete.AutocompleteIndex(refresh_interval=60)
+            self.assertTrue(index.is_stale())
+            index.build([])
+            self.assertFalse(index.is_stale())
+            frozen.tick(61)
+            self.assertTrue(index.is_stale())
+
+
+class AutocompleteSignalsTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        autocomplete.index.invalidate()
+        self.addCleanup(autocomplete.index.invalidate)
+        self.author_1 = AuthorFactory(name="Jorge Luis Borges")
+
+    def complete(self, prefix):
+        return [pk for _, pk, _ in autocomplete.get_index().complete(prefix)]
+
+    def test_build_from_database(self):
+        """Should load the names of every author and book on first use"""
+        book = BookFactory(author=self.author_1, name="El Aleph")
+
+        with self.assertNumQueries(2):
+            self.assertEqual(self.complete("borg"), [self.author_1.id])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.complete("alep"), [book.id])
+
+    def test_signals(self):
+        """Should apply committed saves and deletes to the built index"""
+        self.assertEqual(self.complete("borg"), [self.author_1.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            book = BookFactory(author=self.author_1, name="El Aleph")
+            self.author_1.name = "J. L. Borges"
+            self.author_1.save()
+        self.assertEqual(self.complete("alep"), [book.id])
+        self.assertEqual(self.complete("jorge"), [])
+        self.assertEqual(self.complete("j. l"), [self.author_1.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            book.delete()
+        self.assertEqual(self.complete("alep"), [])
+
+    def test_signals_not_committed(self):
+        """Should leave the index untouched until writes commit"""
+        self.assertEqual(self.complete("borg"), [self.author_1.id])
+
+        with self.captureOnCommitCallbacks(execute=False):
+            AuthorFactory(name="Adolfo Bioy Casares")
+        self.assertEqual(self.complete("bioy"), [])
+
+    def test_bulk_saved(self):
+        """Should apply names written in bulk"""
+        self.assertEqual(self.complete("borg"), [self.author_1.id])
+        author = Author(name="Adolfo Bioy Casares")
+        Author.objects.bulk_create([author])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_saved.send(sender=Author, instances=[author], created=True)
+        self.assertEqual(self.complete("bioy"), [author.id])
+
+    @override_settings(AUTOCOMPLETE_REFRESH_INTERVAL=0)
+    def test_refresh_interval(self):
+        """Should pick up names written by other processes once stale"""
+        self.assertEqual(self.complete("borg"), [self.author_1.id])
+        Book.objects.bulk_create([Book(author=self.author_1, name="Ficciones")])
+
+        self.assertEqual(len(self.complete("fic")), 1)
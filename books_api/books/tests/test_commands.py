@@ -0,0 +1,199 @@
+import json
+import os
+import tempfile
+from datetime import date
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from books.management.commands.import_catalog import Command
+from books.models import Author, Book, Collaborator
+from books.tests.fixtures import AuthorFactory, BookFactory, CollaboratorFactory
+
+CSV_ROWS = """author,book,publish_date,collaborators,author_birthday
+Jorge Luis Borges,El Aleph,1949-01-01,Collaborator 1|Collaborator 2,1899-08-24
+Jorge Luis Borges,Ficciones,1944-01-01,,
+J. K. Rowling,Harry Potter and the sorcerer's stone,,Collaborator 2,
+New author,New book,2000-01-01,New collaborator,
+"""
+
+
+class ImportCatalogTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.author_1 = AuthorFactory(name="J. K. Rowling")
+        self.collaborator_1 = CollaboratorFactory(name="Collaborator 1")
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "w") as source:
+            source.write(content)
+        return path
+
+    def test_import_csv(self):
+        """Should import books, matching authors and collaborators by name"""
+        path = self.write("catalog.csv", CSV_ROWS)
+
+        call_command("import_catalog", path, batch_size=2, stdout=StringIO())
+
+        self.assertEqual(
+            sorted(Author.objects.values_list("name", flat=True)),
+            ["J. K. Rowling", "Jorge Luis Borges", "New author"],
+        )
+        self.assertEqual(Collaborator.objects.count(), 3)
+        self.assertEqual(Book.objects.count(), 4)
+
+        borges = Author.objects.get(name="Jorge Luis Borges")
+        self.assertEqual(borges.birthday, date(1899, 8, 24))
+        self.assertEqual(borges.books.count(), 2)
+
+        aleph = Book.objects.get(name="El Aleph")
+        self.assertEqual(aleph.publish_date, date(1949, 1, 1))
+        self.assertEqual(
+            sorted(aleph.collaborators.values_list("name", flat=True)),
+            ["Collaborator 1", "Collaborator 2"],
+        )
+        self.assertEqual(
+            Book.objects.get(author=self.author_1).collaborators.get().name,
+            "Collaborator 2",
+        )
+        self.assertFalse(os.path.exists(f"{path}.checkpoint"))
+
+    def test_import_ndjson(self):
+        """Should import books from newline-delimited JSON"""
+        rows = [
+            {"author": "J. K. Rowling", "book": "Book 1", "collaborators": []},
+            {"author": "New author", "book": "Book 2", "publish_date": "2000-01-01"},
+        ]
+        path = self.write("catalog.ndjson", "\n".join(map(json.dumps, rows)))
+
+        call_command("import_catalog", path, stdout=StringIO())
+
+        self.assertEqual(Author.objects.count(), 2)
+        self.assertEqual(
+            sorted(Book.objects.values_list("author__name", "name")),
+            [("J. K. Rowling", "Book 1"), ("New author", "Book 2")],
+        )
+
+    def test_import_invalid_json(self):
+        """Should report the row of an NDJSON file that isn't valid JSON"""
+        rows = [
+            json.dumps({"author": "New author", "book": "Book 1"}),
+            "",
+            '{"author": "New author", "book": ',
+        ]
+        path = self.write("catalog.ndjson", "\n".join(rows))
+
+        with self.assertRaisesMessage(CommandError, "Invalid row 2"):
+            call_command("import_catalog", path, stdout=StringIO())
+
+        self.assertEqual(Book.objects.count(), 0)
+
+    def test_import_invalid_batch_size(self):
+        """Should reject a batch size below 1, keeping the checkpoint"""
+        path = self.write("catalog.csv", CSV_ROWS)
+        self.write("catalog.csv.checkpoint", json.dumps({"rows": 2}))
+
+        with self.assertRaisesMessage(CommandError, "Invalid --batch-size '0'"):
+            call_command("import_catalog", path, batch_size=0, stdout=StringIO())
+
+        self.assertEqual(Book.objects.count(), 0)
+        self.assertTrue(os.path.exists(f"{path}.checkpoint"))
+
+    def test_import_resume(self):
+        """Should resume a failed import from the last imported batch"""
+        invalid = CSV_ROWS.replace("New author,New book,2000-01-01", ",New book,")
+        path = self.write("catalog.csv", invalid)
+
+        with self.assertRaisesMessage(CommandError, "Invalid row 4"):
+            call_command("import_catalog", path, batch_size=2, stdout=StringIO())
+
+        self.assertEqual(Book.objects.count(), 2)
+        with open(f"{path}.checkpoint") as checkpoint:
+            self.assertEqual(json.load(checkpoint), {"rows": 2})
+
+        self.write("catalog.csv", CSV_ROWS)
+        stdout = StringIO()
+        call_command("import_catalog", path, batch_size=2, stdout=stdout)
+
+        self.assertIn("Resuming after row 2", stdout.getvalue())
+        self.assertEqual(Book.objects.count(), 4)
+        self.assertEqual(Author.objects.filter(name="Jorge Luis Borges").count(), 1)
+        self.assertFalse(os.path.exists(f"{path}.checkpoint"))
+
+    def test_import_resume_after_commit(self):
+        """Should not import again a batch committed before its checkpoint"""
+        path = self.write("catalog.csv", CSV_ROWS)
+        write_checkpoint = Command.write_checkpoint
+
+        def crash_after_commit(command, path, rows, pending=None):
+            if rows == 4 and pending is None:
+                raise KeyboardInterrupt
+            write_checkpoint(command, path, rows, pending)
+
+        with mock.patch.object(Command, "write_checkpoint", crash_after_commit):
+            with self.assertRaises(KeyboardInterrupt):
+                call_command("import_catalog", path, batch_size=2, stdout=StringIO())
+        self.assertEqual(Book.objects.count(), 4)
+
+        stdout = StringIO()
+        call_command("import_catalog", path, batch_size=2, stdout=stdout)
+
+        self.assertIn("Resuming after row 4", stdout.getvalue())
+        self.assertEqual(Book.objects.count(), 4)
+        self.assertFalse(os.path.exists(f"{path}.checkpoint"))
+
+    def test_import_resume_before_commit(self):
+        """Should import again a batch whose transaction didn't commit"""
+        path = self.write("catalog.csv", CSV_ROWS)
+        write_checkpoint = Command.write_checkpoint
+
+        def crash_before_commit(command, path, rows, pending=None):
+            write_checkpoint(command, path, rows, pending)
+            if pending is not None and pending["rows"] == 4:
+                raise KeyboardInterrupt
+
+        with mock.patch.object(Command, "write_checkpoint", crash_before_commit):
+            with self.assertRaises(KeyboardInterrupt):
+                call_command("import_catalog", path, batch_size=2, stdout=StringIO())
+        self.assertEqual(Book.objects.count(), 2)
+
+        stdout = StringIO()
+        call_command("import_catalog", path, batch_size=2, stdout=stdout)
+
+        self.assertIn("Resuming after row 2", stdout.getvalue())
+        self.assertEqual(Book.objects.count(), 4)
+
+
+class RecomputeAuthorStatsTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.author_1 = AuthorFactory(name="Jorge Luis Borges")
+        self.author_2 = AuthorFactory(name="J. K. Rowling")
+        BookFactory(author=self.author_1, publish_date=date(1949, 1, 1))
+        BookFactory(author=self.author_2, publish_date=date(1997, 6, 26))
+
+    def test_recompute_author_stats(self):
+        """Should repair the stats of the authors that drifted, only"""
+        Author.objects.filter(pk=self.author_1.pk).update(
+            book_count=5, latest_publish_date=None
+        )
+
+        out = StringIO()
+        call_command("recompute_author_stats", "--dry-run", stdout=out)
+        self.assertIn("Found 1 of 2 authors", out.getvalue())
+        self.assertEqual(Author.objects.get(pk=self.author_1.pk).book_count, 5)
+
+        out = StringIO()
+        call_command("recompute_author_stats", batch_size=1, stdout=out)
+        self.assertIn("Repaired 1 of 2 authors", out.getvalue())
+        self.assertEqual(
+            Author.objects.values_list("name", "book_count", "latest_publish_date")
+            .order_by("name")
+            .get(pk=self.author_1.pk),
+            ("Jorge Luis Borges", 1, date(1949, 1, 1)),
+        )
@@ -0,0 +1,23 @@
+from unittest import skipUnless
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test import TestCase, override_settings
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite only")
+class TestSQLitePragmas(TestCase):
+    def test_new_connection(self):
+        """Should apply the configured PRAGMAs to every new SQLite connection"""
+        new_connection = connections.create_connection(DEFAULT_DB_ALIAS)
+        self.addCleanup(new_connection.close)
+
+        with override_settings(SQLITE_PRAGMAS={"synchronous": "off"}):
+            with new_connection.cursor() as cursor:
+                cursor.execute("PRAGMA synchronous")
+                synchronous = cursor.fetchone()[0]
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA synchronous")
+            default_synchronous = cursor.fetchone()[0]
+
+        # 0 is OFF, 1 is NORMAL
+        self.assertEqual(synchronous, 0)
+        self.assertEqual(default_synchronous, 1)
@@ -1,7 +1,11 @@
 from datetime import date
 from freezegun import freeze_time
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
+from books.models import Author, Book
+from books.signals import bulk_saved
 from books.tests.fixtures import AuthorFactory, CollaboratorFactory, BookFactory
 
 
@@ -18,3 +22,112 @@ class TestAuthor(TestCase):
 
         with freeze_time("2023-01-01T10:00:00"):
             self.assertEqual(self.author_1.age, 133)
+
+
+class TestAuthorStats(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.author_1 = AuthorFactory(name="Jorge Luis Borges")
+        self.author_2 = AuthorFactory(name="J. K. Rowling")
+
+    def assertStats(self, author, book_count, latest_publish_date):
+        author = Author.objects.get(pk=author.pk)
+        self.assertEqual(
+            (author.book_count, author.latest_publish_date),
+            (book_count, latest_publish_date),
+        )
+
+    def test_book_created(self):
+        """Should count new books and keep their latest publish date"""
+        BookFactory(author=self.author_1, publish_date=date(1944, 1, 1))
+        BookFactory(author=self.author_1, publish_date=date(1949, 1, 1))
+        BookFactory(author=self.author_1, publish_date=None)
+        BookFactory(author=self.author_1, publish_date=date(1935, 1, 1))
+
+        self.assertStats(self.author_1, 4, date(1949, 1, 1))
+        self.assertStats(self.author_2, 0, None)
+
+    def test_book_updated(self):
+        """Should follow books changing publish date or author"""
+        book_1 = BookFactory(author=self.author_1, publish_date=date(1944, 1, 1))
+        book_2 = BookFactory(author=self.author_1, publish_date=date(1949, 1, 1))
+
+        book_2.publish_date = date(1940, 1, 1)
+        book_2.save()
+        self.assertStats(self.author_1, 2, date(1944, 1, 1))
+
+        book_1.author = self.author_2
+        book_1.save()
+        self.assertStats(self.author_1, 1, date(1940, 1, 1))
+        self.assertStats(self.author_2, 1, date(1944, 1, 1))
+
+    def test_book_loaded_without_author(self):
+        """Should not count again a book saved after loading it without its author"""
+        book_1 = BookFactory(author=self.author_1, publish_date=date(1949, 1, 1))
+
+        Book.objects.only("name").get(pk=book_1.pk).save()
+        self.assertStats(self.author_1, 1, date(1949, 1, 1))
+
+        book = Book.objects.defer("author").get(pk=book_1.pk)
+        book.publish_date = date(1950, 1, 1)
+        book.save()
+        self.assertStats(self.author_1, 1, date(1950, 1, 1))
+
+    def test_book_deleted(self):
+        """Should uncount deleted books and recompute the latest publish date"""
+        book_1 = BookFactory(author=self.author_1, publish_date=date(1949, 1, 1))
+        BookFactory(author=self.author_1, publish_date=date(1944, 1, 1))
+
+        book_1.delete()
+        self.assertStats(self.author_1, 1, date(1944, 1, 1))
+
+        Book.objects.filter(author=self.author_1).delete()
+        self.assertStats(self.author_1, 0, None)
+
+    def test_book_deleted_drifted(self):
+        """Should not count below zero books inserted without signals"""
+        Book.objects.bulk_create([Book(author=self.author_1, name="El Aleph")])
+        self.assertStats(self.author_1, 0, None)
+
+        Book.objects.get(author=self.author_1).delete()
+        self.assertStats(self.author_1, 0, None)
+
+        Book.objects.bulk_create([Book(author=self.author_1, name="Ficciones")])
+        self.author_1.delete()
+        self.assertFalse(Author.objects.filter(pk=self.author_1.pk).exists())
+
+    def test_author_deleted(self):
+        """Should delete an author's books in as many queries however many they are"""
+        BookFactory.create_batch(2, author=self.author_1)
+        BookFactory.create_batch(20, author=self.author_2)
+
+        with CaptureQueriesContext(connection) as few_books:
+            self.author_1.delete()
+        with CaptureQueriesContext(connection) as many_books:
+            self.author_2.delete()
+
+        self.assertEqual(len(many_books), len(few_books))
+        self.assertFalse(Book.objects.exists())
+
+    def test_bulk_saved(self):
+        """Should recompute the stats of the authors of books written in bulk"""
+        books = [
+            Book(author=self.author_1, name="El Aleph", publish_date=date(1949, 1, 1)),
+            Book(author=self.author_2, name="Harry Potter", publish_date=None),
+        ]
+        Book.objects.bulk_create(books)
+        bulk_saved.send(sender=Book, instances=books, created=True)
+
+        self.assertStats(self.author_1, 1, date(1949, 1, 1))
+        self.assertStats(self.author_2, 1, None)
+
+    def test_author_save(self):
+        """Should not overwrite the stats with the instance's stale values"""
+        BookFactory(author=self.author_1, publish_date=date(1949, 1, 1))
+        self.assertEqual(self.author_1.book_count, 0)
+
+        self.author_1.name = "J. L. Borges"
+        self.author_1.save()
+
+        self.assertStats(self.author_1, 1, date(1949, 1, 1))
+        self.assertEqual(Author.objects.get(pk=self.author_1.pk).name, "J. L. Borges")
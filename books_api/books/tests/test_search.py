@@ -0,0 +1,101 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+
+from books import search
+from books.models import Author, Book
+from books.signals import bulk_saved
+from books.tests.fixtures import AuthorFactory, CollaboratorFactory, BookFactory
+
+
+class SearchIndexTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.backend = search.get_backend()
+        self.author_1 = AuthorFactory(
+            name="Jorge Luis Borges", biography="Argentine short-story writer"
+        )
+        self.author_2 = AuthorFactory(
+            name="J. K. Rowling", biography="Wrote about Borges in her youth"
+        )
+        self.book_1 = BookFactory(author=self.author_1, name="El Aleph")
+        self.collaborator_1 = CollaboratorFactory(name="Norman Thomas di Giovanni")
+
+    def search(self, query, **kwargs):
+        return [
+            (result.type, result.id) for result in self.backend.search(query, **kwargs)
+        ]
+
+    def test_search_ranking(self):
+        """Should rank matches in names above matches in biographies"""
+        self.assertEqual(
+            self.search("borges"),
+            [("author", str(self.author_1.id)), ("author", str(self.author_2.id))],
+        )
+
+    def test_search_prefix(self):
+        """Should match the last term of the query as a prefix"""
+        self.assertEqual(self.search("el ale"), [("book", str(self.book_1.id))])
+        self.assertEqual(self.search("el alp"), [])
+
+    def test_search_types(self):
+        """Should only return documents of the given types"""
+        BookFactory(author=self.author_2, name="Borges and me")
+
+        self.assertEqual(
+            sorted(document_type for document_type, _ in self.search("borges")),
+            ["author", "author", "book"],
+        )
+        self.assertEqual(
+            [
+                document_type
+                for document_type, _ in self.search("borges", types=["book"])
+            ],
+            ["book"],
+        )
+
+    def test_search_query_syntax(self):
+        """Should ignore full-text query operators in the query"""
+        self.assertEqual(
+            self.search('"giovanni" OR NEAR(*'),
+            [],
+        )
+        self.assertEqual(
+            self.search("giovanni; norman*"),
+            [("collaborator", str(self.collaborator_1.id))],
+        )
+        self.assertEqual(self.search("  ,; "), [])
+
+    def test_index_updates(self):
+        """Should keep the index up to date as objects are saved and deleted"""
+        self.book_1.name = "Ficciones"
+        self.book_1.save()
+        self.assertEqual(self.search("aleph"), [])
+        self.assertEqual(self.search("ficciones"), [("book", str(self.book_1.id))])
+
+        self.author_1.delete()
+        self.assertEqual(self.search("ficciones"), [])
+        self.assertEqual(self.search("borges"), [("author", str(self.author_2.id))])
+
+    def test_index_bulk_saved(self):
+        """Should index instances written in bulk"""
+        book = Book(author=self.author_2, name="Quidditch Through the Ages")
+        Book.objects.bulk_create([book])
+        self.assertEqual(self.search("quidditch"), [])
+
+        bulk_saved.send(sender=Book, instances=[book], created=True)
+        self.assertEqual(self.search("quidditch"), [("book", str(book.id))])
+
+    def test_rebuild_search_index(self):
+        """Should index every author, book and collaborator"""
+        Author.objects.bulk_create([Author(name="Adolfo Bioy Casares")])
+        self.backend.clear()
+
+        out = StringIO()
+        call_command("rebuild_search_index", batch_size=2, stdout=out)
+
+        self.assertIn("Indexed 5 documents", out.getvalue())
+        self.assertEqual(len(self.search("borges")), 2)
+        self.assertEqual(len(self.search("bioy")), 1)
+        self.assertEqual(len(self.search("aleph")), 1)
+        self.assertEqual(len(self.search("giovanni")), 1)
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "books_api.settings")
 
 application = get_asgi_application()
+
+# once the apps are loaded (see api.startup)
+from api.startup import preload  # noqa: E402
+
+preload()
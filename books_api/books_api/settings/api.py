@@ -0,0 +1,55 @@
+"""
+Settings of API-only deployments: the production settings (see `prod`) without
+the admin, sessions, messages, CSRF, templates and browsable API, which only
+serve browsers.
+
+Clients authenticate with a token in an `Authorization: Token <key>` header
+(`django-admin drf_create_token <username>` creates one), looked up with a
+single query instead of loading a session and then its user. Workers import
+the URLconf, views and serializers at boot (see api.startup).
+"""
+
+from .prod import *
+
+INSTALLED_APPS = [
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "rest_framework",
+    "rest_framework.authtoken",
+    "api",
+    "books",
+]
+
+MIDDLEWARE = [
+    # first, so its timings cover the other middleware
+    "api.performance.PerformanceMiddleware",
+    "api.metrics.MetricsMiddleware",
+    "api.compression.CompressionMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "django.middleware.common.CommonMiddleware",
+]
+
+TEMPLATES = []
+
+# the API answers in English, no translation catalogs to load
+USE_I18N = False
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "rest_framework.authentication.TokenAuthentication",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        renderer
+        for renderer in REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"]
+        if renderer != "rest_framework.renderers.BrowsableAPIRenderer"
+    ],
+    # the form parsers only serve the browsable API's forms
+    "DEFAULT_PARSER_CLASSES": [
+        parser
+        for parser in REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"]
+        if not parser.startswith("rest_framework.parsers.")
+    ],
+}
+
+PRELOAD_AT_BOOT = os.environ.get("PRELOAD_AT_BOOT", "1") == "1"
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.1/ref/settings/
 """
 
+import importlib.util
 import os
 from pathlib import Path
 
@@ -42,12 +43,18 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     # third party
     "rest_framework",
+    "rest_framework.authtoken",
     # own apps
     "api",
     "books",
 ]
 
 MIDDLEWARE = [
+    # first, so its timings cover the other middleware
+    "api.performance.PerformanceMiddleware",
+    "api.metrics.MetricsMiddleware",
+    # before the middleware reading or changing the content
+    "api.compression.CompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -88,6 +95,30 @@ DATABASES = {
     }
 }
 
+# PRAGMAs run on every new SQLite connection (see books.signals): readers don't
+# block on writers with the write-ahead log, which makes fsyncing on every
+# commit unnecessary to stay consistent, and reads are served from mmap
+SQLITE_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "mmap_size": 256 * 1024 * 1024,
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+# Local memory by default, any other backend can be plugged in through the
+# environment (e.g. "django.core.cache.backends.redis.RedisCache")
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -125,6 +156,118 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# API
+# JSON is rendered and parsed with orjson when it's installed (see api.renderers).
+# API clients authenticate with a token (`Authorization: Token <key>`) and the
+# browsable API with the session.
+REST_FRAMEWORK = {
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "rest_framework.authentication.SessionAuthentication",
+        "rest_framework.authentication.BasicAuthentication",
+        "rest_framework.authentication.TokenAuthentication",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
+# MessagePack is negotiated with the `Accept` and `Content-Type` headers when
+# msgpack is installed (see api.renderers)
+if importlib.util.find_spec("msgpack") is not None:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].insert(
+        1, "api.renderers.MessagePackRenderer"
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"].insert(1, "api.parsers.MessagePackParser")
+
+# Responses of at least COMPRESSION_MIN_SIZE bytes are compressed with the
+# encoding the client prefers, or the first of COMPRESSION_ENCODINGS ("zstd" and
+# "br" are only used when the zstandard and brotli packages are installed).
+# zstd saves as much as the others for a fraction of the CPU time (see
+# benchmarks.compression).
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", 1024))
+COMPRESSION_ENCODINGS = ["zstd", "br", "gzip"]
+
+# Pagination mode used by the authors list when the request does not ask for
+# one explicitly with `?pagination=`: "page" (page number) or "cursor" (keyset)
+AUTHORS_PAGINATION = os.environ.get("AUTHORS_PAGINATION", "page")
+
+# Serializers used for read-only payloads: "drf" or "fast" (see api.fast_serializers)
+API_SERIALIZATION_ENGINE = os.environ.get("API_SERIALIZATION_ENGINE", "drf")
+
+# Cache alias and timeout (in seconds) of the serialized author payloads, 0
+# turns their caching off
+AUTHORS_CACHE_ALIAS = "default"
+AUTHORS_CACHE_TIMEOUT = int(os.environ.get("AUTHORS_CACHE_TIMEOUT", 300))
+
+# Concurrent requests for the same author or page of authors missing from the
+# cache wait for a single one of them to fetch and serialize it (see api.coalesce)
+AUTHORS_COALESCING = os.environ.get("AUTHORS_COALESCING", "1") == "1"
+
+# Import and build at boot what Django and DRF otherwise do on the first
+# requests (see api.startup)
+PRELOAD_AT_BOOT = os.environ.get("PRELOAD_AT_BOOT") == "1"
+
+# Seconds after which each process rebuilds its in-memory autocomplete index
+# from the database, to pick up names written by other processes. None only
+# applies the process' own writes.
+AUTOCOMPLETE_REFRESH_INTERVAL = (
+    int(os.environ["AUTOCOMPLETE_REFRESH_INTERVAL"])
+    if os.environ.get("AUTOCOMPLETE_REFRESH_INTERVAL")
+    else None
+)
+
+
+# Performance instrumentation (see api.performance)
+# Send the per-request timings back in a `Server-Timing` header
+PERFORMANCE_SERVER_TIMING = os.environ.get("PERFORMANCE_SERVER_TIMING", "1") == "1"
+
+# Most SQL queries a request may run before being logged as a warning, by view
+# name optionally prefixed with the request method ("default" for the views not
+# listed, None for no limit). Authenticating a session takes 2 queries.
+PERFORMANCE_QUERY_THRESHOLDS = {
+    "default": 20,
+    "GET authors-list": 6,
+    "GET authors-detail": 6,
+    "GET async-authors-list": 6,
+    "GET async-authors-detail": 6,
+    "GET author-books-list": 6,
+    "GET author-books-detail": 6,
+}
+
+
+# Directory where each process keeps its Prometheus metrics (see api.metrics),
+# for `/metrics` to report those of every process. None keeps them in memory,
+# for single process servers.
+METRICS_DIR = os.environ.get("METRICS_DIR") or None
+
+
+# Logging
+# https://docs.djangoproject.com/en/4.1/topics/logging/
+# Set PERFORMANCE_LOG_LEVEL to INFO to log the timings of every request, by
+# default only the requests exceeding their query threshold are
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "api.performance": {
+            "handlers": ["console"],
+            "level": os.environ.get("PERFORMANCE_LOG_LEVEL", "WARNING"),
+            "propagate": False,
+        },
+    },
+}
+
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
 
@@ -13,10 +13,17 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.apps import apps
 from django.contrib import admin
 from django.urls import path, include
 
+from api.metrics import metrics_view
+
 urlpatterns = [
-    path("admin/", admin.site.urls),
     path("api/v1/", include("api.urls")),
+    path("metrics", metrics_view, name="metrics"),
 ]
+
+# not installed in API-only deployments (see books_api.settings.api)
+if apps.is_installed("django.contrib.admin"):
+    urlpatterns.insert(0, path("admin/", admin.site.urls))